@@ -0,0 +1,101 @@
+"""
+Benchmark de memória dos registos de previsão.
+
+Compara, para N dias de previsão em memória (ex: todos os locais e dias), a
+memória ocupada por:
+  - dicionários com chaves em texto (o formato antigo de `_process_forecast_data`);
+  - `ForecastRecord` (`__slots__`);
+  - `ForecastSeries` (colunas em `array`, 5 dias por local), que só cria registos quando pedidos.
+Os três são construídos a partir das mesmas respostas JSON e a memória é medida
+com `tracemalloc` (bytes alocados e ainda vivos após a construção). Com só 5
+dias por local, grande parte da memória da `ForecastSeries` é o custo fixo dos
+seus `array`/listas por local.
+
+Uso:
+    python benchmarks/bench_forecast_memory.py --records 10000 100000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.forecast_record import ForecastRecord
+from models.forecast_series import ForecastSeries
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'forecast-daily-1110600.json')
+DAYS_PER_LOCATION = 5
+
+
+def _payloads(n_records):
+    """Respostas sintéticas da API (5 dias por local) até perfazer `n_records` dias."""
+    with open(FIXTURE, encoding='utf-8') as f:
+        template = json.load(f)["data"]
+    payloads = []
+    for location in range(0, n_records, DAYS_PER_LOCATION):
+        days = [dict(template[i % len(template)], tMin=str(10 + (location + i) % 7), tMax=str(20 + (location + i) % 9))
+                for i in range(min(DAYS_PER_LOCATION, n_records - location))]
+        payloads.append({"globalIdLocal": 1000000 + location, "data": days})
+    return payloads
+
+
+def _as_dict(record):
+    return {key: record[key] for key in ("location_name", "location_id", "forecast_date", "temp_min", "temp_max",
+                                         "precipitation_prob", "weather_id", "wind_speed_class", "wind_dir",
+                                         "weather_description", "wind_speed_description")}
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def _build_records(payloads, convert):
+    """Processa as respostas dia a dia e guarda só os registos (`convert(record)`), como antes da série."""
+    records = []
+    for payload in payloads:
+        series = ForecastSeries.from_payload(payload, "Local", payload["globalIdLocal"])
+        for index in range(len(series)):
+            record = series.day(index)
+            record.weather_description = "Céu limpo"
+            record.wind_speed_description = "Fraco"
+            records.append(convert(record))
+    return records
+
+
+def run_benchmark(sizes=(10000, 100000)):
+    for n_records in sizes:
+        payloads = _payloads(n_records)
+
+        # Tudo é construído a partir das mesmas respostas JSON; conta só o que fica vivo no fim
+        dicts, dict_bytes, dict_s = _measure(lambda: _build_records(payloads, _as_dict))
+        records, record_bytes, record_s = _measure(lambda: _build_records(payloads, lambda record: record))
+        series, series_bytes, series_s = _measure(
+            lambda: [ForecastSeries.from_payload(p, "Local", p["globalIdLocal"]) for p in payloads])
+        assert len(dicts) == len(records) == sum(len(s) for s in series) == n_records
+
+        print(f"{n_records} registos:")
+        print(f"  dict              {dict_bytes / 1e6:8.2f} MB  ({dict_bytes / n_records:6.0f} B/registo)  {dict_s:.2f} s")
+        print(f"  ForecastRecord    {record_bytes / 1e6:8.2f} MB  ({record_bytes / n_records:6.0f} B/registo)  "
+              f"{record_s:.2f} s  {dict_bytes / record_bytes:.1f}x menos memória")
+        print(f"  ForecastSeries    {series_bytes / 1e6:8.2f} MB  ({series_bytes / n_records:6.0f} B/registo)  "
+              f"{series_s:.2f} s  {dict_bytes / series_bytes:.1f}x menos memória")
+        del dicts, records, series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de memória dos registos de previsão.")
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 100000], help="Números de registos a medir.")
+    args = parser.parse_args()
+    run_benchmark(args.records)
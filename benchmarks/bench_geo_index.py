@@ -0,0 +1,72 @@
+"""
+Benchmark do índice espacial (`models/geo_index.py`).
+
+Gera N locais sintéticos espalhados pelo continente e ilhas e M pontos de
+praia, e compara o tempo por consulta do `GeoIndex` (grelha) com uma pesquisa
+exaustiva (haversine para todos os locais), para "local mais próximo" e
+"locais a menos de R km".
+
+Uso:
+    python benchmarks/bench_geo_index.py --locations 5000 --queries 2000 --radius 25
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.geo_index import GeoIndex, haversine_km
+
+# Caixas aproximadas (lat_min, lat_max, lon_min, lon_max) do continente, Madeira e Açores
+_REGIONS = [(36.9, 42.1, -9.5, -6.2), (32.6, 33.1, -17.3, -16.3), (36.9, 39.8, -31.3, -25.0)]
+
+
+def _random_point(rng):
+    lat_min, lat_max, lon_min, lon_max = rng.choices(_REGIONS, weights=[8, 1, 1])[0]
+    return rng.uniform(lat_min, lat_max), rng.uniform(lon_min, lon_max)
+
+
+def _time_per_query(func, queries):
+    start = time.perf_counter()
+    for latitude, longitude in queries:
+        func(latitude, longitude)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run_benchmark(n_locations=5000, n_queries=2000, radius_km=25.0):
+    rng = random.Random(11)
+    locations = [(str(i), f"Local {i}", *_random_point(rng)) for i in range(n_locations)]
+    queries = [_random_point(rng) for _ in range(n_queries)]
+
+    start = time.perf_counter()
+    index = GeoIndex(locations)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def brute_nearest(latitude, longitude):
+        return min(locations, key=lambda loc: haversine_km(latitude, longitude, loc[2], loc[3]))
+
+    def brute_within(latitude, longitude):
+        return [loc for loc in locations if haversine_km(latitude, longitude, loc[2], loc[3]) <= radius_km]
+
+    brute_queries = queries[:max(1, n_queries // 10)]
+    print(f"{n_locations} locais; índice construído em {build_ms:.1f} ms (células de {index.cell_size_deg}°)")
+    grid_nearest = _time_per_query(index.nearest, queries)
+    brute_nearest_us = _time_per_query(brute_nearest, brute_queries)
+    print(f"mais próximo   grelha={grid_nearest:9.1f} µs  exaustiva={brute_nearest_us:9.1f} µs  "
+          f"({brute_nearest_us / grid_nearest:.0f}x)")
+    grid_within = _time_per_query(lambda lat, lon: index.within(lat, lon, radius_km), queries)
+    brute_within_us = _time_per_query(brute_within, brute_queries)
+    print(f"raio {radius_km:g} km   grelha={grid_within:9.1f} µs  exaustiva={brute_within_us:9.1f} µs  "
+          f"({brute_within_us / grid_within:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do índice espacial de locais.")
+    parser.add_argument("--locations", type=int, default=5000, help="Número de locais no índice.")
+    parser.add_argument("--queries", type=int, default=2000, help="Número de pontos de praia consultados.")
+    parser.add_argument("--radius", type=float, default=25.0, help="Raio da pesquisa por raio, em km.")
+    args = parser.parse_args()
+    run_benchmark(args.locations, args.queries, args.radius)
@@ -0,0 +1,97 @@
+"""
+Benchmark da tradução de códigos de tempo e de vento (`static_data/weather_glossary.py`).
+
+Compara, sobre N códigos (por omissão um milhão), as funções antigas do
+glossário (procura das descrições na IPMAApi, int() e try/except em cada
+chamada, reproduzidas aqui tal como eram), as novas funções por código e
+`translate_many` sobre colunas `array('h')` como as da `ForecastSeries`
+(com e sem alguns valores em falta). As descrições vêm do servidor local que
+imita o IPMA (sem rede).
+
+Uso:
+    python benchmarks/bench_glossary.py --codes 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.forecast_series import MISSING_INT
+from models.ipma_api import IPMAApi
+from static_data.weather_glossary import (WIND_SPEED_CLASSES, get_ipma_api, get_weather_description,
+                                          get_wind_speed_description, set_ipma_api, translate_many)
+from tools.ipma_standin import IPMAStandInServer
+
+
+def legacy_weather_description(weather_id):
+    """get_weather_description antes das tabelas pré-calculadas."""
+    weather_descriptions = get_ipma_api().get_weather_type_descriptions()
+    try:
+        if weather_id is None:
+            return "Dados de tempo não disponíveis"
+        weather_id_int = int(weather_id)
+        return weather_descriptions.get(weather_id_int, f"Código de Tempo Desconhecido ({weather_id_int})")
+    except (ValueError, TypeError):
+        return f"ID de Tempo Inválido ({weather_id})"
+
+
+def legacy_wind_speed_description(wind_class_id):
+    """get_wind_speed_description antes das tabelas pré-calculadas."""
+    try:
+        if wind_class_id is None:
+            return "Informação de vento indisponível"
+        wind_class_int = int(wind_class_id)
+        return WIND_SPEED_CLASSES.get(wind_class_int, f"Classe de Vento Desconhecida ({wind_class_int})")
+    except (ValueError, TypeError):
+        return f"ID de Classe de Vento Inválido ({wind_class_id})"
+
+
+def _timed(label, func, n_codes, reference=None):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    speedup = f"  {reference / elapsed:5.1f}x" if reference else ""
+    print(f"{label:42s} {elapsed * 1000:8.1f} ms  ({elapsed / n_codes * 1e9:6.0f} ns/código){speedup}")
+    return elapsed, result
+
+
+def run_benchmark(n_codes=1000000):
+    rng = random.Random(3)
+    with IPMAStandInServer() as server:
+        api = IPMAApi(base_url=server.open_data_url)
+        set_ipma_api(api)
+        codes = list(api.get_weather_type_descriptions())
+        weather_ids = array('h', (rng.choice(codes) for _ in range(n_codes)))
+        wind_classes = array('h', (rng.randrange(0, 5) for _ in range(n_codes)))
+        # 1 em cada 1000 dias sem valores (MISSING_INT), como numa ForecastSeries com falhas
+        weather_gaps, wind_gaps = array('h', weather_ids), array('h', wind_classes)
+        for index in range(0, n_codes, 1000):
+            weather_gaps[index] = wind_gaps[index] = MISSING_INT
+
+        print(f"{n_codes} códigos de tempo + {n_codes} classes de vento")
+        legacy, expected = _timed("funções antigas (por código)", lambda: (
+            [legacy_weather_description(code) for code in weather_ids],
+            [legacy_wind_speed_description(code) for code in wind_classes]), n_codes)
+        _, per_code = _timed("funções novas (por código)", lambda: (
+            [get_weather_description(code) for code in weather_ids],
+            [get_wind_speed_description(code) for code in wind_classes]), n_codes, legacy)
+        _, batch = _timed("translate_many (colunas array('h'))",
+                          lambda: translate_many(weather_ids, wind_classes), n_codes, legacy)
+        _timed("translate_many (com valores em falta)",
+               lambda: translate_many(weather_gaps, wind_gaps), n_codes, legacy)
+        assert list(expected) == list(per_code) == list(batch)
+        api.close()
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Benchmark da tradução de códigos do glossário.")
+    parser.add_argument("--codes", type=int, default=1000000, help="Número de códigos a traduzir.")
+    args = parser.parse_args()
+    run_benchmark(args.codes)
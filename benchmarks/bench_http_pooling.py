@@ -0,0 +1,74 @@
+"""
+Benchmark da camada HTTP: latência por pedido com e sem pool de ligações.
+
+Arranca o servidor local `tools/ipma_standin.py` e faz N pedidos à previsão
+diária, primeiro com `requests.get` (uma ligação nova por pedido, como a
+`IPMAApi` fazia) e depois através do `HttpTransport` (sessão com keep-alive).
+
+Uso:
+    python benchmarks/bench_http_pooling.py --requests 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+
+from models.http_transport import HttpTransport
+from tools.ipma_standin import IPMAStandInServer
+
+
+def _measure(get_func, url, n_requests):
+    """Executa n_requests GETs e devolve a lista de latências em milissegundos."""
+    latencies = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        response = get_func(url)
+        response.raise_for_status()
+        response.content # Garante que o corpo é lido por completo
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label, latencies, connections):
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<22} média={statistics.mean(latencies):7.3f} ms  "
+          f"p50={statistics.median(latencies):7.3f} ms  p95={p95:7.3f} ms  "
+          f"ligações abertas={connections}")
+
+
+def run_benchmark(n_requests=200, latency=0.0):
+    with IPMAStandInServer(latency=latency) as server:
+        url = f"{server.open_data_url}forecast/meteorology/cities/daily/1110600.json"
+
+        # Aquecimento (imports tardios, caches do SO)
+        requests.get(url).content
+
+        before = server.connections_opened
+        no_pool = _measure(requests.get, url, n_requests)
+        _report("Sem pool (requests.get)", no_pool, server.connections_opened - before)
+
+        transport = HttpTransport()
+        before = server.connections_opened
+        pooled = _measure(transport.get, url, n_requests)
+        _report("Com pool (HttpTransport)", pooled, server.connections_opened - before)
+        transport.close()
+
+        print(f"Ganho médio por pedido: {statistics.mean(no_pool) - statistics.mean(pooled):.3f} ms "
+              f"({statistics.mean(no_pool) / statistics.mean(pooled):.2f}x)")
+        print("Nota: o servidor local é HTTP simples; contra api.ipma.pt (HTTPS) o ganho inclui "
+              "também o handshake TLS evitado em cada pedido.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de pedidos HTTP com e sem pool de ligações.")
+    parser.add_argument("--requests", type=int, default=200, help="Número de pedidos por modo.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latência artificial do servidor, em segundos.")
+    args = parser.parse_args()
+    run_benchmark(args.requests, args.latency)
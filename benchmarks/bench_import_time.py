@@ -0,0 +1,85 @@
+"""
+Benchmark do custo de arranque (imports) de cada modo da aplicação.
+
+Para cada modo corre um interpretador novo com `python -X importtime`, a
+importar os mesmos módulos que `main.py` carrega nesse modo, e soma o tempo
+cumulativo dos imports de topo. Mostra também os módulos mais pesados, para
+detetar imports que voltaram a ficar fora do sítio (ex: tkinter no `export`).
+
+Uso:
+    python benchmarks/bench_import_time.py --repeat 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Módulos que main.py importa em cada modo (ver create_controller, run_export e run_gui)
+_BACKEND = ["main", "models.ipma_api", "models.disk_cache", "static_data.weather_glossary",
+            "controllers.main_controller"]
+MODES = {
+    "cli (--help)": ["main"],
+    "export": _BACKEND + ["controllers.forecast_export"],
+    "gui minimal": _BACKEND + ["tkinter", "views.minimal_window"],
+    "gui main": _BACKEND + ["tkinter", "views.main_window"],
+}
+
+# "import time:  self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_once(modules):
+    """
+    Importa `modules` num interpretador novo; devolve (ms de imports, ms de processo,
+    {módulo de topo: ms cumulativos}, conjunto de todos os módulos importados).
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level, imported = {}, set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        # Só os imports de topo (sem indentação) entram na soma: o cumulativo já inclui os dependentes
+        if len(match.group(3)) == 1:
+            top_level[match.group(4)] = int(match.group(2)) / 1000
+    return sum(top_level.values()), wall, top_level, imported
+
+
+def run_benchmark(repeat=5, top=5):
+    for mode, modules in MODES.items():
+        try:
+            runs = [_run_once(modules) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"{mode:<14} indisponível ({e})")
+            continue
+        imports = [run[0] for run in runs]
+        walls = [run[1] for run in runs]
+        heaviest = sorted(runs[-1][2].items(), key=lambda item: item[1], reverse=True)[:top]
+        print(f"{mode:<14} imports={statistics.median(imports):7.1f} ms  "
+              f"processo={statistics.median(walls):7.1f} ms  "
+              f"(tkinter={'sim' if 'tkinter' in runs[-1][3] else 'não'}, "
+              f"PIL={'sim' if 'PIL' in runs[-1][3] else 'não'}, "
+              f"requests={'sim' if 'requests' in runs[-1][3] else 'não'})")
+        print("               mais pesados: " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in heaviest))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede o custo de imports no arranque de cada modo da aplicação.")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por modo (é mostrada a mediana).")
+    parser.add_argument("--top", type=int, default=5, help="Número de módulos mais pesados a mostrar.")
+    args = parser.parse_args()
+    run_benchmark(args.repeat, args.top)
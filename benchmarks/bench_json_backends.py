@@ -0,0 +1,84 @@
+"""
+Benchmark dos backends JSON (`models/json_backend.py`).
+
+Para cada backend instalado (orjson, ujson, json da biblioteca padrão) mede o
+tempo de descodificação das respostas gravadas em `tools/fixtures/` (locais,
+tipos de tempo, previsão de um local) e de uma previsão de um dia para todos
+os locais gerada pelo servidor local (repetida `--scale` vezes), e o tempo de
+serialização das mesmas respostas (usada pela cache em disco e pela exportação).
+
+Uso:
+    python benchmarks/bench_json_backends.py --scale 200
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import json_backend
+from tools.ipma_standin import FIXTURES_DIR, IPMAStandInServer
+
+FIXTURE_FILES = ("distrits-islands.json", "weather-type-classe.json", "forecast-daily-1110600.json")
+BY_DAY_PATH = "/open-data/forecast/meteorology/cities/daily/hp-daily-forecast-day0.json"
+
+
+def _payloads(scale):
+    payloads = {}
+    for filename in FIXTURE_FILES:
+        with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+            payloads[filename] = f.read()
+    with IPMAStandInServer(bulk_scale=scale) as server:
+        payloads[f"hp-daily-forecast-day0.json (x{scale})"] = server.resolve(BY_DAY_PATH)[1]
+    return payloads
+
+
+def _time_per_call(func, arg, min_time=0.3):
+    """Melhor tempo por chamada (µs) em lotes repetidos durante pelo menos `min_time` segundos."""
+    gc.collect()
+    batch = 1
+    while True: # Lotes de ~10 ms, para que o relógio não domine nos payloads pequenos
+        start = time.perf_counter()
+        for _ in range(batch):
+            func(arg)
+        if time.perf_counter() - start >= 0.01:
+            break
+        batch *= 2
+    best, deadline = float("inf"), time.perf_counter() + min_time
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(batch):
+            func(arg)
+        best = min(best, (time.perf_counter() - start) / batch)
+    return best * 1e6
+
+
+def run_benchmark(scale=200):
+    payloads = _payloads(scale)
+    backends = json_backend.available_backends()
+    missing = [name for name in json_backend.BACKENDS if name not in backends]
+    print(f"Backends instalados: {', '.join(backends)}" + (f" (não instalados: {', '.join(missing)})" if missing else ""))
+
+    reference = {}
+    for name in backends:
+        backend = json_backend.set_backend(name)
+        print(f"\n[{name}]")
+        for label, body in payloads.items():
+            decoded = backend.loads(body)
+            expected = reference.setdefault(label, decoded)
+            assert decoded == expected, f"{name} descodificou {label} de forma diferente"
+            decode_us = _time_per_call(backend.loads, body)
+            encode_us = _time_per_call(backend.dumps, decoded)
+            print(f"  {label:42s} {len(body) / 1024:9.1f} KiB   loads {decode_us:10.1f} µs   dumps {encode_us:10.1f} µs")
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Benchmark dos backends JSON.")
+    parser.add_argument("--scale", type=int, default=200, help="Cópias dos 35 locais na previsão de um dia.")
+    args = parser.parse_args()
+    run_benchmark(args.scale)
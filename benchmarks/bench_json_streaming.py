@@ -0,0 +1,93 @@
+"""
+Benchmark da descodificação em streaming (`models/json_stream.py`).
+
+Pede ao servidor local que imita o IPMA a previsão de um dia para todos os
+locais, com os locais repetidos `--scale` vezes para simular uma resposta
+grande, e compara:
+  - o método atual: `response.json()` (corpo inteiro em memória e árvore
+    completa de objetos) seguido da filtragem dos campos;
+  - `IPMAApi.iter_forecasts_for_day(fields=...)`: registos descodificados aos
+    pedaços e devolvidos à medida que chegam, só com os campos pedidos.
+Para cada um mede o tempo até ao primeiro registo, o tempo total e o pico de
+memória (`tracemalloc`, numa execução à parte para não afetar os tempos). O
+consumidor só agrega os registos (temperatura máxima), sem os guardar.
+
+Uso:
+    python benchmarks/bench_json_streaming.py --scale 2000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.ipma_api import IPMAApi, DAILY_FORECAST_BY_DAY_FILE
+from tools.ipma_standin import IPMAStandInServer
+
+FIELDS = ("globalIdLocal", "tMin", "tMax", "idWeatherType")
+
+
+def _buffered_records(api):
+    """O método atual: descodifica o corpo inteiro e só depois filtra os campos."""
+    url = f"{api.base_url_daily_forecast}{DAILY_FORECAST_BY_DAY_FILE.format(day=0)}"
+    response = api.transport.get(url)
+    response.raise_for_status()
+    data = response.json()
+    for item in data.get("data", []):
+        yield {field: item[field] for field in FIELDS if field in item}
+
+
+def _streamed_records(api):
+    return api.iter_forecasts_for_day(0, fields=FIELDS)
+
+
+def _consume(records):
+    """Devolve (tempo até ao 1.º registo, tempo total, n.º de registos)."""
+    start = time.perf_counter()
+    first = None
+    count, hottest = 0, float("-inf")
+    for record in records:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+        hottest = max(hottest, float(record["tMax"]))
+    return first, time.perf_counter() - start, count
+
+
+def _peak_memory(make_records, api):
+    gc.collect()
+    tracemalloc.start()
+    _consume(make_records(api))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def run_benchmark(scale=2000, repeat=3):
+    with IPMAStandInServer(bulk_scale=scale) as server:
+        api = IPMAApi(base_url=server.open_data_url)
+        # Gera o corpo no servidor antes das medições
+        size = len(server.resolve("/open-data/forecast/meteorology/cities/daily/hp-daily-forecast-day0.json")[1])
+        print(f"Resposta com {35 * scale} locais ({size / 1e6:.1f} MB)")
+
+        for label, make_records in (("response.json()", _buffered_records), ("streaming", _streamed_records)):
+            runs = [_consume(make_records(api)) for _ in range(repeat)]
+            first, total, count = min(runs, key=lambda run: run[1])
+            peak = _peak_memory(make_records, api)
+            print(f"{label:16s} 1.º registo {first * 1000:8.1f} ms   total {total * 1000:8.1f} ms   "
+                  f"pico de memória {peak / 1e6:7.1f} MB   ({count} registos)")
+        api.transport.close()
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Benchmark da descodificação de JSON em streaming.")
+    parser.add_argument("--scale", type=int, default=2000, help="Cópias dos 35 locais na resposta.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições por método (conta a mais rápida).")
+    args = parser.parse_args()
+    run_benchmark(args.scale, args.repeat)
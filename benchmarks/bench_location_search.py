@@ -0,0 +1,94 @@
+"""
+Microbenchmark da pesquisa de locais por nome (`models/location_index.py`).
+
+Gera N nomes sintéticos a partir dos locais reais de `tools/fixtures/` e mede
+o tempo de construção do `LocationIndex` e a latência por consulta de
+`lookup` (exata, sem acentos), `search` (prefixo para autocompletar) e
+`resolve` (com erro de escrita). Para comparação, mede também uma pesquisa
+por prefixo linear que normaliza todos os nomes a cada consulta.
+
+Uso:
+    python benchmarks/bench_location_search.py --names 5000 --queries 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.ipma_api import parse_locations_map
+from models.location_index import LocationIndex, fold
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'distrits-islands.json')
+_QUALIFIERS = ["", "Norte", "Sul", "de Cima", "de Baixo", "da Serra", "do Mar", "Velha", "Nova", "São Pedro", "Santa Luzia"]
+
+
+def _synthetic_names(count, seed=7):
+    """Gera `count` nomes distintos combinando nomes reais com qualificadores e números."""
+    with open(FIXTURE, encoding='utf-8') as f:
+        base = list(parse_locations_map(json.load(f)).values())
+    names = {}
+    n = 0
+    while len(names) < count:
+        name = f"{base[n % len(base)]} {_QUALIFIERS[(n // len(base)) % len(_QUALIFIERS)]}".strip()
+        if name in names:
+            name = f"{name} {n}"
+        names[name] = str(1000000 + n)
+        n += 1
+    return names
+
+
+def _typo(text, rng):
+    """Troca duas letras vizinhas de `text` (um erro de escrita típico)."""
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 2)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def _time_per_query(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def _linear_prefix_search(names, prefix, limit=10):
+    key = fold(prefix)
+    return [name for name in names if fold(name).startswith(key)][:limit]
+
+
+def run_benchmark(n_names=5000, n_queries=2000):
+    rng = random.Random(42)
+    names_to_ids = _synthetic_names(n_names)
+    names = list(names_to_ids)
+
+    start = time.perf_counter()
+    index = LocationIndex(names_to_ids)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    picked = [rng.choice(names) for _ in range(n_queries)]
+    exact_queries = [name.lower() for name in picked]
+    prefix_queries = [fold(name)[:rng.randint(2, 5)] for name in picked]
+    typo_queries = [_typo(name, rng) for name in picked]
+
+    print(f"{len(index)} nomes; índice construído em {build_ms:.1f} ms")
+    print(f"lookup (sem acentos/maiúsculas)  {_time_per_query(index.lookup, exact_queries):8.1f} µs/consulta")
+    print(f"search (prefixo, 10 resultados)  {_time_per_query(index.search, prefix_queries):8.1f} µs/consulta")
+    print(f"resolve (com erro de escrita)    {_time_per_query(index.resolve, typo_queries):8.1f} µs/consulta")
+    hits = sum(1 for query, name in zip(typo_queries, picked) if (index.resolve(query) or (None,))[0] == name)
+    print(f"  erros de escrita resolvidos para o nome certo: {hits / len(picked):.0%}")
+    linear_queries = prefix_queries[:max(1, n_queries // 20)]
+    print(f"prefixo linear (referência)      {_time_per_query(lambda q: _linear_prefix_search(names, q), linear_queries):8.1f} µs/consulta")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark da pesquisa de locais por nome.")
+    parser.add_argument("--names", type=int, default=5000, help="Número de nomes no índice.")
+    parser.add_argument("--queries", type=int, default=2000, help="Consultas por tipo de pesquisa.")
+    args = parser.parse_args()
+    run_benchmark(args.names, args.queries)
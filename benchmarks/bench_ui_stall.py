@@ -0,0 +1,152 @@
+"""
+Benchmark do bloqueio do ciclo de eventos da UI durante um pedido de previsão.
+
+Um "batimento" agendado com `after()` a cada poucos milissegundos mede o maior
+intervalo entre execuções consecutivas (o maior bloqueio do ciclo de eventos)
+enquanto se pede uma previsão, primeiro com `fetch_and_display_forecast()`
+(na própria thread da UI, como as views faziam) e depois com
+`fetch_forecast_async()` + `TkDispatcher`.
+
+Usa o servidor local `tools/ipma_standin.py` com latência artificial e a cache
+de previsões desativada, para que cada pedido vá mesmo à "rede". Sem display
+disponível, o Tkinter é substituído por um ciclo `after()` mínimo.
+
+Uso:
+    python benchmarks/bench_ui_stall.py --latency 0.3 --rounds 5
+"""
+
+import argparse
+import heapq
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.main_controller import MainController
+from models.forecast_cache import ForecastCache
+from models.ipma_api import IPMAApi
+from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description, set_ipma_api
+from tools.ipma_standin import IPMAStandInServer
+from views.tk_dispatcher import TkDispatcher
+
+HEARTBEAT_MS = 5
+
+
+class _HeadlessLoop:
+    """Ciclo de eventos mínimo com a interface `after()`/`after_cancel()`/`mainloop()`/`quit()` do Tkinter."""
+    def __init__(self):
+        self._timers = []
+        self._counter = 0
+        self._cancelled = set()
+        self._running = False
+
+    def after(self, delay_ms, func, *args):
+        self._counter += 1
+        heapq.heappush(self._timers, (time.perf_counter() + delay_ms / 1000, self._counter, func, args))
+        return self._counter
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def quit(self):
+        self._running = False
+
+    def mainloop(self):
+        self._running = True
+        while self._running and self._timers:
+            due, timer_id, func, args = heapq.heappop(self._timers)
+            if timer_id in self._cancelled:
+                continue
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            func(*args)
+
+    def destroy(self):
+        pass
+
+
+def _make_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root, "Tkinter"
+    except Exception:
+        return _HeadlessLoop(), "ciclo after() sem display"
+
+
+def _measure_stall(root, controller, use_async):
+    """Pede uma previsão e devolve (maior bloqueio em ms, duração total em ms)."""
+    state = {"last": None, "max_gap": 0.0, "done": False, "start": None, "end": None}
+    dispatcher = TkDispatcher(root, interval_ms=HEARTBEAT_MS) if use_async else None
+
+    def heartbeat():
+        now = time.perf_counter()
+        if state["last"] is not None:
+            state["max_gap"] = max(state["max_gap"], now - state["last"])
+        state["last"] = now
+        if state["done"]:
+            root.quit()
+        else:
+            root.after(HEARTBEAT_MS, heartbeat)
+
+    def finish(*_):
+        state["end"] = time.perf_counter()
+        state["done"] = True
+
+    def start_fetch():
+        state["start"] = time.perf_counter()
+        if use_async:
+            controller.fetch_forecast_async(dispatcher.wrap(finish))
+        else:
+            controller.fetch_and_display_forecast()
+            finish()
+
+    root.after(0, heartbeat)
+    root.after(3 * HEARTBEAT_MS, start_fetch)
+    root.mainloop()
+    if dispatcher is not None:
+        dispatcher.stop()
+    return state["max_gap"] * 1000, (state["end"] - state["start"]) * 1000
+
+
+def run_benchmark(latency=0.3, rounds=5):
+    root, backend = _make_root()
+    with IPMAStandInServer(latency=latency) as server:
+        api = IPMAApi(forecast_cache=ForecastCache(max_entries=0), base_url=server.open_data_url)
+        set_ipma_api(api)
+        controller = MainController(
+            ipma_api=api,
+            weather_desc_func=get_weather_description,
+            location_name_func=get_location_name,
+            wind_desc_func=get_wind_speed_description,
+        )
+        controller.set_location_by_name("Lisboa")
+        controller.fetch_and_display_forecast() # Aquecimento (tipos de tempo, ligações)
+
+        print(f"Ciclo de eventos: {backend}; latência do servidor: {latency * 1000:.0f} ms; "
+              f"batimento a cada {HEARTBEAT_MS} ms")
+        for label, use_async in (("Síncrono (thread da UI)", False), ("Assíncrono (worker + after)", True)):
+            stalls, totals = [], []
+            for _ in range(rounds):
+                stall, total = _measure_stall(root, controller, use_async)
+                stalls.append(stall)
+                totals.append(total)
+            print(f"{label:<28} maior bloqueio={max(stalls):8.1f} ms  "
+                  f"tempo até aos dados={sum(totals) / len(totals):8.1f} ms")
+
+        controller.shutdown()
+        api.close()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede o maior bloqueio do ciclo de eventos durante um pedido de previsão.")
+    parser.add_argument("--latency", type=float, default=0.3, help="Latência artificial do servidor, em segundos.")
+    parser.add_argument("--rounds", type=int, default=5, help="Pedidos medidos por modo.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING) # Os logs por pedido distorceriam as medições
+    run_benchmark(args.latency, args.rounds)
@@ -0,0 +1,308 @@
+"""
+Suite de benchmarks do fluxo completo do controller, com comparação contra uma baseline.
+
+Mede, contra o servidor local que imita o IPMA (sem rede, sem latência
+artificial e sem respostas 304, para que cada pedido descarregue e
+descodifique o JSON), as etapas por que passa uma pesquisa na aplicação:
+
+- `ipma_fetch_parse`: `IPMAApi.get_daily_forecast` sem cache (pedido HTTP + JSON);
+- `set_location_by_name`: `MainController.set_location_by_name` (nomes exatos,
+  sem acentos e com erros de escrita);
+- `process_forecast_data`: `MainController._process_forecast_data` sobre uma resposta já descodificada;
+- `glossary_translate`: descrições do tempo e do vento de todos os dias de uma previsão (`describe_series`);
+- `end_to_end`: "escolher um local → previsão processada" (`set_location_by_name` +
+  `fetch_and_display_forecast`, sem cache).
+
+Cada caso corre `rounds` vezes `number` operações; guarda-se a mediana e o
+mínimo do tempo por operação. Os resultados são escritos em JSON e comparados
+com a baseline do backend JSON em uso (`benchmarks/baseline.<backend>.json`,
+ex: `baseline.json.json` com a biblioteca padrão ou `baseline.orjson.json`;
+ver `models/json_backend.py`), porque os tempos de descodificação só são
+comparáveis com o mesmo backend: se o mínimo de algum caso piorar mais do que
+`--tolerance`, o script termina com código 1. Também termina com código 1 se
+não houver baseline (salvo com `--save-baseline`) ou se a indicada com
+`--baseline` tiver sido gravada com outro backend JSON. Para que uma baseline gravada
+noutra máquina (ou com o processador noutra frequência) continue comparável,
+cada ronda é dividida pelo tempo de um ciclo de calibração em Python puro
+medido imediatamente antes e depois dela (`relative`), e é esse valor que é
+comparado.
+
+Uso:
+    python benchmarks/run_suite.py                     # corre e compara com a baseline
+    python benchmarks/run_suite.py --save-baseline     # grava a baseline (após uma melhoria intencional)
+    python benchmarks/run_suite.py --output resultados.json --tolerance 0.5
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.main_controller import MainController
+from models import json_backend
+from models.forecast_cache import ForecastCache
+from models.http_transport import HttpTransport
+from models.ipma_api import IPMAApi
+from static_data.weather_glossary import (get_location_name, get_weather_description, get_wind_speed_description,
+                                          set_ipma_api, translate_many)
+from tools.ipma_standin import IPMAStandInServer
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT_PATH = os.path.join(BENCHMARKS_DIR, "results", "latest.json")
+# Abrandamento máximo tolerado (fração do tempo da baseline, já calibrado)
+DEFAULT_TOLERANCE = 0.50
+DEFAULT_ROUNDS = 7
+# Chamadas do ciclo de calibração medidas antes e depois de cada ronda
+CALIBRATION_CALLS = 20
+
+# Nomes pesquisados em set_location_by_name (exatos, sem acentos/maiúsculas e com erros)
+SEARCH_NAMES = ("Lisboa", "Porto", "evora", "Ponta Delgada (Açores)", "Lisbao", "Setubal", "faro", "Braganca")
+
+
+def _make_controller(server, **api_kwargs):
+    # Transporte sem RateLimiter: mede-se o código, não o limite de pedidos por segundo
+    api = IPMAApi(transport=HttpTransport(), base_url=server.open_data_url, **api_kwargs)
+    set_ipma_api(api)
+    controller = MainController(
+        ipma_api=api,
+        weather_desc_func=get_weather_description,
+        location_name_func=get_location_name,
+        wind_desc_func=get_wind_speed_description,
+        translate_many_func=translate_many,
+    )
+    controller.wait_for_locations()
+    api.get_weather_type_descriptions()
+    return controller
+
+
+def _cycle(values):
+    """Devolve uma função que percorre `values` em ciclo (uma chamada por operação)."""
+    state = {"index": 0}
+
+    def next_value():
+        value = values[state["index"] % len(values)]
+        state["index"] += 1
+        return value
+    return next_value
+
+
+def build_cases(server):
+    """
+    Prepara os casos da suite contra `server`.
+
+    Returns:
+        list: (nome, função sem argumentos que executa uma operação, número de operações por ronda).
+    """
+    # Sem cache em memória: cada operação faz o pedido HTTP e descodifica a resposta
+    uncached = _make_controller(server, forecast_cache=ForecastCache(max_entries=0))
+    api = uncached.ipma_api
+    location_ids = list(api.get_locations_map())
+    next_id = _cycle(location_ids)
+    next_name = _cycle(SEARCH_NAMES)
+
+    controller = _make_controller(server)
+    payload = api.get_daily_forecast("1110600")
+    series = controller._process_forecast_series(payload, "Lisboa", "1110600")
+
+    def fetch_parse():
+        assert api.get_daily_forecast(next_id()) is not None
+
+    def set_location():
+        assert controller.set_location_by_name(next_name())
+
+    def process():
+        assert controller._process_forecast_data(payload, "Lisboa", "1110600") is not None
+
+    def translate():
+        controller.describe_series(series)
+
+    def end_to_end():
+        assert uncached.set_location_by_name(next_name())
+        assert uncached.fetch_and_display_forecast()
+
+    return [
+        ("ipma_fetch_parse", fetch_parse, 50),
+        ("set_location_by_name", set_location, 2000),
+        ("process_forecast_data", process, 2000),
+        ("glossary_translate", translate, 5000),
+        ("end_to_end", end_to_end, 50),
+    ]
+
+
+def _calibration_workload():
+    """Trabalho fixo em Python puro (dicts, strings, inteiros) usado como unidade de tempo da máquina."""
+    table = {str(i): i for i in range(200)}
+    total = 0
+    for i in range(2000):
+        total += table[str(i % 200)] * 3 // 2
+    return total
+
+
+def _time_per_call(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number
+
+
+def measure(func, number, rounds):
+    """
+    Corre `rounds` rondas de `number` chamadas.
+
+    Returns:
+        tuple: (tempos por operação em segundos, tempos relativos ao ciclo de calibração), por ronda.
+    """
+    for _ in range(max(1, number // 10)): # Aquecimento
+        func()
+    timings, relative = [], []
+    for _ in range(rounds):
+        gc.collect()
+        before = _time_per_call(_calibration_workload, CALIBRATION_CALLS)
+        elapsed = _time_per_call(func, number)
+        after = _time_per_call(_calibration_workload, CALIBRATION_CALLS)
+        timings.append(elapsed)
+        relative.append(elapsed / ((before + after) / 2))
+    return timings, relative
+
+
+def run_suite(rounds=DEFAULT_ROUNDS, scale=1.0, only=None):
+    """
+    Corre a suite e devolve os resultados no formato gravado em JSON.
+
+    Args:
+        rounds (int): Rondas por caso.
+        scale (float): Multiplica o número de operações por ronda (ex: 0.1 para uma corrida rápida).
+        only (iterable, optional): Nomes dos casos a correr; por omissão, todos.
+    """
+    results = {}
+    with IPMAStandInServer(conditional=False) as server:
+        for name, func, number in build_cases(server):
+            if only and name not in only:
+                continue
+            number = max(1, int(number * scale))
+            timings, relative = measure(func, number, rounds)
+            results[name] = {
+                "median_us": statistics.median(timings) * 1e6,
+                "min_us": min(timings) * 1e6,
+                "relative": min(relative),
+                "rounds": rounds,
+                "number": number,
+            }
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_backend.get_backend().name,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compara o tempo de cada caso, relativo ao ciclo de calibração, com o da baseline.
+
+    Returns:
+        list: (nome, mínimo da baseline, mínimo atual, variação calibrada, regressão?) por caso
+            presente em ambos; casos novos ou removidos são ignorados.
+    """
+    rows = []
+    for name, current in results["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        change = current["relative"] / reference["relative"] - 1
+        rows.append((name, reference["min_us"], current["min_us"], change, change > tolerance))
+    return rows
+
+
+def backend_mismatch(results, baseline):
+    """
+    Devolve uma mensagem se `results` e `baseline` foram medidos com backends JSON
+    diferentes (ex: baseline com orjson numa máquina só com o `json`), ou None.
+    """
+    current = results.get("meta", {}).get("json_backend")
+    recorded = baseline.get("meta", {}).get("json_backend")
+    if recorded is None or current == recorded:
+        return None
+    return (f"a baseline foi gravada com o backend JSON '{recorded}', mas esta corrida usou '{current}'; "
+            f"instale o mesmo backend ou grave uma baseline nesta máquina com --save-baseline")
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def default_baseline_path(backend_name=None):
+    """Baseline do backend JSON `backend_name` (por omissão, o em uso): `benchmarks/baseline.<backend>.json`."""
+    return os.path.join(BENCHMARKS_DIR, f"baseline.{backend_name or json_backend.get_backend().name}.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks do fluxo do controller com baseline.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Rondas por caso.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Fator do número de operações por ronda.")
+    parser.add_argument("--only", type=str, default=None, help="Casos a correr, separados por vírgulas.")
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT_PATH, help="Ficheiro JSON dos resultados.")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Ficheiro JSON da baseline (por omissão, a do backend JSON em uso).")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Abrandamento máximo (calibrado) antes de falhar (0.5 = 50%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova baseline.")
+    args = parser.parse_args(argv)
+    if args.baseline is None:
+        args.baseline = default_baseline_path()
+
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_suite(rounds=args.rounds, scale=args.scale, only=only)
+    _write_json(args.output, results)
+
+    print(f"{'caso':24s} {'mediana':>12s} {'mínimo':>12s}")
+    for name, result in results["results"].items():
+        print(f"{name:24s} {result['median_us']:10.1f}µs {result['min_us']:10.1f}µs")
+    print(f"Resultados gravados em {args.output}")
+
+    if args.save_baseline:
+        _write_json(args.baseline, results)
+        print(f"Baseline gravada em {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nFALHOU: sem baseline em {args.baseline}; use --save-baseline para a criar.", file=sys.stderr)
+        return 1
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    mismatch = backend_mismatch(results, baseline)
+    if mismatch:
+        print(f"\nFALHOU: {mismatch}.", file=sys.stderr)
+        return 1
+    rows = compare(results, baseline, args.tolerance)
+    print(f"\nComparação com {args.baseline} (tolerância {args.tolerance:.0%}; variação calibrada):")
+    for name, before, after, change, regressed in rows:
+        flag = "  <-- REGRESSÃO" if regressed else ""
+        print(f"{name:24s} {before:10.1f}µs -> {after:10.1f}µs  {change:+7.1%}{flag}")
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\nFALHOU: {len(regressions)} caso(s) mais lentos do que a baseline: {', '.join(regressions)}",
+              file=sys.stderr)
+        return 1
+    print("\nSem regressões.")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    sys.exit(main())
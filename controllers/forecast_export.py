@@ -0,0 +1,152 @@
+"""
+Exportação em lote (sem interface gráfica) das previsões de vários locais.
+
+Usado pelo subcomando `python main.py export`: reutiliza o `MainController`
+(e a `IPMAApi` dele) para buscar as previsões em paralelo e escreve uma linha
+por local e dia, em JSON Lines ou CSV, à medida que as respostas chegam.
+Não importa tkinter nem Pillow.
+"""
+
+import csv
+import logging
+import time
+
+from models import json_backend
+from models.ipma_api import DEFAULT_MAX_CONCURRENCY
+
+EXPORT_FORMATS = ("jsonl", "csv")
+
+# Colunas exportadas, pela ordem em que aparecem no CSV
+EXPORT_FIELDS = (
+    "location_id", "location_name", "forecast_date", "temp_min", "temp_max",
+    "precipitation_prob", "weather_id", "weather_description",
+    "wind_speed_class", "wind_speed_description", "wind_dir",
+)
+
+# Colunas da exportação por praia (`--beaches`): a praia e o local de previsão associado
+BEACH_EXPORT_FIELDS = (
+    "beach_id", "beach_name", "municipality", "beach_latitude", "beach_longitude",
+    "distance_km",
+) + EXPORT_FIELDS
+
+
+class _JsonLinesWriter:
+    def __init__(self, out):
+        self.out = out
+
+    def write_header(self):
+        pass
+
+    def write(self, record):
+        self.out.write(json_backend.dumps(record))
+        self.out.write("\n")
+
+
+class _CsvWriter:
+    def __init__(self, out, fields=EXPORT_FIELDS):
+        self._writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+
+    def write_header(self):
+        self._writer.writeheader()
+
+    def write(self, record):
+        self._writer.writerow(record)
+
+
+def _make_writer(out, fmt, fields=EXPORT_FIELDS):
+    if fmt == "jsonl":
+        return _JsonLinesWriter(out)
+    if fmt == "csv":
+        return _CsvWriter(out, fields)
+    raise ValueError(f"Formato de exportação desconhecido: {fmt} (use um de {', '.join(EXPORT_FORMATS)})")
+
+
+def _described_days(controller, series, max_days):
+    """Dias de `series` (até `max_days`) com as descrições do tempo e do vento."""
+    days = len(series) if max_days is None else min(max_days, len(series))
+    weather_descriptions, wind_descriptions = controller.describe_series(series)
+    for index in range(days):
+        day = series.day(index)
+        day.weather_description = weather_descriptions[index]
+        day.wind_speed_description = wind_descriptions[index]
+        yield day
+
+
+def export_forecasts(controller, out, fmt="jsonl", locations=None, max_workers=DEFAULT_MAX_CONCURRENCY, max_days=None):
+    """
+    Busca as previsões dos locais pedidos e escreve-as em `out`.
+
+    Args:
+        controller (MainController): Controller com a `IPMAApi` a usar.
+        out: Ficheiro de texto (ou `sys.stdout`) onde escrever.
+        fmt (str): "jsonl" ou "csv".
+        locations (list, optional): Nomes e/ou IDs de locais; se omitido, todos.
+        max_workers (int): Número máximo de pedidos simultâneos.
+        max_days (int, optional): Número máximo de dias por local; se omitido, todos.
+
+    Returns:
+        dict: {"locations", "records", "failed", "elapsed", "locations_per_second"}.
+    """
+    writer = _make_writer(out, fmt)
+    start = time.perf_counter()
+    location_ids = controller.resolve_location_ids(locations)
+
+    writer.write_header()
+    exported = records = failed = 0
+    for location_id, location_name, series, error in controller.iter_forecasts(location_ids, max_workers):
+        if series is None:
+            failed += 1
+            logging.error(f"Exportação: sem previsão para {location_name} ({location_id}): {error}")
+            continue
+        for day in _described_days(controller, series, max_days):
+            writer.write({field: day[field] for field in EXPORT_FIELDS})
+            records += 1
+        exported += 1
+    out.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "locations": exported,
+        "records": records,
+        "failed": failed,
+        "elapsed": elapsed,
+        "locations_per_second": (exported / elapsed) if elapsed > 0 else 0.0,
+    }
+
+
+def export_beach_forecasts(controller, catalogue, out, fmt="jsonl", max_workers=DEFAULT_MAX_CONCURRENCY,
+                           max_days=None, max_distance_km=None):
+    """
+    Escreve em `out` a previsão de cada praia de `catalogue` (uma linha por praia
+    e dia), usando a previsão do local do IPMA mais próximo. Cada local distinto
+    é pedido uma só vez (ver MainController.get_beach_forecasts).
+
+    Returns:
+        dict: As estatísticas de get_beach_forecasts, mais "records", "failed" e "elapsed".
+    """
+    writer = _make_writer(out, fmt, BEACH_EXPORT_FIELDS)
+    start = time.perf_counter()
+    results, stats = controller.get_beach_forecasts(catalogue, max_workers, max_distance_km)
+
+    writer.write_header()
+    records = failed = 0
+    for result in results:
+        beach, series = result["beach"], result["forecast_series"]
+        if series is None:
+            failed += 1
+            logging.error(f"Exportação: sem previsão para a praia {beach.name}: {result['error']}")
+            continue
+        beach_fields = {
+            "beach_id": beach.beach_id, "beach_name": beach.name, "municipality": beach.municipality,
+            "beach_latitude": beach.latitude, "beach_longitude": beach.longitude,
+            "distance_km": round(result["distance_km"], 2),
+        }
+        for day in _described_days(controller, series, max_days):
+            record = dict(beach_fields)
+            record.update((field, day[field]) for field in EXPORT_FIELDS)
+            writer.write(record)
+            records += 1
+    out.flush()
+
+    stats.update(records=records, failed=failed, elapsed=time.perf_counter() - start)
+    return stats
@@ -1,39 +1,179 @@
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 # Importa as classes/funções necessárias dos outros módulos 
-from models.ipma_api import IPMAApi
+from models.forecast_series import ForecastSeries
+from models.geo_index import GeoIndex
+from models.location_index import LocationIndex
+from models.ipma_api import IPMAApi, DEFAULT_MAX_CONCURRENCY
+from models import metrics
 from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description
 # from views.main_window import MainWindow # A ser importado mais tarde
 
+# Threads de trabalho para pedidos de previsão feitos a partir da UI
+FORECAST_WORKERS = 2
+# Espera máxima (segundos) de set_location_by_name pelo carregamento dos locais,
+# que pode ser chamado da thread do Tkinter
+LOCATION_LOOKUP_TIMEOUT = 0.5
+
 class MainController:
-    def __init__(self, ipma_api: IPMAApi, weather_desc_func, location_name_func, wind_desc_func):
+    def __init__(self, ipma_api: IPMAApi, weather_desc_func, location_name_func, wind_desc_func,
+                 translate_many_func=None):
         """
         Inicializa o MainController com suas dependências.
+        `translate_many_func` (opcional, ex: weather_glossary.translate_many) traduz
+        colunas inteiras de uma vez; sem ela, describe_series() traduz dia a dia.
         """
         self.ipma_api = ipma_api
         self.get_weather_desc = weather_desc_func
         self.get_location_name = location_name_func
         self.get_wind_desc = wind_desc_func
+        self.translate_many = translate_many_func
         self.current_location_id = None
         self.current_location_name = "N/A" # Para guardar o nome do local
         self.current_weather_data = None
 
-        # Carrega o mapa de locais (id -> nome) imediatamente ao inicializar
-        self.locations_map_id_to_name = self.ipma_api.get_locations_map()
-        
-        # Cria o mapa inverso (nome -> id) com base no mapa carregado
-        # Garante que este mapa é criado APÓS o mapa id->nome ser carregado
-        self.locations_map_name_to_id = {v: k for k, v in self.locations_map_id_to_name.items()}
+        # Os mapas de locais (id -> nome e nome -> id) são carregados em segundo plano
+        # (ver start_loading_locations), para que a construção do controller e da UI
+        # não fique à espera da resposta da API do IPMA.
+        self.locations_map_id_to_name = {}
+        self.locations_map_name_to_id = {}
+        self.location_index = LocationIndex({}) # Pesquisa por nome (sem acentos, prefixo, aproximada)
+        self.geo_index = GeoIndex() # Pesquisa por coordenadas (local mais próximo, raio)
+        self._locations_loaded = threading.Event()
+        self._locations_lock = threading.Lock()
+        self._locations_thread = None
+        self._locations_callbacks = []
+        self._locations_retrying = False # Nova tentativa em curso após uma carga falhada
+
+        # Pedidos de previsão assíncronos (ver fetch_forecast_async)
+        self._forecast_executor = None
+        self._forecast_future = None
+        self._forecast_generation = 0
+        self._forecast_lock = threading.Lock()
+
+        # Número de previsões pedidas por local (ver get_most_requested_locations)
+        self._location_requests = Counter()
+
+    def start_loading_locations(self, on_loaded=None):
+        """
+        Inicia (uma única vez) o carregamento do mapa de locais numa thread em segundo plano.
+
+        Args:
+            on_loaded (callable, optional): Chamada com a lista de nomes quando o carregamento
+                terminar. ATENÇÃO: corre na thread de carregamento, não na thread do Tkinter;
+                as views devem usar are_locations_loaded() num `after()` para atualizar widgets.
+        """
+        run_now = False
+        with self._locations_lock:
+            if on_loaded is not None:
+                if self._locations_loaded.is_set():
+                    run_now = True
+                else:
+                    self._locations_callbacks.append(on_loaded)
+
+            if self._locations_thread is None:
+                self._locations_thread = threading.Thread(target=self._load_locations,
+                                                          name="locations-loader", daemon=True)
+                self._locations_thread.start()
+
+        if run_now:
+            on_loaded(list(self.locations_map_id_to_name.values()))
+
+    def _load_locations(self):
+        """Carrega o mapa de locais da API e constrói o mapa inverso (nome -> id)."""
+        try:
+            # Já numa thread de carregamento: espera pela nova tentativa, se houver uma
+            locations_map = self.ipma_api.get_locations_map(wait=True)
+            geo_index = self.ipma_api.get_geo_index()
+        except Exception as e:
+            logging.error(f"Erro inesperado ao carregar o mapa de locais: {e}")
+            locations_map = {}
+            geo_index = GeoIndex()
+
+        self._apply_locations(locations_map, geo_index)
 
         if not self.locations_map_id_to_name:
             logging.warning("Não foi possível carregar o mapa de locais. A pesquisa por nome pode falhar.")
         else:
-            logging.info(f"MainController inicializado com {len(self.locations_map_id_to_name)} locais carregados.")
+            logging.info(f"MainController: {len(self.locations_map_id_to_name)} locais carregados.")
+
+        with self._locations_lock:
+            self._locations_retrying = False
+            self._locations_loaded.set()
+            callbacks, self._locations_callbacks = self._locations_callbacks, []
+
+        names = list(self.locations_map_id_to_name.values())
+        for callback in callbacks:
+            try:
+                callback(list(names))
+            except Exception as e:
+                logging.error(f"Erro no callback de locais carregados: {e}")
+
+    def _apply_locations(self, locations_map, geo_index):
+        """Guarda o mapa de locais e constrói o mapa inverso e os índices de pesquisa."""
+        # Cria o mapa inverso (nome -> id) com base no mapa carregado
+        self.locations_map_name_to_id = {v: k for k, v in locations_map.items()}
+        self.location_index = LocationIndex(self.locations_map_name_to_id)
+        self.geo_index = geo_index
+        self.locations_map_id_to_name = locations_map
+
+    def _retry_empty_locations(self):
+        """
+        Se o carregamento dos locais falhou (mapa vazio), volta a correr `_load_locations`
+        em segundo plano (a IPMAApi só tenta de novo a rede depois do intervalo de
+        repetição). Não bloqueia o chamador, que pode ser a thread do Tkinter; os
+        callbacks de `start_loading_locations` são chamados quando a tentativa terminar.
+        """
+        with self._locations_lock:
+            if self._locations_retrying:
+                return
+            self._locations_retrying = True
+            self._locations_loaded.clear()
+            self._locations_thread = threading.Thread(target=self._load_locations,
+                                                      name="locations-loader", daemon=True)
+            self._locations_thread.start()
+
+    def retry_loading_locations(self):
+        """
+        Se o carregamento dos locais terminou sem nenhum local, inicia uma nova tentativa
+        em segundo plano (sem bloquear). As views chamam-no periodicamente depois de uma
+        carga falhada e aguardam o resultado com are_locations_loaded().
+        """
+        if self._locations_loaded.is_set() and not self.locations_map_id_to_name:
+            self._retry_empty_locations()
+
+    def are_locations_loaded(self):
+        """Indica se o carregamento do mapa de locais já terminou (com ou sem sucesso)."""
+        return self._locations_loaded.is_set()
+
+    def wait_for_locations(self, timeout=None):
+        """
+        Garante que o mapa de locais está carregado, iniciando o carregamento se necessário
+        e bloqueando até `timeout` segundos. Devolve True se o carregamento terminou.
+        Uma nova tentativa após uma carga falhada nunca bloqueia: devolve False de imediato.
+        """
+        with self._locations_lock:
+            retrying = self._locations_retrying
+        if retrying:
+            return False
+        if not self._locations_loaded.is_set():
+            self.start_loading_locations()
+        loaded = self._locations_loaded.wait(timeout)
+        if loaded:
+            self.retry_loading_locations()
+        return loaded
 
     # Método para definir a localização através do NOME
-    def set_location_by_name(self, location_name):
+    def set_location_by_name(self, location_name, timeout=LOCATION_LOOKUP_TIMEOUT):
         """
         Define a localização atual usando o nome do local e encontra o ID correspondente.
+        Se o nome não existir tal como foi escrito, usa o `LocationIndex`: ignora
+        acentos, maiúsculas e qualificadores entre parênteses e tolera erros de escrita.
+        Espera no máximo `timeout` segundos pelo mapa de locais (None: sem limite);
+        se ainda não estiver carregado, devolve False sem alterar a localização.
         """
         if not location_name:
             logging.warning("Nome de localização inválido fornecido.")
@@ -41,8 +181,16 @@ class MainController:
 
         location_name_cleaned = location_name.strip() # Limpa espaços em branco
 
-        # Procura o ID no mapa inverso (agora já inicializado corretamente)
+        # Procura o ID no mapa inverso (espera um pouco pelo carregamento em segundo plano, se ainda estiver em curso)
+        if not self.wait_for_locations(timeout) and not self.locations_map_id_to_name:
+            logging.warning(f"Os locais ainda estão a carregar; '{location_name_cleaned}' não foi definido.")
+            return False
         location_id = self.locations_map_name_to_id.get(location_name_cleaned)
+        if not location_id:
+            match = self.location_index.resolve(location_name_cleaned)
+            if match:
+                logging.info(f"'{location_name_cleaned}' interpretado como '{match[0]}'.")
+                location_id = match[1]
 
         if location_id:
             # Se encontrou o ID, usa o set_location normal para definir o ID e o nome
@@ -51,6 +199,9 @@ class MainController:
             return True
         else:
             logging.warning(f"Localização com nome '{location_name_cleaned}' não encontrada. Verifique o nome ou a lista de locais disponíveis.")
+            # Tal como em set_location: a previsão pedida para o local anterior deixa de interessar
+            if self.current_location_id is not None:
+                self.cancel_pending_forecast()
             self.current_location_id = None # Reseta se não encontrar
             self.current_location_name = "N/A"
             return False
@@ -62,6 +213,10 @@ class MainController:
         """
         # Tenta obter o ID como string para consistência nos mapas
         location_id_str = str(location_id)
+
+        # Uma previsão pedida para o local anterior deixa de interessar
+        if location_id_str != self.current_location_id:
+            self.cancel_pending_forecast()
         
         # Usa a função do glossário para obter o nome (que por sua vez usa a API)
         location_name = self.get_location_name(location_id_str)
@@ -77,88 +232,349 @@ class MainController:
             logging.info(f"Localização definida para: {self.current_location_name} (ID: {self.current_location_id})")
             return True
 
+    @metrics.timed("fetch_and_display_forecast")
     def fetch_and_display_forecast(self):
         """
         Busca, processa e prepara os dados da previsão para exibição na UI.
+        Bloqueia durante o pedido à API; a UI deve usar fetch_forecast_async().
         """
         if not self.current_location_id:
             logging.warning("Não há localização definida para mostrar a previsão.")
             return False
 
-        logging.info(f"A procurar a previsão para: {self.current_location_name} (ID: {self.current_location_id})")
-        
+        processed_data = self._fetch_and_process_forecast(self.current_location_id, self.current_location_name)
+        self.current_weather_data = processed_data
+
+        # Numa UI real: self.ui.display_weather_data(self.current_weather_data) = UI PARA DESENVOLVER
+        return processed_data is not None
+
+    @metrics.timed("forecast_request")
+    def _fetch_and_process_forecast(self, location_id, location_name):
+        """
+        Busca e processa a previsão de um local. Não altera o estado do controller,
+        pelo que pode correr numa thread de trabalho.
+
+        Returns:
+            dict or None: Os dados processados, ou None em caso de falha.
+        """
+        logging.info(f"A procurar a previsão para: {location_name} (ID: {location_id})")
+        with self._forecast_lock:
+            self._location_requests[location_id] += 1
+
         # 1. Encontrar a previsão diária
-        forecast_data = self.ipma_api.get_daily_forecast(self.current_location_id)
-        
+        forecast_data = self.ipma_api.get_daily_forecast(location_id)
+
         if forecast_data is None:
-            logging.error(f"Falha ao obter dados de previsão para {self.current_location_name}.")
-            # Limpa os dados antigos, se houver
-            self.current_weather_data = None
-            return False
+            logging.error(f"Falha ao obter dados de previsão para {location_name}.")
+            return None
 
         # 2. Processar os dados brutos
-        processed_data = self._process_forecast_data(forecast_data)
-        
+        processed_data = self._process_forecast_data(forecast_data, location_name, location_id)
+
         if processed_data is None:
-            logging.error("Faltam dados essenciais na resposta da API ou ocorreram erros no processamento para {self.current_location_name}.")
-            self.current_weather_data = None
-            return False
-            
-        self.current_weather_data = processed_data
-        logging.info(f"Previsão processada para {self.current_location_name} pronta para exibição.")
-        
-        # 3. Transmitir os dados processados para a UI
-        # Numa UI real: self.ui.display_weather_data(self.current_weather_data) = UI PARA DESENVOLVER 
-        return True
+            logging.error(f"Faltam dados essenciais na resposta da API ou ocorreram erros no processamento para {location_name}.")
+            return None
+
+        logging.info(f"Previsão processada para {location_name} pronta para exibição.")
+        return processed_data
+
+    def fetch_forecast_async(self, on_done):
+        """
+        Busca e processa a previsão do local atual num pool de threads de trabalho,
+        sem bloquear o chamador (ex: a thread do Tkinter).
+
+        Um novo pedido (ou uma mudança de local) torna obsoletos os anteriores: se
+        ainda não começaram são cancelados, e se já estão em curso o resultado é
+        descartado sem chamar `on_done`.
+
+        Args:
+            on_done (callable): Chamada como `on_done(success, data, request_id)` na
+                thread de trabalho. As views devem reencaminhá-la para a thread do
+                Tkinter (ver `views/tk_dispatcher.py`).
 
-    def _process_forecast_data(self, raw_forecast_data):
+        Returns:
+            int or None: Identificador do pedido, ou None se não houver local definido.
+        """
+        if not self.current_location_id:
+            logging.warning("Não há localização definida para mostrar a previsão.")
+            return None
+
+        with self._forecast_lock:
+            self._forecast_generation += 1
+            request_id = self._forecast_generation
+            if self._forecast_future is not None:
+                self._forecast_future.cancel()
+            if self._forecast_executor is None:
+                self._forecast_executor = ThreadPoolExecutor(max_workers=FORECAST_WORKERS,
+                                                             thread_name_prefix="forecast-worker")
+            self._forecast_future = self._forecast_executor.submit(
+                self._run_forecast_request, request_id,
+                self.current_location_id, self.current_location_name, on_done)
+        return request_id
+
+    def _run_forecast_request(self, request_id, location_id, location_name, on_done):
+        """Corpo de um pedido assíncrono de previsão (corre na thread de trabalho)."""
+        if not self._is_current_forecast_request(request_id):
+            return
+
+        processed_data = self._fetch_and_process_forecast(location_id, location_name)
+
+        with self._forecast_lock:
+            if request_id != self._forecast_generation:
+                logging.info(f"Previsão para {location_name} descartada: foi pedida outra entretanto.")
+                return
+            self.current_weather_data = processed_data
+
+        try:
+            on_done(processed_data is not None, processed_data, request_id)
+        except Exception as e:
+            logging.error(f"Erro ao entregar a previsão de {location_name}: {e}")
+
+    def _is_current_forecast_request(self, request_id):
+        with self._forecast_lock:
+            return request_id == self._forecast_generation
+
+    def cancel_pending_forecast(self):
+        """Torna obsoleto qualquer pedido assíncrono de previsão pendente ou em curso."""
+        with self._forecast_lock:
+            self._forecast_generation += 1
+            if self._forecast_future is not None:
+                self._forecast_future.cancel()
+                self._forecast_future = None
+
+    def shutdown(self):
+        """Cancela pedidos pendentes e liberta o pool de threads de trabalho."""
+        self.cancel_pending_forecast()
+        with self._forecast_lock:
+            executor, self._forecast_executor = self._forecast_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @metrics.timed("forecast_processing")
+    def _process_forecast_data(self, raw_forecast_data, location_name=None, location_id=None):
         """
         Processa os dados brutos da API para extracção e formatação.
+        `location_name`/`location_id` assumem por omissão o local atual do controller.
         """
+        location_name = self.current_location_name if location_name is None else location_name
+        location_id = self.current_location_id if location_id is None else location_id
+
+        series = self._process_forecast_series(raw_forecast_data, location_name, location_id)
+        if series is None:
+            return None
+
+        # O dia apresentado por omissão é o primeiro; os restantes ficam na série
+        # (ver get_forecast_day) sem ser preciso voltar a processar a resposta.
+        return self._build_day_view(series, 0)
+
+    def _process_forecast_series(self, raw_forecast_data, location_name=None, location_id=None):
+        """
+        Converte todos os dias da resposta da API numa `ForecastSeries` (colunas),
+        numa só passagem.
+
+        Returns:
+            ForecastSeries or None: A série, ou None se os dados estiverem vazios ou mal formatados.
+        """
+        location_name = self.current_location_name if location_name is None else location_name
+        location_id = self.current_location_id if location_id is None else location_id
+
         if not raw_forecast_data or not raw_forecast_data.get('data'):
             logging.warning("Dados brutos de previsão vazios ou mal formatados.")
             return None
 
-        daily_forecasts = raw_forecast_data['data']
-        if not daily_forecasts:
-            logging.warning("Nenhum dia de previsão encontrado nos dados brutos.")
+        try:
+            series = ForecastSeries.from_payload(raw_forecast_data, location_name, location_id)
+        except Exception as e:
+            logging.error(f"Erro ao processar dados de previsão para {location_name}: {e}")
             return None
 
-        # Assume-se que a primeira entrada na lista 'data' é a previsão mais relevante.
-        # Numa aplicação mais complexa, poderiam existir mecanismos para selecionar um dia específico. 
-        #   ======================  "IMPORTANTE" ================ ESCALABILIDADE E FUNCIONALIDADE ======
-        first_day_data = daily_forecasts[0]
-        
+        logging.info(f"Dados de previsão processados para {location_name} ({len(series)} dias).")
+        return series
+
+    def _build_day_view(self, series, index):
+        """
+        Devolve o dia `index` da série como `ForecastRecord` (lido pelas views como um dicionário), com as
+        descrições traduzidas pelo glossário e a própria série em "forecast_series".
+        """
         try:
-            processed_info = {
-                "location_name": self.current_location_name, # O nome já está definido no controller
-                "location_id": raw_forecast_data.get("globalIdLocal", self.current_location_id),
-                "forecast_date": first_day_data.get("forecastDate", "N/A"),
-                "temp_min": first_day_data.get("tMin", "N/A"),
-                "temp_max": first_day_data.get("tMax", "N/A"),
-                "weather_id": first_day_data.get("idWeatherType"),
-                "wind_speed_class": first_day_data.get("classWindSpeed", "N/A"),
-                "wind_dir": first_day_data.get("predWindDir", "N/A"),
-            }
-            
+            processed_info = series.day(index)
             # Traduz os IDs usando as funções do glossário
-            processed_info["weather_description"] = self.get_weather_desc(processed_info["weather_id"])
-            processed_info["wind_speed_description"] = self.get_wind_desc(processed_info["wind_speed_class"])
-            
-            logging.info(f"Dados de previsão processados para {self.current_location_name}.")
+            processed_info.weather_description = self.get_weather_desc(processed_info.weather_id)
+            processed_info.wind_speed_description = self.get_wind_desc(processed_info.wind_speed_class)
+            processed_info.forecast_series = series
             return processed_info
-            
         except Exception as e:
-            logging.error(f"Erro ao processar dados de previsão para {self.current_location_name}: {e}")
+            logging.error(f"Erro ao processar o dia {index} da previsão para {series.location_name}: {e}")
             return None
 
+    def describe_series(self, series):
+        """
+        Descrições do tempo e do vento de todos os dias de `series`.
+
+        Returns:
+            tuple: (descrições do tempo, descrições do vento), uma por dia.
+        """
+        if self.translate_many is not None:
+            return self.translate_many(series.weather_ids, series.wind_speed_classes)
+        days = list(series.days())
+        return ([self.get_weather_desc(day.weather_id) for day in days],
+                [self.get_wind_desc(day.wind_speed_class) for day in days])
+
+    def get_forecast_day(self, index):
+        """
+        Devolve o dia `index` (0 = primeiro) da última previsão obtida, no mesmo
+        formato de get_current_weather_data(), ou None se não existir.
+        """
+        series = self.get_current_forecast_series()
+        if series is None or not 0 <= index < len(series):
+            return None
+        return self._build_day_view(series, index)
+
+    def get_current_forecast_series(self):
+        """Devolve a `ForecastSeries` (todos os dias) da última previsão obtida, ou None."""
+        if not self.current_weather_data:
+            return None
+        return self.current_weather_data.get("forecast_series")
+
+    def resolve_location_ids(self, names_or_ids=None):
+        """
+        Converte nomes e/ou IDs de locais em IDs conhecidos. Sem argumentos,
+        devolve todos os locais. Entradas desconhecidas são registadas e ignoradas.
+        """
+        self.wait_for_locations()
+        if not names_or_ids:
+            return list(self.locations_map_id_to_name)
+
+        location_ids = []
+        for entry in names_or_ids:
+            entry = str(entry).strip()
+            if entry in self.locations_map_id_to_name:
+                location_ids.append(entry)
+            elif entry in self.locations_map_name_to_id:
+                location_ids.append(self.locations_map_name_to_id[entry])
+            else:
+                match = self.location_index.lookup(entry) # Sem acentos/maiúsculas, mas sem aproximação
+                if match:
+                    location_ids.append(match[1])
+                else:
+                    logging.warning(f"Local '{entry}' não encontrado; ignorado.")
+        return list(dict.fromkeys(location_ids))
+
+    def iter_forecasts(self, location_ids, max_workers=DEFAULT_MAX_CONCURRENCY):
+        """
+        Busca em paralelo as previsões de vários locais (ver IPMAApi.iter_daily_forecasts)
+        e devolve-as processadas, pela ordem de chegada. Não altera o local atual.
+
+        Yields:
+            tuple: (location_id, location_name, ForecastSeries or None, erro or None).
+        """
+        for location_id, raw_forecast_data, error in self.ipma_api.iter_daily_forecasts(location_ids, max_workers):
+            location_name = self.locations_map_id_to_name.get(location_id) or self.get_location_name(location_id)
+            if error is None and raw_forecast_data is None:
+                error = "Previsão indisponível"
+            series = None
+            if error is None:
+                series = self._process_forecast_series(raw_forecast_data, location_name, location_id)
+                if series is None:
+                    error = "Dados de previsão vazios ou mal formatados"
+            yield location_id, location_name, series, error
+
+    def get_most_requested_locations(self, limit=None):
+        """
+        IDs dos locais cuja previsão foi pedida pelo utilizador (ex: na UI), do
+        mais pedido para o menos pedido; até `limit` locais (todos, por omissão).
+        """
+        with self._forecast_lock:
+            return [location_id for location_id, _ in self._location_requests.most_common(limit)]
+
     # Método para obter os dados processados para a UI
     def get_current_weather_data(self):
         """Retorna os dados de previsão processados para a localização atual."""
         return self.current_weather_data
 
+    def search_location_names(self, text, limit=None):
+        """
+        Nomes de locais para autocompletar `text`: primeiro os que começam pelo texto
+        (ou em que uma palavra começa por ele) e, se não houver nenhum, os mais
+        parecidos. Com `text` vazio devolve todos, por ordem alfabética.
+        Não bloqueia: antes de os locais carregarem devolve uma lista vazia.
+        """
+        index = self.location_index
+        limit = len(index) if limit is None else limit
+        names = index.search(text, limit)
+        if not names and text.strip():
+            names = [name for name, _ in index.fuzzy(text, limit)]
+        return names
+
+    def find_nearest_location(self, latitude, longitude, k=1, max_distance_km=None):
+        """
+        Locais de previsão do IPMA mais próximos de um ponto (ex: uma praia).
+
+        Returns:
+            list: Até `k` `GeoMatch(location_id, name, distance_km)`, do mais perto
+                  para o mais longe (vazia se não houver coordenadas carregadas).
+        """
+        self.wait_for_locations()
+        return self.geo_index.nearest(latitude, longitude, k=k, max_distance_km=max_distance_km)
+
+    def find_locations_within(self, latitude, longitude, radius_km):
+        """Todos os locais de previsão a menos de `radius_km` de um ponto, do mais perto para o mais longe."""
+        self.wait_for_locations()
+        return self.geo_index.within(latitude, longitude, radius_km)
+
+    def get_beach_forecasts(self, catalogue, max_workers=DEFAULT_MAX_CONCURRENCY, max_distance_km=None):
+        """
+        Previsões para todas as praias de um `BeachCatalogue`.
+
+        Cada praia é associada ao local de previsão do IPMA mais próximo; cada
+        local distinto é pedido uma única vez (em paralelo) e o resultado é
+        partilhado por todas as praias que lhe estão associadas.
+
+        Returns:
+            tuple: (resultados, estatísticas). `resultados` é uma lista, pela ordem
+                do catálogo, de dicts com beach, location_id, location_name,
+                distance_km, forecast_series (ForecastSeries or None) e error.
+                `estatísticas` tem beaches, unassigned, distinct_locations,
+                network_calls_saved e failed_locations.
+        """
+        self.wait_for_locations()
+        assignments = catalogue.assign_forecast_locations(self.geo_index, max_distance_km)
+        location_ids = list(dict.fromkeys(match.location_id for match in assignments.values() if match))
+
+        forecasts = {}
+        for location_id, location_name, series, error in self.iter_forecasts(location_ids, max_workers):
+            forecasts[location_id] = (series, error)
+
+        results = []
+        for beach in catalogue:
+            match = assignments[beach.beach_id]
+            if match is None:
+                results.append({"beach": beach, "location_id": None, "location_name": None, "distance_km": None,
+                                "forecast_series": None, "error": "Sem local de previsão próximo"})
+                continue
+            series, error = forecasts.get(match.location_id, (None, "Previsão indisponível"))
+            results.append({"beach": beach, "location_id": match.location_id, "location_name": match.name,
+                            "distance_km": match.distance_km, "forecast_series": series, "error": error})
+
+        assigned = sum(1 for match in assignments.values() if match)
+        stats = {
+            "beaches": len(catalogue),
+            "unassigned": len(catalogue) - assigned,
+            "distinct_locations": len(location_ids),
+            "network_calls_saved": assigned - len(location_ids),
+            "failed_locations": sum(1 for _, error in forecasts.values() if error),
+        }
+        logging.info(f"Previsões de praias: {stats['beaches']} praias servidas com {stats['distinct_locations']} "
+                     f"pedidos ({stats['network_calls_saved']} pedidos poupados por deduplicação).")
+        return results, stats
+
     # Métodos relacionados com a lista completa de locais (se necessário no futuro)
     def get_available_location_names(self):
-        """Retorna uma lista de nomes de todas as localizações disponíveis."""
+        """
+        Retorna uma lista de nomes de todas as localizações disponíveis.
+        Bloqueia até o mapa de locais estar carregado; na thread da UI, confirmar
+        primeiro com are_locations_loaded().
+        """
+        self.wait_for_locations()
         # Usa o mapa que já foi carregado para obter apenas os nomes
         return list(self.locations_map_id_to_name.values())
@@ -0,0 +1,186 @@
+"""
+Atualização periódica das previsões em segundo plano (prefetch).
+
+Sem este serviço, uma previsão só é pedida ao IPMA quando o utilizador clica
+em "Procurar", e o primeiro clique depois de a cache expirar espera pela rede.
+O `PrefetchScheduler` volta a pedir, numa thread própria, as previsões de
+todos os locais (ou só dos mais pedidos) antes de a `ForecastCache` expirar e
+logo depois de cada publicação de novas previsões pelo IPMA, espaçando os
+pedidos segundo um limite de pedidos por segundo. As pesquisas do utilizador
+passam a ser servidas da cache.
+
+Os mesmos `start()`/`stop()` servem a aplicação Tk (`main.py --prefetch`) e o
+modo sem interface (`main.py prefetch`).
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# Horas (UTC) das corridas do modelo a partir das quais o IPMA publica novas previsões diárias
+IPMA_UPDATE_HOURS_UTC = (0, 12)
+# Margem (segundos) entre a hora da corrida e a publicação dos ficheiros
+DEFAULT_PUBLISH_DELAY = 30 * 60
+# Fração da validade da ForecastCache ao fim da qual as previsões são renovadas
+REFRESH_TTL_FRACTION = 0.8
+# Pedidos por segundo durante uma atualização (os ~35 locais demoram ~18 s)
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+
+def next_update_time(now, update_hours=IPMA_UPDATE_HOURS_UTC, publish_delay=DEFAULT_PUBLISH_DELAY):
+    """
+    Próximo instante (segundos desde a época) em que o IPMA terá publicado
+    previsões novas, depois de `now`.
+    """
+    midnight = datetime.fromtimestamp(now, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    for days in (0, 1):
+        for hour in sorted(update_hours):
+            published = (midnight + timedelta(days=days, hours=hour)).timestamp() + publish_delay
+            if published > now:
+                return published
+    return now + 24 * 60 * 60 # Sem horas configuradas: uma vez por dia
+
+
+class PrefetchScheduler:
+    """
+    Serviço que mantém a cache de previsões quente.
+
+    Args:
+        controller (MainController): Dá acesso à `IPMAApi`, aos locais e aos locais mais pedidos.
+        interval (float, optional): Segundos entre atualizações. Por omissão,
+            `REFRESH_TTL_FRACTION` da validade da `forecast_cache` da API.
+        top_n (int, optional): Atualiza só os `top_n` locais mais pedidos (e o local
+            atual); enquanto não houver nenhum, todos. Por omissão, todos os locais.
+        locations (iterable, optional): Nomes ou IDs a atualizar (tem prioridade sobre `top_n`).
+        requests_per_second (float): Ritmo máximo de pedidos durante uma atualização.
+        update_hours (tuple): Horas UTC das publicações do IPMA; há sempre uma
+            atualização logo a seguir a cada publicação.
+        publish_delay (float): Segundos entre a hora da publicação e a atualização.
+        clock (callable): Relógio de parede, em segundos desde a época (injetável nos testes).
+    """
+    def __init__(self, controller, interval=None, top_n=None, locations=None,
+                 requests_per_second=DEFAULT_REQUESTS_PER_SECOND, update_hours=IPMA_UPDATE_HOURS_UTC,
+                 publish_delay=DEFAULT_PUBLISH_DELAY, clock=time.time):
+        self.controller = controller
+        if interval is None:
+            interval = controller.ipma_api.forecast_cache.ttl * REFRESH_TTL_FRACTION
+        self.interval = interval
+        self.top_n = top_n
+        self.locations = list(locations) if locations else None
+        self.requests_per_second = requests_per_second
+        self.update_hours = tuple(update_hours)
+        self.publish_delay = publish_delay
+        self._clock = clock
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"cycles": 0, "refreshed": 0, "failed": 0,
+                      "last_cycle_seconds": None, "next_run_at": None}
+
+    def start(self):
+        """Inicia (uma única vez) a thread de atualização. A primeira atualização é imediata."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="forecast-prefetch", daemon=True)
+            self._thread.start()
+        logging.info("Prefetch: serviço de atualização de previsões iniciado.")
+        return self
+
+    def stop(self, timeout=5.0):
+        """Pede à thread para parar (interrompe a espera e a atualização em curso) e espera por ela."""
+        self._stop_event.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+            logging.info("Prefetch: serviço de atualização de previsões parado.")
+
+    def is_running(self):
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Bloqueia até o serviço parar (modo sem interface) ou até `timeout` segundos."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def targets(self):
+        """IDs dos locais a atualizar no próximo ciclo."""
+        if self.locations:
+            return self.controller.resolve_location_ids(self.locations)
+        if self.top_n is None:
+            return self.controller.resolve_location_ids()
+        targets = self.controller.get_most_requested_locations(self.top_n)
+        current = self.controller.current_location_id
+        if current and current not in targets:
+            targets.insert(0, current)
+        if not targets:
+            # Sem pedidos nem local atual (ex: `main.py prefetch`, ou a GUI acabada de abrir): todos os locais
+            return self.controller.resolve_location_ids()
+        return targets
+
+    def next_run_at(self, now):
+        """Instante da próxima atualização: após `interval` ou logo após a próxima publicação do IPMA."""
+        return min(now + self.interval, next_update_time(now, self.update_hours, self.publish_delay))
+
+    def run_cycle(self):
+        """
+        Atualiza uma vez as previsões de `targets()`, ao ritmo de `requests_per_second`.
+        Garante também que os locais e os tipos de tempo estão carregados.
+
+        Returns:
+            dict: {"locations", "refreshed", "failed", "seconds"}.
+        """
+        started = time.monotonic()
+        api = self.controller.ipma_api
+        self.controller.wait_for_locations()
+        api.get_weather_type_descriptions(wait=True)
+
+        spacing = 1.0 / self.requests_per_second if self.requests_per_second else 0.0
+        targets = self.targets()
+        refreshed = failed = 0
+        for position, location_id in enumerate(targets):
+            if position and self._stop_event.wait(spacing):
+                break
+            if api.refresh_daily_forecast(location_id) is None:
+                failed += 1
+            else:
+                refreshed += 1
+
+        seconds = time.monotonic() - started
+        with self._lock:
+            self.stats["cycles"] += 1
+            self.stats["refreshed"] += refreshed
+            self.stats["failed"] += failed
+            self.stats["last_cycle_seconds"] = seconds
+        logging.info(f"Prefetch: {refreshed} previsões atualizadas ({failed} falhas) em {seconds:.1f}s.")
+        return {"locations": len(targets), "refreshed": refreshed, "failed": failed, "seconds": seconds}
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_cycle()
+            except Exception as e:
+                logging.error(f"Prefetch: erro inesperado na atualização de previsões: {e}")
+            now = self._clock()
+            next_run = self.next_run_at(now)
+            with self._lock:
+                self.stats["next_run_at"] = next_run
+            logging.info(f"Prefetch: próxima atualização às "
+                         f"{datetime.fromtimestamp(next_run).strftime('%H:%M:%S')}.")
+            self._stop_event.wait(max(0.0, next_run - now))
+
+    def get_stats(self):
+        """Cópia dos contadores (cycles, refreshed, failed, last_cycle_seconds, next_run_at)."""
+        with self._lock:
+            return dict(self.stats)
@@ -1,64 +1,226 @@
-
-import tkinter as tk
 import logging
 import sys
 import os
-import argparse # Importa o módulo argparse para a utilização de duas views
+import argparse # Importa o módulo argparse para a utilização de duas views e do modo de exportação
 
 # --- Configuração do Path e Imports ---
 project_root_dir = os.path.abspath(os.path.dirname(__file__))
 if project_root_dir not in sys.path:
     sys.path.insert(0, project_root_dir)
 
-# Importa as dependências do backend
-from models.ipma_api import IPMAApi
-from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description
-from controllers.main_controller import MainController
-
-# Importa as classes de janela (ambas)
-from views.main_window import MainWindow # A view mais "completa" (demais para o caso útil)
-from views.minimal_window import MinimalWindow # A view mais "simples"
+# Os módulos do backend, o tkinter e as views só são importados quando são
+# precisos (ver create_controller e run_gui): `--help` não carrega o `requests`,
+# o subcomando `export` não carrega Tk nem Pillow, e a GUI só importa a view
+# escolhida.
 
 
-def setup_application_logging():
+def setup_application_logging(level=logging.INFO):
     """Configura o logging global para a aplicação."""
     if not logging.getLogger().handlers:
         logging.basicConfig(
-            level=logging.INFO,
+            level=level,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         )
     logging.info("Logging configurado para a aplicação.")
 
-def run_application():
-    """Inicia a aplicação GUI."""
-    setup_application_logging()
-    logging.info("Iniciando a aplicação GUI...")
+def _add_cache_arguments(parser, suppress_defaults=False):
+    """Opções da cache em disco, comuns à GUI e ao subcomando `export`."""
+    # No subparser os valores por omissão são suprimidos para não sobreporem
+    # as opções dadas antes do subcomando (ex: `main.py --no-disk-cache export`).
+    parser.add_argument('--cache-dir', type=str,
+                        default=argparse.SUPPRESS if suppress_defaults else None,
+                        help="Diretório da cache em disco das respostas do IPMA "
+                             "(padrão: $GUIA_PRAIAS_CACHE_DIR ou ~/.cache/guia_praias).")
+    parser.add_argument('--no-disk-cache', action='store_true',
+                        default=argparse.SUPPRESS if suppress_defaults else False,
+                        help="Desativa a cache em disco (todos os dados são pedidos à API).")
 
-    # --- Configuração do argparse para escolher a view ---
+def _add_source_arguments(parser, suppress_defaults=False):
+    """Origem dos dados (API real ou servidor local), comum à GUI e aos subcomandos."""
+    parser.add_argument('--ipma-url', type=str,
+                        default=argparse.SUPPRESS if suppress_defaults else None,
+                        help="URL base dos dados abertos do IPMA (padrão: $GUIA_PRAIAS_IPMA_URL ou "
+                             "https://api.ipma.pt/open-data/). Ex: http://127.0.0.1:8765/open-data/ "
+                             "para usar tools/ipma_standin.py.")
+
+def _add_metrics_arguments(parser, suppress_defaults=False):
+    """Exportação das métricas de desempenho, comum à GUI e aos subcomandos."""
+    parser.add_argument('--metrics-out', type=str, metavar='FICHEIRO',
+                        default=argparse.SUPPRESS if suppress_defaults else None,
+                        help="Mede o tempo de cada etapa (rede, JSON, processamento, UI) e grava as métricas "
+                             "à saída: JSON se o ficheiro terminar em .json, senão formato do Prometheus.")
+
+def build_argument_parser():
+    """Constrói o parser da linha de comandos (GUI por omissão, ou o subcomando `export`)."""
     parser = argparse.ArgumentParser(description="Guia de Praias - Aplicação de Previsão Meteorológica.")
     parser.add_argument('--view', type=str, default='main',
                         choices=['main', 'minimal'],
                         help="Escolha a view a ser utilizada: 'main' (padrão) ou 'minimal'.")
-    args = parser.parse_args()
+    _add_cache_arguments(parser)
+    _add_source_arguments(parser)
+    _add_metrics_arguments(parser)
+    parser.add_argument('--prefetch', action='store_true',
+                        help="Atualiza as previsões em segundo plano, para que as pesquisas sejam servidas da cache.")
+    parser.add_argument('--prefetch-top', type=int, default=None, metavar='N',
+                        help="Atualiza só os N locais mais pedidos (padrão: todos; também todos enquanto "
+                             "não houver pedidos, como no subcomando `prefetch`).")
 
-    # --- Inicialização do Backend (Controller) ---
-    ipma_api_instance = IPMAApi()
-    main_controller = MainController(
+    subparsers = parser.add_subparsers(dest='command')
+    export_parser = subparsers.add_parser(
+        'export', help="Exporta, sem interface gráfica, as previsões de todos os locais (ou de alguns).")
+    export_parser.add_argument('--format', type=str, default='jsonl', choices=['jsonl', 'csv'],
+                               help="Formato de saída: 'jsonl' (padrão) ou 'csv'.")
+    export_parser.add_argument('--output', '-o', type=str, default='-',
+                               help="Ficheiro de saída ('-' para stdout, padrão).")
+    export_parser.add_argument('--locations', type=str, default=None,
+                               help="Nomes ou IDs de locais separados por vírgulas (padrão: todos).")
+    export_parser.add_argument('--beaches', type=str, default=None, metavar='CATALOGO',
+                               help="Exporta por praia, a partir de um catálogo CSV/JSON "
+                                    "(ex: static_data/beaches.csv), em vez de por local do IPMA.")
+    export_parser.add_argument('--days', type=int, default=None,
+                               help="Número máximo de dias por local (padrão: todos os da previsão).")
+    export_parser.add_argument('--concurrency', type=int, default=None,
+                               help="Número máximo de pedidos simultâneos à API (padrão: 40).")
+    export_parser.add_argument('--verbose', action='store_true',
+                               help="Mostra o registo de cada pedido (por omissão só avisos e erros).")
+    _add_cache_arguments(export_parser, suppress_defaults=True)
+    _add_source_arguments(export_parser, suppress_defaults=True)
+    _add_metrics_arguments(export_parser, suppress_defaults=True)
+
+    prefetch_parser = subparsers.add_parser(
+        'prefetch', help="Mantém, sem interface gráfica, as previsões atualizadas na cache em disco.")
+    prefetch_parser.add_argument('--locations', type=str, default=None,
+                                 help="Nomes ou IDs de locais separados por vírgulas (padrão: todos).")
+    prefetch_parser.add_argument('--interval', type=float, default=None,
+                                 help="Segundos entre atualizações (padrão: antes de a cache expirar "
+                                      "e logo após cada publicação do IPMA).")
+    prefetch_parser.add_argument('--rate', type=float, default=None,
+                                 help="Pedidos por segundo durante uma atualização (padrão: 2).")
+    prefetch_parser.add_argument('--once', action='store_true',
+                                 help="Faz uma única atualização e termina.")
+    prefetch_parser.add_argument('--verbose', action='store_true',
+                                 help="Mostra o registo de cada pedido e de cada atualização (por omissão só avisos e erros).")
+    _add_cache_arguments(prefetch_parser, suppress_defaults=True)
+    _add_source_arguments(prefetch_parser, suppress_defaults=True)
+    _add_metrics_arguments(prefetch_parser, suppress_defaults=True)
+    return parser
+
+def create_controller(args):
+    """Cria a IPMAApi (com a cache em disco e o URL base configurados) e o MainController que a usa."""
+    from models.ipma_api import IPMAApi
+    from models.disk_cache import DiskCache
+    from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description, set_ipma_api, translate_many
+    from controllers.main_controller import MainController
+
+    disk_cache = None if args.no_disk_cache else DiskCache(args.cache_dir)
+    ipma_api_instance = IPMAApi(disk_cache=disk_cache, base_url=args.ipma_url)
+    set_ipma_api(ipma_api_instance) # O glossário partilha a mesma instância (uma só carga de locais/tipos de tempo)
+    return MainController(
         ipma_api=ipma_api_instance,
         weather_desc_func=get_weather_description,
         location_name_func=get_location_name,
-        wind_desc_func=get_wind_speed_description
+        wind_desc_func=get_wind_speed_description,
+        translate_many_func=translate_many
+    )
+
+def run_export(args):
+    """Exporta as previsões em JSON Lines/CSV sem interface gráfica. Devolve o código de saída."""
+    from controllers.forecast_export import export_forecasts, export_beach_forecasts
+    from models.ipma_api import DEFAULT_MAX_CONCURRENCY
+
+    main_controller = create_controller(args)
+    main_controller.start_loading_locations()
+    locations = [name for name in args.locations.split(',') if name.strip()] if args.locations else None
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    max_workers = args.concurrency or DEFAULT_MAX_CONCURRENCY
+    try:
+        if args.beaches:
+            from models.beach_catalogue import BeachCatalogue
+            stats = export_beach_forecasts(main_controller, BeachCatalogue.load(args.beaches), out,
+                                           fmt=args.format, max_workers=max_workers, max_days=args.days)
+        else:
+            stats = export_forecasts(main_controller, out, fmt=args.format, locations=locations,
+                                     max_workers=max_workers, max_days=args.days)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        main_controller.shutdown()
+        main_controller.ipma_api.close()
+
+    # O relatório vai para stderr, para não se misturar com os dados em stdout
+    if args.beaches:
+        print(f"Exportadas {stats['records']} linhas de {stats['beaches']} praias em {stats['elapsed']:.2f} s "
+              f"com {stats['distinct_locations']} pedidos de previsão ({stats['network_calls_saved']} poupados "
+              f"por deduplicação); {stats['failed']} praias sem previsão.", file=sys.stderr)
+        # Nada exportado (nenhuma praia com previsão) é uma falha, mesmo sem erros individuais
+        return 0 if stats['records'] else 1
+    print(f"Exportadas {stats['records']} linhas de {stats['locations']} locais em {stats['elapsed']:.2f} s "
+          f"({stats['locations_per_second']:.1f} locais/s); {stats['failed']} locais falharam.",
+          file=sys.stderr)
+    return 0 if stats['locations'] and stats['records'] else 1
+
+def create_prefetch_scheduler(main_controller, args):
+    """Cria o PrefetchScheduler com as opções da linha de comandos (GUI ou subcomando `prefetch`)."""
+    from controllers.prefetch_scheduler import PrefetchScheduler, DEFAULT_REQUESTS_PER_SECOND
+
+    locations = getattr(args, 'locations', None)
+    return PrefetchScheduler(
+        main_controller,
+        interval=getattr(args, 'interval', None),
+        top_n=getattr(args, 'prefetch_top', None),
+        locations=[name for name in locations.split(',') if name.strip()] if locations else None,
+        requests_per_second=getattr(args, 'rate', None) or DEFAULT_REQUESTS_PER_SECOND,
     )
 
+def run_prefetch(args):
+    """Atualiza periodicamente as previsões (até Ctrl+C, ou uma vez com --once). Devolve o código de saída."""
+    main_controller = create_controller(args)
+    main_controller.start_loading_locations()
+    scheduler = create_prefetch_scheduler(main_controller, args)
+    try:
+        if args.once:
+            stats = scheduler.run_cycle()
+            print(f"Atualizadas {stats['refreshed']} de {stats['locations']} previsões em {stats['seconds']:.2f} s; "
+                  f"{stats['failed']} falharam.", file=sys.stderr)
+            # Nenhuma previsão atualizada (p. ex. os locais não carregaram) é uma falha
+            return 0 if stats['refreshed'] else 1
+        scheduler.start()
+        scheduler.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        main_controller.shutdown()
+        main_controller.ipma_api.close()
+    return 0
+
+def run_gui(args):
+    """Inicia a aplicação GUI (Tkinter)."""
+    import tkinter as tk
+
+    logging.info("Iniciando a aplicação GUI...")
+
+    # --- Inicialização do Backend (Controller) ---
+    main_controller = create_controller(args)
+    # Os locais começam a carregar já, em paralelo com a construção da janela
+    main_controller.start_loading_locations()
+    scheduler = None
+    if args.prefetch or args.prefetch_top:
+        scheduler = create_prefetch_scheduler(main_controller, args).start()
+
     # --- Criação da Janela Principal (View Selecionada) ---
     root = tk.Tk()
     root.title("Guia de Praias - Previsão Meteorológica") # Define o título da aplicação
     root.geometry("800x600") # Define um tamanho inicial para a janela
 
+    # Importa apenas a classe de janela escolhida (a MainWindow traz também o Pillow)
     if args.view == 'minimal':
+        from views.minimal_window import MinimalWindow # A view mais "simples"
         logging.info("Utilizando a view: MinimalWindow")
         app_window = MinimalWindow(root, main_controller)
     else: # args.view == 'main' ou default
+        from views.main_window import MainWindow # A view mais "completa" (demais para o caso útil)
         logging.info("Utilizando a view: MainWindow")
         # PASSA project_root_dir AQUI:
         app_window = MainWindow(root, main_controller, project_root_dir)
@@ -71,6 +233,36 @@ def run_application():
     # --- Loop Principal Tkinter ---
     root.mainloop()
 
-if __name__ == "__main__":
-    run_application()
+    # Cancela pedidos de previsão ainda em curso (e as atualizações em segundo plano) ao fechar a janela
+    if scheduler is not None:
+        scheduler.stop()
+    main_controller.shutdown()
+
+def run_application(argv=None):
+    """Ponto de entrada: inicia a GUI ou, com o subcomando `export`, a exportação sem interface."""
+    args = build_argument_parser().parse_args(argv)
+    if not args.metrics_out:
+        return _run_command(args)
+
+    from models import metrics
+    metrics.enable()
+    try:
+        return _run_command(args)
+    finally:
+        metrics.registry.dump(args.metrics_out)
+        logging.info(f"Métricas de desempenho gravadas em {args.metrics_out}.")
+
+def _run_command(args):
+    if args.command == 'export':
+        setup_application_logging(logging.INFO if args.verbose else logging.WARNING)
+        return run_export(args)
+    if args.command == 'prefetch':
+        setup_application_logging(logging.INFO if args.verbose else logging.WARNING)
+        return run_prefetch(args)
 
+    setup_application_logging()
+    run_gui(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run_application())
@@ -0,0 +1,215 @@
+"""
+Cliente HTTP/1.1 assíncrono mínimo, sobre `asyncio` (sem dependências extra).
+
+Mantém um pool de ligações keep-alive por host, partilhado por todas as
+corrotinas do mesmo event loop, com um limite de ligações simultâneas por
+host. Suporta apenas o necessário para os endpoints JSON do IPMA: pedidos
+GET, corpo com `Content-Length`, `Transfer-Encoding: chunked` ou até ao fecho
+da ligação, e respostas gzip.
+
+Os erros são levantados com as mesmas exceções de `requests`
+(`ConnectionError`, `Timeout`, `HTTPError`), para que o código cliente trate
+erros de forma igual nas versões síncrona e assíncrona.
+"""
+
+import asyncio
+import logging
+import ssl
+import zlib
+from urllib.parse import urlsplit
+
+import requests
+
+from models import json_backend
+from models.http_transport import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, DEFAULT_POOL_MAXSIZE
+
+USER_AGENT = "guia-praias-app/async"
+
+
+class AsyncHttpResponse:
+    """Resposta HTTP já lida por completo."""
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers # Nomes dos cabeçalhos em minúsculas
+        self.content = content
+
+    def json(self):
+        """Descodifica o corpo como JSON (levanta ValueError se for inválido)."""
+        return json_backend.loads(self.content)
+
+    def raise_for_status(self):
+        """Levanta `requests.exceptions.HTTPError` para respostas 4xx/5xx."""
+        if 400 <= self.status_code < 600:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error: {self.reason} for url: {self.url}")
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def is_usable(self):
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncConnectionPool:
+    """
+    Pool de ligações HTTP keep-alive para uso dentro de um único event loop.
+
+    Args:
+        max_per_host (int): Número máximo de pedidos/ligações simultâneos por host.
+        connect_timeout (float): Timeout para estabelecer a ligação.
+        read_timeout (float): Timeout para ler a resposta completa.
+        ssl_context (ssl.SSLContext, optional): Contexto TLS para URLs https.
+    """
+    def __init__(self, max_per_host=DEFAULT_POOL_MAXSIZE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, ssl_context=None):
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._ssl_context = ssl_context
+        self._idle = {} # (scheme, host, port) -> [_Connection, ...]
+        self._semaphores = {} # (scheme, host, port) -> asyncio.Semaphore
+        self.connections_opened = 0
+
+    def _semaphore(self, key):
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    async def _open_connection(self, scheme, host, port):
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context), self.connect_timeout)
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ConnectTimeout(f"Timeout ao ligar a {host}:{port}") from e
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(f"Erro ao ligar a {host}:{port}: {e}") from e
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def get(self, url, headers=None):
+        """
+        Executa um GET, reutilizando uma ligação livre do pool sempre que possível.
+
+        Returns:
+            AsyncHttpResponse: A resposta completa (ainda não validada).
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        key = (scheme, host, port)
+
+        host_header = host if parts.port is None else f"{host}:{port}"
+        request_lines = [
+            f"GET {target} HTTP/1.1",
+            f"Host: {host_header}",
+            f"User-Agent: {USER_AGENT}",
+            "Accept: application/json",
+            "Accept-Encoding: gzip",
+            "Connection: keep-alive",
+        ]
+        for name, value in (headers or {}).items():
+            request_lines.append(f"{name}: {value}")
+        request_bytes = ("\r\n".join(request_lines) + "\r\n\r\n").encode("latin-1")
+
+        async with self._semaphore(key):
+            idle = self._idle.setdefault(key, [])
+            while idle:
+                connection = idle.pop()
+                if not connection.is_usable():
+                    connection.close()
+                    continue
+                try:
+                    return await self._send(connection, key, url, request_bytes)
+                except (requests.exceptions.ConnectionError, ConnectionError):
+                    # Ligação keep-alive fechada pelo servidor entretanto; tenta com outra
+                    connection.close()
+
+            connection = await self._open_connection(scheme, host, port)
+            return await self._send(connection, key, url, request_bytes)
+
+    async def _send(self, connection, key, url, request_bytes):
+        try:
+            connection.writer.write(request_bytes)
+            await connection.writer.drain()
+            status_code, reason, response_headers, content, keep_alive = await asyncio.wait_for(
+                self._read_response(connection.reader), self.read_timeout)
+        except asyncio.TimeoutError as e:
+            connection.close()
+            raise requests.exceptions.ReadTimeout(f"Timeout ao ler a resposta de {url}") from e
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            connection.close()
+            raise requests.exceptions.ConnectionError(f"Ligação interrompida ao ler {url}: {e}") from e
+
+        if keep_alive:
+            self._idle[key].append(connection)
+        else:
+            connection.close()
+        return AsyncHttpResponse(url, status_code, reason, response_headers, content)
+
+    @staticmethod
+    async def _read_response(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Ligação fechada antes da resposta")
+        version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        status_code = int(status)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if status_code in (204, 304) or 100 <= status_code < 200:
+            content = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";")[0].strip(), 16)
+                if size == 0:
+                    # Descarta trailers até à linha vazia final
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+
+        if headers.get("content-encoding", "").lower() == "gzip":
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+
+        return status_code, (reason[0] if reason else ""), headers, content, keep_alive
+
+    async def close(self):
+        """Fecha todas as ligações livres do pool."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+        logging.debug("Async HTTP: pool de ligações fechado.")
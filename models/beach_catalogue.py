@@ -0,0 +1,91 @@
+"""
+Catálogo de praias (nome e coordenadas) e associação ao local de previsão do IPMA.
+
+O IPMA só publica previsões para algumas dezenas de cidades; cada praia é
+associada ao local de previsão mais próximo (`GeoIndex.nearest`), para que as
+previsões de milhares de praias se obtenham com um pedido por local distinto.
+O catálogo é lido de um ficheiro CSV ou JSON local (ver `static_data/beaches.csv`).
+"""
+
+import csv
+import logging
+import os
+from collections import namedtuple
+
+from models import json_backend
+
+DEFAULT_CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "static_data", "beaches.csv")
+
+Beach = namedtuple("Beach", ["beach_id", "name", "municipality", "latitude", "longitude"])
+
+
+class BeachCatalogue:
+    """
+    Lista de praias com pesquisa por ID e associação aos locais de previsão.
+
+    Args:
+        beaches (iterable): Objetos `Beach`.
+    """
+    def __init__(self, beaches=()):
+        self.beaches = list(beaches)
+        self._by_id = {beach.beach_id: beach for beach in self.beaches}
+
+    @classmethod
+    def load(cls, path=DEFAULT_CATALOGUE_PATH):
+        """
+        Lê o catálogo de um ficheiro `.csv` (colunas id, name, municipality,
+        latitude, longitude) ou `.json` (lista de objetos com as mesmas chaves,
+        ou `{"data": [...]}`). Linhas sem nome ou com coordenadas inválidas são ignoradas.
+        """
+        with open(path, encoding="utf-8", newline="") as f:
+            if path.lower().endswith(".json"):
+                data = json_backend.loads(f.read())
+                rows = data.get("data", []) if isinstance(data, dict) else data
+            else:
+                rows = list(csv.DictReader(f))
+
+        beaches, skipped = [], 0
+        for number, row in enumerate(rows, start=1):
+            try:
+                beaches.append(Beach(
+                    beach_id=str(row.get("id") or number),
+                    name=row["name"].strip(),
+                    municipality=(row.get("municipality") or "").strip(),
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                ))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                skipped += 1
+        if skipped:
+            logging.warning(f"Catálogo de praias: {skipped} linhas inválidas ignoradas em {path}.")
+        logging.info(f"Catálogo de praias: {len(beaches)} praias carregadas de {path}.")
+        return cls(beaches)
+
+    def __len__(self):
+        return len(self.beaches)
+
+    def __iter__(self):
+        return iter(self.beaches)
+
+    def get(self, beach_id):
+        """Devolve a praia com o ID dado, ou None."""
+        return self._by_id.get(str(beach_id))
+
+    def assign_forecast_locations(self, geo_index, max_distance_km=None):
+        """
+        Associa cada praia ao local de previsão mais próximo.
+
+        Args:
+            geo_index (GeoIndex): Coordenadas dos locais do IPMA.
+            max_distance_km (float, optional): Praias mais longe do que isto de
+                qualquer local ficam sem associação.
+
+        Returns:
+            dict: {beach_id: GeoMatch or None}.
+        """
+        assignments = {}
+        for beach in self.beaches:
+            nearest = geo_index.nearest(beach.latitude, beach.longitude, k=1, max_distance_km=max_distance_km)
+            assignments[beach.beach_id] = nearest[0] if nearest else None
+        return assignments
@@ -0,0 +1,122 @@
+"""
+Cache persistente em disco (SQLite) para respostas da API do IPMA.
+
+Guarda o JSON de cada endpoint (locais, tipos de tempo e previsões recentes)
+com o instante em que foi obtido, para que um arranque a frio leia os dados
+localmente em vez de esperar pela rede.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from models import json_backend
+
+CACHE_FILENAME = "ipma_cache.sqlite3"
+
+# Entrada lida da cache: payload JSON, instante de obtenção e validadores HTTP
+DiskCacheEntry = namedtuple("DiskCacheEntry", ["payload", "fetched_at", "etag", "last_modified"])
+
+
+def default_cache_dir():
+    """
+    Diretório por omissão da cache: `$GUIA_PRAIAS_CACHE_DIR`, ou
+    `$XDG_CACHE_HOME/guia_praias`, ou `~/.cache/guia_praias`.
+    """
+    configured = os.environ.get("GUIA_PRAIAS_CACHE_DIR")
+    if configured:
+        return configured
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "guia_praias")
+
+
+class DiskCache:
+    """
+    Armazenamento chave -> (payload JSON, instante de obtenção) num ficheiro SQLite.
+
+    Args:
+        directory (str, optional): Diretório onde fica o ficheiro da cache.
+            Se omitido, usa `default_cache_dir()`.
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, CACHE_FILENAME)
+        self._lock = threading.Lock()
+        # A mesma ligação é usada por várias threads, sempre sob self._lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                " key TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            # Colunas dos validadores HTTP, acrescentadas a caches criadas sem elas
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(payloads)")}
+            for column in ("etag", "last_modified"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE payloads ADD COLUMN {column} TEXT")
+        logging.info(f"Disk Cache: a usar {self.path}")
+
+    def get(self, key):
+        """
+        Devolve a entrada guardada para `key`.
+
+        Returns:
+            DiskCacheEntry or None: A entrada, ou None se não existir ou estiver corrompida.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at, etag, last_modified FROM payloads WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return DiskCacheEntry(json_backend.loads(row[0]), row[1], row[2], row[3])
+        except ValueError as e:
+            logging.warning(f"Disk Cache: entrada corrompida para {key} ignorada: {e}")
+            self.delete(key)
+            return None
+
+    def set(self, key, payload, fetched_at=None, etag=None, last_modified=None):
+        """Guarda `payload` (serializável em JSON) e os validadores HTTP para `key`."""
+        body = json_backend.dumps(payload)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO payloads (key, body, fetched_at, etag, last_modified)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, body, fetched_at, etag, last_modified),
+            )
+
+    def touch(self, key, fetched_at=None):
+        """Atualiza o instante de obtenção de `key` (ex: após uma resposta 304)."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE payloads SET fetched_at = ? WHERE key = ?", (fetched_at, key))
+
+    def delete(self, key):
+        """Remove a entrada de `key`, se existir."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM payloads WHERE key = ?", (key,))
+
+    def prune(self, max_age, key_prefix=""):
+        """Remove entradas (com o prefixo dado) obtidas há mais de `max_age` segundos."""
+        cutoff = time.time() - max_age
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM payloads WHERE fetched_at < ? AND key LIKE ?",
+                (cutoff, key_prefix + "%"),
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Fecha a ligação à base de dados."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,106 @@
+"""
+Cache em memória para previsões do IPMA, com validade (TTL) e despejo LRU.
+
+O IPMA só atualiza as previsões diárias algumas vezes por dia, por isso a
+mesma previsão pode ser servida da memória durante a validade configurada
+em vez de ser pedida de novo à API a cada clique.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# Validade por omissão de uma previsão em cache (segundos)
+DEFAULT_FORECAST_TTL = 30 * 60
+# Número máximo de previsões guardadas em simultâneo
+DEFAULT_MAX_ENTRIES = 512
+
+
+class ForecastCache:
+    """
+    Cache LRU com validade por entrada, segura para uso entre threads.
+
+    Args:
+        ttl (float): Validade de cada entrada, em segundos.
+        max_entries (int): Número máximo de entradas; ao ultrapassar, a entrada
+            usada há mais tempo é despejada. Com 0 a cache fica desativada.
+        clock (callable): Relógio monotónico (substituível nos testes).
+    """
+    def __init__(self, ttl=DEFAULT_FORECAST_TTL, max_entries=DEFAULT_MAX_ENTRIES, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict() # chave -> (expira_em, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Devolve o valor em cache para `key`, ou None se não existir ou tiver expirado."""
+        key = str(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Guarda `value` para `key`, despejando as entradas LRU se necessário.
+        `ttl` permite uma validade diferente da configurada (ex: o tempo restante
+        de uma previsão lida da cache em disco).
+        """
+        if self.max_entries <= 0:
+            return
+        key = str(key)
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Remove a entrada de `key`, se existir."""
+        with self._lock:
+            self._entries.pop(str(key), None)
+
+    def clear(self):
+        """Remove todas as entradas (os contadores mantêm-se)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Devolve os contadores da cache.
+
+        Returns:
+            dict: {"hits", "misses", "evictions", "expirations", "size", "hit_ratio"}.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,80 @@
+"""
+Registo de um dia de previsão, com atributos fixos (`__slots__`).
+
+Substitui o dicionário criado por cada dia processado: sem `__dict__` por
+instância, um registo ocupa cerca de metade da memória de um dicionário com as
+mesmas chaves. Para não obrigar a mudar as views nem as exportações, continua a
+aceitar o acesso por chave (`record["temp_min"]`, `record.get("wind_dir", "N/A")`).
+Para lotes grandes (todos os locais e dias), a `ForecastSeries` guarda as
+mesmas colunas em `array` e só cria registos quando são pedidos.
+"""
+
+# Campos de um registo, pela ordem usada em to_dict()
+RECORD_FIELDS = (
+    "location_name", "location_id", "forecast_date", "temp_min", "temp_max",
+    "precipitation_prob", "weather_id", "wind_speed_class", "wind_dir",
+    "weather_description", "wind_speed_description", "forecast_series", "day_index",
+)
+
+
+class ForecastRecord:
+    """
+    Um dia de previsão para um local.
+
+    Os campos são os de `RECORD_FIELDS`; os que não forem dados ficam a None.
+    Aceita também a interface de leitura de um dicionário (`[]`, `get`, `in`,
+    `keys`) e `[] =` para os mesmos campos.
+    """
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, location_name=None, location_id=None, forecast_date=None, temp_min=None, temp_max=None,
+                 precipitation_prob=None, weather_id=None, wind_speed_class=None, wind_dir=None,
+                 weather_description=None, wind_speed_description=None, forecast_series=None, day_index=None):
+        self.location_name = location_name
+        self.location_id = location_id
+        self.forecast_date = forecast_date
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.precipitation_prob = precipitation_prob
+        self.weather_id = weather_id
+        self.wind_speed_class = wind_speed_class
+        self.wind_dir = wind_dir
+        self.weather_description = weather_description
+        self.wind_speed_description = wind_speed_description
+        self.forecast_series = forecast_series
+        self.day_index = day_index
+
+    def __getitem__(self, key):
+        if key not in RECORD_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in RECORD_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in RECORD_FIELDS
+
+    def get(self, key, default=None):
+        """Como dict.get(): devolve `default` só para campos desconhecidos."""
+        return getattr(self, key) if key in RECORD_FIELDS else default
+
+    def keys(self):
+        return RECORD_FIELDS
+
+    def to_dict(self):
+        """Devolve o registo como dicionário (ex: para serializar em JSON)."""
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+    def __eq__(self, other):
+        if not isinstance(other, ForecastRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"ForecastRecord(location_name={self.location_name!r}, forecast_date={self.forecast_date!r}, "
+                f"temp_min={self.temp_min!r}, temp_max={self.temp_max!r}, weather_id={self.weather_id!r})")
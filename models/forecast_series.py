@@ -0,0 +1,121 @@
+"""
+Previsão de vários dias num formato compacto, orientado a colunas.
+
+A API do IPMA devolve, por local, uma lista de dicionários (um por dia). A
+`ForecastSeries` converte essa lista numa só passagem em colunas (datas,
+temperaturas, probabilidade de precipitação, tipos de tempo e vento), para
+que views e exportações possam ler qualquer dia sem voltar a processar o JSON.
+"""
+
+import math
+from array import array
+
+from models.forecast_record import ForecastRecord
+
+# Valor guardado nas colunas inteiras quando o campo falta ou é inválido
+MISSING_INT = -32768
+MISSING_VALUE = "N/A"
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING_INT
+
+
+class ForecastSeries:
+    """
+    Colunas de uma previsão diária de vários dias para um local.
+
+    Colunas numéricas em `array` (valores em falta: `nan` nas reais e
+    `MISSING_INT` nas inteiras); datas e direções do vento em listas.
+    """
+    __slots__ = ("location_name", "location_id", "dates", "temp_min", "temp_max",
+                 "precipitation_prob", "weather_ids", "wind_speed_classes", "wind_dirs",
+                 "_date_index")
+
+    def __init__(self, location_name=None, location_id=None):
+        self.location_name = location_name
+        self.location_id = location_id
+        self.dates = []
+        self.temp_min = array('d')
+        self.temp_max = array('d')
+        self.precipitation_prob = array('d')
+        self.weather_ids = array('h')
+        self.wind_speed_classes = array('h')
+        self.wind_dirs = []
+        self._date_index = None
+
+    @classmethod
+    def from_payload(cls, raw_forecast_data, location_name=None, location_id=None):
+        """
+        Constrói a série a partir da resposta da API (`{"globalIdLocal", "data": [...]}`).
+
+        Returns:
+            ForecastSeries or None: A série, ou None se não houver dias na resposta.
+        """
+        if not raw_forecast_data or not raw_forecast_data.get('data'):
+            return None
+
+        series = cls(location_name, raw_forecast_data.get("globalIdLocal", location_id))
+        # Métodos ligados em variáveis locais: evita a procura de atributos em cada dia
+        add_date, add_dir = series.dates.append, series.wind_dirs.append
+        add_tmin, add_tmax = series.temp_min.append, series.temp_max.append
+        add_prec = series.precipitation_prob.append
+        add_weather, add_wind = series.weather_ids.append, series.wind_speed_classes.append
+        for day in raw_forecast_data['data']:
+            add_date(day.get("forecastDate", MISSING_VALUE))
+            add_tmin(_to_float(day.get("tMin")))
+            add_tmax(_to_float(day.get("tMax")))
+            add_prec(_to_float(day.get("precipitaProb")))
+            add_weather(_to_int(day.get("idWeatherType")))
+            add_wind(_to_int(day.get("classWindSpeed")))
+            add_dir(day.get("predWindDir", MISSING_VALUE))
+        return series
+
+    def __len__(self):
+        return len(self.dates)
+
+    def index_of(self, forecast_date):
+        """Devolve o índice do dia `forecast_date` (AAAA-MM-DD), ou None se não existir."""
+        if self._date_index is None:
+            self._date_index = {date: i for i, date in enumerate(self.dates)}
+        return self._date_index.get(forecast_date)
+
+    def day(self, index):
+        """
+        Devolve o dia `index` como `ForecastRecord`, com os mesmos campos (e o
+        mesmo acesso por chave) que o dicionário que o `MainController` sempre usou.
+        Valores em falta aparecem como "N/A" (ou None no `weather_id`).
+        """
+        weather_id = self.weather_ids[index]
+        wind_class = self.wind_speed_classes[index]
+        return ForecastRecord(
+            location_name=self.location_name,
+            location_id=self.location_id,
+            forecast_date=self.dates[index],
+            temp_min=self._number(self.temp_min[index]),
+            temp_max=self._number(self.temp_max[index]),
+            precipitation_prob=self._number(self.precipitation_prob[index]),
+            weather_id=None if weather_id == MISSING_INT else weather_id,
+            wind_speed_class=MISSING_VALUE if wind_class == MISSING_INT else wind_class,
+            wind_dir=self.wind_dirs[index],
+            day_index=index,
+        )
+
+    def days(self):
+        """Itera sobre todos os dias como `ForecastRecord` (ver `day()`)."""
+        for index in range(len(self)):
+            yield self.day(index)
+
+    @staticmethod
+    def _number(value):
+        return MISSING_VALUE if math.isnan(value) else value
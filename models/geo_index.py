@@ -0,0 +1,192 @@
+"""
+Índice espacial dos locais do IPMA (coordenadas de `distrits-islands.json`).
+
+As coordenadas ficam em `array('d')` (uma posição por local) e os locais são
+distribuídos por uma grelha de células de tamanho fixo em graus. A pesquisa
+do local mais próximo percorre anéis de células à volta do ponto até ter a
+certeza de que nenhuma célula por visitar pode conter um local mais perto; a
+pesquisa por raio só visita as células que intersetam o raio. As distâncias
+são de grande círculo (haversine), em km. A grelha não dá a volta no
+antimeridiano (±180°), o que não é problema para os locais do IPMA.
+"""
+
+import math
+from array import array
+from collections import defaultdict, namedtuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Tamanho por omissão das células da grelha, em graus (~55 km de latitude)
+DEFAULT_CELL_SIZE_DEG = 0.5
+
+# Resultado de uma pesquisa: ID do local, nome e distância ao ponto pedido (km)
+GeoMatch = namedtuple("GeoMatch", ["location_id", "name", "distance_km"])
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distância de grande círculo entre dois pontos (graus decimais), em km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class GeoIndex:
+    """
+    Índice de locais por coordenadas, com grelha de células para pesquisas rápidas.
+
+    Args:
+        locations (iterable): Tuplos (location_id, nome, latitude, longitude).
+        cell_size_deg (float): Tamanho das células da grelha, em graus.
+    """
+    def __init__(self, locations=(), cell_size_deg=DEFAULT_CELL_SIZE_DEG):
+        self.cell_size_deg = cell_size_deg
+        self.ids = []
+        self.names = []
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self._position_by_id = {}
+        cells = defaultdict(lambda: array('l'))
+
+        for location_id, name, latitude, longitude in locations:
+            position = len(self.ids)
+            self.ids.append(str(location_id))
+            self.names.append(name)
+            self.latitudes.append(latitude)
+            self.longitudes.append(longitude)
+            self._position_by_id[str(location_id)] = position
+            cells[self._cell(latitude, longitude)].append(position)
+
+        self._cells = dict(cells)
+        if self._cells:
+            rows = [cell[0] for cell in self._cells]
+            cols = [cell[1] for cell in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self._bounds = None
+
+    @classmethod
+    def from_locations_payload(cls, data, cell_size_deg=DEFAULT_CELL_SIZE_DEG):
+        """Constrói o índice a partir do JSON de `distrits-islands.json` (ignora locais sem coordenadas)."""
+        locations = []
+        for item in data.get('data', []):
+            latitude, longitude = _to_float(item.get('latitude')), _to_float(item.get('longitude'))
+            if 'globalIdLocal' in item and latitude is not None and longitude is not None:
+                locations.append((item['globalIdLocal'], item.get('local'), latitude, longitude))
+        return cls(locations, cell_size_deg)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def coordinates(self, location_id):
+        """Devolve (latitude, longitude) de `location_id`, ou None se não for conhecido."""
+        position = self._position_by_id.get(str(location_id))
+        if position is None:
+            return None
+        return self.latitudes[position], self.longitudes[position]
+
+    def _cell(self, latitude, longitude):
+        return (math.floor(latitude / self.cell_size_deg), math.floor(longitude / self.cell_size_deg))
+
+    def _match(self, position, distance_km):
+        return GeoMatch(self.ids[position], self.names[position], distance_km)
+
+    def _distance_to(self, position, latitude, longitude):
+        return haversine_km(latitude, longitude, self.latitudes[position], self.longitudes[position])
+
+    def nearest(self, latitude, longitude, k=1, max_distance_km=None):
+        """
+        Devolve os `k` locais mais próximos do ponto, do mais perto para o mais longe.
+
+        Args:
+            k (int): Número de locais a devolver.
+            max_distance_km (float, optional): Ignora locais mais longe do que isto.
+
+        Returns:
+            list: Lista de `GeoMatch`.
+        """
+        if not self._cells or k <= 0:
+            return []
+        row, col = self._cell(latitude, longitude)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+
+        found = [] # (distância, posição)
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(row, col, ring):
+                for position in self._cells.get(cell, ()):
+                    found.append((self._distance_to(position, latitude, longitude), position))
+            # Qualquer local por visitar está fora do quadrado de células já percorrido
+            bound_km = self._visited_lower_bound_km(latitude, longitude, row, col, ring)
+            if max_distance_km is not None and bound_km > max_distance_km:
+                break
+            if len(found) >= k:
+                found.sort()
+                del found[k:]
+                if found[-1][0] <= bound_km:
+                    break
+        found.sort()
+        if max_distance_km is not None:
+            found = [entry for entry in found if entry[0] <= max_distance_km]
+        return [self._match(position, distance) for distance, position in found[:k]]
+
+    def within(self, latitude, longitude, radius_km):
+        """
+        Devolve todos os locais a menos de `radius_km` do ponto, do mais perto para o mais longe.
+
+        Returns:
+            list: Lista de `GeoMatch`.
+        """
+        if not self._cells or radius_km < 0:
+            return []
+        dlat = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(89.9, abs(latitude) + dlat)))
+        dlon = min(180.0, radius_km / (KM_PER_DEGREE * max(cos_lat, 1e-6)))
+        min_row, min_col = self._cell(latitude - dlat, longitude - dlon)
+        max_row, max_col = self._cell(latitude + dlat, longitude + dlon)
+
+        matches = []
+        for cell_row in range(min_row, max_row + 1):
+            for cell_col in range(min_col, max_col + 1):
+                for position in self._cells.get((cell_row, cell_col), ()):
+                    distance = self._distance_to(position, latitude, longitude)
+                    if distance <= radius_km:
+                        matches.append((distance, position))
+        matches.sort()
+        return [self._match(position, distance) for distance, position in matches]
+
+    @staticmethod
+    def _ring_cells(row, col, ring):
+        """Células à distância de Chebyshev `ring` da célula (row, col)."""
+        if ring == 0:
+            yield row, col
+            return
+        for dcol in range(-ring, ring + 1):
+            yield row - ring, col + dcol
+            yield row + ring, col + dcol
+        for drow in range(-ring + 1, ring):
+            yield row + drow, col - ring
+            yield row + drow, col + ring
+
+    def _visited_lower_bound_km(self, latitude, longitude, row, col, ring):
+        """
+        Distância mínima (km) do ponto a qualquer local fora do quadrado de
+        células (row ± ring, col ± ring) já percorrido.
+        """
+        size = self.cell_size_deg
+        dlat = min(latitude - (row - ring) * size, (row + ring + 1) * size - latitude)
+        dlon = min(longitude - (col - ring) * size, (col + ring + 1) * size - longitude)
+        # hav(d) >= cos(lat1) * cos(lat2) * hav(dlon): usa a maior |latitude| que o ponto
+        # ou um local nas linhas de células percorridas podem ter
+        worst_latitude = min(90.0, max(abs(latitude), abs((row - ring) * size), abs((row + ring + 1) * size)))
+        lon_km = 2 * EARTH_RADIUS_KM * math.asin(
+            min(1.0, math.cos(math.radians(worst_latitude)) * math.sin(math.radians(dlon) / 2)))
+        return min(dlat * KM_PER_DEGREE, lon_km)
@@ -0,0 +1,99 @@
+"""
+Camada de transporte HTTP partilhada pela `IPMAApi`.
+
+Mantém uma única `requests.Session` com um pool de ligações por host
+(keep-alive), para que pedidos consecutivos ao IPMA reutilizem a mesma
+ligação TCP/TLS em vez de abrirem uma nova a cada chamada, e aplica
+timeouts de ligação/leitura a todos os pedidos. Com um `RateLimiter`, cada
+pedido espera pela vez da sua família de endpoints antes de sair.
+"""
+
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from models import metrics
+
+# Timeouts por omissão (segundos): (ligação, leitura)
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+
+# Número de pools de hosts distintos guardados e de ligações mantidas por host
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 40
+
+# Pausa (segundos) de uma família após um 429 sem cabeçalho Retry-After válido
+DEFAULT_RETRY_AFTER = 1.0
+
+
+def _retry_after_seconds(response):
+    """Segundos indicados no cabeçalho `Retry-After` (só a forma numérica), ou DEFAULT_RETRY_AFTER."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER)))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER
+
+
+class HttpTransport:
+    """
+    Sessão HTTP com pool de ligações configurável, keep-alive e timeouts.
+
+    Args:
+        session (requests.Session, optional): Sessão já existente a reutilizar.
+            Se omitida, é criada uma nova com os adaptadores configurados.
+        pool_connections (int): Número de hosts distintos com pool em cache.
+        pool_maxsize (int): Número máximo de ligações mantidas por host.
+        pool_block (bool): Se True, bloqueia quando o pool de um host está cheio
+            em vez de abrir ligações extra descartáveis.
+        connect_timeout (float): Timeout para estabelecer a ligação.
+        read_timeout (float): Timeout de leitura da resposta.
+        rate_limiter (RateLimiter, optional): Limite de pedidos por segundo por família
+            de endpoints (ver `models/rate_limiter.py`). Se omitido, não há limite.
+    """
+    def __init__(self, session=None, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 rate_limiter=None):
+        self.rate_limiter = rate_limiter
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize,
+                                  pool_block=pool_block)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+        logging.debug(f"HTTP Transport: sessão criada (pool_connections={pool_connections}, "
+                      f"pool_maxsize={pool_maxsize}, timeout={self.timeout}).")
+
+    def get(self, url, headers=None, rate_family=None, **kwargs):
+        """
+        Executa um GET através da sessão partilhada, aplicando o timeout configurado.
+        Com `rate_family` e um `rate_limiter`, espera primeiro pela vez do pedido; uma
+        resposta 429 suspende a família durante o `Retry-After` indicado pelo servidor.
+
+        Returns:
+            requests.Response: A resposta HTTP (ainda não validada).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        limiter = self.rate_limiter if rate_family is not None else None
+        if limiter is not None:
+            # A espera pela vez do pedido conta à parte, não como tempo de rede
+            metrics.observe("ipma_rate_limit_wait", limiter.acquire(rate_family))
+        with metrics.timer("ipma_network"):
+            response = self.session.get(url, headers=headers, **kwargs)
+        if limiter is not None and response.status_code == 429:
+            retry_after = _retry_after_seconds(response)
+            logging.warning(f"HTTP Transport: 429 em {url}; pedidos '{rate_family}' suspensos durante {retry_after:g}s.")
+            limiter.pause(rate_family, retry_after)
+        return response
+
+    def close(self):
+        """Fecha todas as ligações mantidas no pool."""
+        self.session.close()
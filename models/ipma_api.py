@@ -1,26 +1,147 @@
 import requests
 import os
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from models.http_transport import HttpTransport
+from models.forecast_cache import ForecastCache
+from models.single_flight import SingleFlight
+from models.geo_index import GeoIndex
+from models.resilience import CircuitBreaker, RetryPolicy
+from models.rate_limiter import FORECAST_FAMILY, REFERENCE_FAMILY, RateLimiter
+from models import json_backend, metrics
+from models.json_stream import DEFAULT_CHUNK_SIZE, iter_json_array, load_json_stream
 
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Número máximo de pedidos de previsão simultâneos em `get_daily_forecasts`
+# (cobre os ~35 locais do IPMA numa só "vaga" de pedidos)
+DEFAULT_MAX_CONCURRENCY = 40
+
+# Idade (segundos) a partir da qual locais/tipos de tempo lidos do disco são revalidados
+DEFAULT_REFERENCE_MAX_AGE = 60 * 60
+# Previsões guardadas em disco há mais do que isto (segundos) são removidas ao arrancar
+FORECAST_DISK_MAX_AGE = 24 * 60 * 60
+# Intervalo (segundos) antes de voltar a tentar carregar locais/tipos de tempo que falharam
+DEFAULT_REFERENCE_RETRY_INTERVAL = 10.0
+# Número máximo de URLs cujos validadores HTTP (ETag/Last-Modified) ficam em memória
+MAX_REMEMBERED_VALIDATORS = 1024
+
+# Endpoints de dados abertos do IPMA, relativos ao URL base
+DEFAULT_BASE_URL = "https://api.ipma.pt/open-data/"
+# Variável de ambiente com outro URL base (ex: o servidor local de tools/ipma_standin.py)
+BASE_URL_ENV = "GUIA_PRAIAS_IPMA_URL"
+DAILY_FORECAST_PATH = "forecast/meteorology/cities/daily/"
+WEATHER_TYPE_CLASSES_PATH = "weather-type-classe.json"
+LOCATIONS_PATH = "distrits-islands.json"
+DAILY_FORECAST_BASE_URL = DEFAULT_BASE_URL + DAILY_FORECAST_PATH
+WEATHER_TYPE_CLASSES_URL = DEFAULT_BASE_URL + WEATHER_TYPE_CLASSES_PATH
+LOCATIONS_URL = DEFAULT_BASE_URL + LOCATIONS_PATH
+# Previsão de um dia (0 = hoje) para todos os locais, relativo a DAILY_FORECAST_BASE_URL
+DAILY_FORECAST_BY_DAY_FILE = "hp-daily-forecast-day{day}.json"
+
+# Campos mantidos de cada registo quando a resposta é descodificada em streaming
+LOCATION_FIELDS = ("globalIdLocal", "local", "latitude", "longitude")
+WEATHER_TYPE_FIELDS = ("idWeatherType", "descWeatherTypePT")
+
+
+def resolve_base_url(base_url=None):
+    """
+    URL base dos dados abertos: `base_url`, a variável de ambiente `GUIA_PRAIAS_IPMA_URL`
+    ou, por omissão, o do IPMA. Termina sempre em "/".
+    """
+    base_url = base_url or os.environ.get(BASE_URL_ENV) or DEFAULT_BASE_URL
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+
+def parse_weather_type_descriptions(data):
+    """Converte o JSON de `weather-type-classe.json` em {idWeatherType: descWeatherTypePT}."""
+    return {
+        item['idWeatherType']: item['descWeatherTypePT']
+        for item in data.get('data', [])
+        if 'idWeatherType' in item and 'descWeatherTypePT' in item
+    }
+
+
+def parse_locations_map(data):
+    """Converte o JSON de `distrits-islands.json` em {globalIdLocal (str): local}."""
+    return {
+        str(item['globalIdLocal']): item['local']
+        for item in data.get('data', [])
+        if 'globalIdLocal' in item and 'local' in item
+    }
+
 
 class IPMAApi:
     """
     Classe para interagir com a API de dados abertos do IPMA para obter
     previsões meteorológicas diárias e descrições de tipos de tempo.
     """
-    def __init__(self):
-        self.base_url_daily_forecast = "https://api.ipma.pt/open-data/forecast/meteorology/cities/daily/"
-        self.weather_type_classes_url = "https://api.ipma.pt/open-data/weather-type-classe.json"
-        self.locations_url = "https://api.ipma.pt/open-data/distrits-islands.json"
+    def __init__(self, transport=None, forecast_cache=None, disk_cache=None,
+                 reference_max_age=DEFAULT_REFERENCE_MAX_AGE, retry_policy=None, circuit_breaker=None,
+                 reference_retry_interval=DEFAULT_REFERENCE_RETRY_INTERVAL, base_url=None):
+        """
+        Args:
+            transport (HttpTransport, optional): Camada HTTP partilhada (sessão com pool
+                de ligações, keep-alive e timeouts). Se omitida, é criada uma com o
+                `RateLimiter` por omissão (orçamentos separados para previsões e dados de referência).
+            forecast_cache (ForecastCache, optional): Cache de previsões por globalIdLocal
+                (TTL + LRU). Se omitida, é criada uma com a validade por omissão.
+            disk_cache (DiskCache, optional): Cache persistente das respostas (locais,
+                tipos de tempo e previsões recentes). Se omitida, nada é guardado em disco.
+            reference_max_age (float): Idade, em segundos, a partir da qual os mapeamentos
+                lidos do disco são revalidados em segundo plano.
+            retry_policy (RetryPolicy, optional): Repetição de pedidos com falhas transitórias
+                (ligação, timeout, 429/5xx). Se omitida, até 3 tentativas com espera exponencial.
+            circuit_breaker (CircuitBreaker, optional): Disjuntor partilhado por todos os pedidos;
+                enquanto estiver aberto os pedidos falham de imediato e são servidas cópias antigas.
+            reference_retry_interval (float): Segundos até voltar a tentar carregar locais ou
+                tipos de tempo cuja carga falhou (até lá é devolvido um mapeamento vazio).
+            base_url (str, optional): URL base dos endpoints (equivalente a
+                "https://api.ipma.pt/open-data/"); ver `resolve_base_url`.
+        """
+        self.base_url = resolve_base_url(base_url)
+        self.base_url_daily_forecast = self.base_url + DAILY_FORECAST_PATH
+        self.weather_type_classes_url = self.base_url + WEATHER_TYPE_CLASSES_PATH
+        self.locations_url = self.base_url + LOCATIONS_PATH
+        self.transport = transport if transport is not None else HttpTransport(rate_limiter=RateLimiter())
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.reference_retry_interval = reference_retry_interval
+        self._reference_failed_at = {} # atributo -> instante (monotónico) da última carga falhada
+        self.stale_served = 0
+        self.forecast_cache = forecast_cache if forecast_cache is not None else ForecastCache()
+        self.disk_cache = disk_cache
+        self.reference_max_age = reference_max_age
+        self._revalidating = set()
+        self._revalidation_lock = threading.Lock()
+        # Validadores HTTP (ETag/Last-Modified) e payload da última resposta por URL
+        self._validators = OrderedDict()
+        self._validators_lock = threading.Lock()
+        self.revalidation_stats = {"not_modified": 0, "full_downloads": 0}
+        # Pedidos simultâneos ao mesmo URL partilham uma única ida à rede
+        self._single_flight = SingleFlight()
+
+        if self.disk_cache is not None:
+            # Só as previsões recentes interessam; as antigas são descartadas ao arrancar
+            try:
+                self.disk_cache.prune(FORECAST_DISK_MAX_AGE, key_prefix=self.base_url_daily_forecast)
+            except Exception as e:
+                logging.warning(f"IPMA API: Não foi possível limpar previsões antigas da cache em disco: {e}")
         self._weather_descriptions = None
         self._locations_map = None
+        self._geo_index = None # Coordenadas dos locais (ver get_geo_index)
         
+    @metrics.timed("ipma_get_daily_forecast")
     def get_daily_forecast(self, globalIdLocal):
         """
         Busca a previsão meteorológica diária para um dado ID de localidade.
+        Previsões obtidas há menos tempo que a validade da `forecast_cache` são
+        devolvidas da memória sem novo pedido à API.
 
         Args:
             globalIdLocal (str): O identificador único do local (ex: "1010500" para Lisboa).
@@ -33,18 +154,13 @@ class IPMAApi:
             logging.error("IPMA API: globalIdLocal não pode ser vazio.")
             return None
 
-        url = f"{self.base_url_daily_forecast}{globalIdLocal}.json"
-        
-        logging.info(f"IPMA API: A buscar previsão para o ID {globalIdLocal} em {url}")
+        cached = self._get_cached_forecast(globalIdLocal)
+        if cached is not None:
+            logging.info(f"IPMA API: Previsão para {globalIdLocal} servida da cache.")
+            return cached
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            logging.info(f"IPMA API: Pedido bem-sucedido para {globalIdLocal}. Recebido {len(data.get('data', []))} dias de previsão.")
-            return data
-
+            return self._fetch_daily_forecast(globalIdLocal)
         except requests.exceptions.RequestException as e:
             logging.error(f"IPMA API Request Error for {globalIdLocal}: {e}")
             return None
@@ -55,64 +171,500 @@ class IPMAApi:
             logging.error(f"IPMA API Unexpected error for {globalIdLocal}: {e}")
             return None
 
-    def get_weather_type_descriptions(self):
+    @metrics.timed("ipma_refresh_daily_forecast")
+    def refresh_daily_forecast(self, globalIdLocal):
+        """
+        Volta a pedir a previsão diária mesmo que esteja em cache (pedido condicional:
+        um 304 custa pouco) e renova a validade na `forecast_cache`. Usado pelo
+        `PrefetchScheduler` para aquecer a cache antes de o utilizador a pedir.
+
+        Returns:
+            dict or None: A previsão, ou None em caso de erro (não serve cópias antigas).
+        """
+        try:
+            return self._fetch_daily_forecast(str(globalIdLocal), serve_stale=False)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.warning(f"IPMA API: Falha ao atualizar a previsão para {globalIdLocal}: {e}")
+            return None
+
+    def _fetch_daily_forecast(self, globalIdLocal, serve_stale=True):
+        """
+        Faz o pedido da previsão diária, guarda-a na cache e devolve o JSON descodificado.
+        Ao contrário de `get_daily_forecast`, propaga as exceções ao chamador.
+        Com `serve_stale`, uma falha de rede devolve a última cópia conhecida.
+        """
+        url = f"{self.base_url_daily_forecast}{globalIdLocal}.json"
+
+        logging.info(f"IPMA API: A buscar previsão para o ID {globalIdLocal} em {url}")
+
+        try:
+            data = self._download_json(url)
+        except requests.exceptions.RequestException as e:
+            # Servidor em baixo (ou disjuntor aberto): serve a última cópia conhecida, sem a pôr na cache,
+            # para que o próximo pedido volte a tentar a rede
+            stale = self._stale_payload(url) if serve_stale else None
+            if stale is None:
+                raise
+            with self._validators_lock:
+                self.stale_served += 1
+            metrics.increment("ipma_stale_served")
+            logging.warning(f"IPMA API: Falha ao buscar previsão para {globalIdLocal} ({e}); a servir a última cópia conhecida.")
+            return stale
+
+        logging.info(f"IPMA API: Pedido bem-sucedido para {globalIdLocal}. Recebido {len(data.get('data', []))} dias de previsão.")
+        self.forecast_cache.set(globalIdLocal, data)
+        return data
+
+    def _stale_payload(self, url):
+        """Última resposta conhecida para `url` (validadores em memória ou cache em disco), mesmo que antiga."""
+        with self._validators_lock:
+            validators = self._validators.get(url)
+        if validators is not None:
+            return validators["payload"]
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(url)
+            if entry is not None:
+                return entry.payload
+        return None
+
+    def _get_cached_forecast(self, globalIdLocal):
+        """
+        Devolve a previsão em cache (memória e, em alternativa, disco) se ainda
+        estiver dentro da validade, ou None.
+        """
+        cached = self.forecast_cache.get(globalIdLocal)
+        if cached is not None:
+            metrics.increment("forecast_cache_hits")
+            return cached
+
+        entry = None
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(f"{self.base_url_daily_forecast}{globalIdLocal}.json")
+        remaining = self.forecast_cache.ttl - (time.time() - entry.fetched_at) if entry is not None else 0
+        if remaining <= 0:
+            metrics.increment("forecast_cache_misses")
+            return None
+        metrics.increment("forecast_cache_disk_hits")
+        self.forecast_cache.set(globalIdLocal, entry.payload, ttl=remaining)
+        return entry.payload
+
+    @metrics.timed("ipma_get_daily_forecasts")
+    def get_daily_forecasts(self, globalIdLocals, max_workers=DEFAULT_MAX_CONCURRENCY):
+        """
+        Busca em paralelo a previsão diária para vários IDs de localidade.
+
+        Os pedidos correm num pool de threads limitado a `max_workers` (e ao tamanho
+        do pool de ligações do transporte), pelo que o tempo total se aproxima do
+        pedido mais lento e não da soma de todos. IDs válidos na `forecast_cache`
+        não geram pedidos.
+
+        Args:
+            globalIdLocals (iterable): IDs de localidade. IDs repetidos ou vazios são ignorados.
+            max_workers (int): Número máximo de pedidos simultâneos.
+
+        Returns:
+            dict: Mapeamento {globalIdLocal (str): {"data": dict or None, "error": str or None}},
+                  pela ordem dos IDs recebidos.
+        """
+        ids = list(dict.fromkeys(str(gid) for gid in globalIdLocals if gid))
+        results = {gid: {"data": data, "error": error}
+                   for gid, data, error in self.iter_daily_forecasts(ids, max_workers)}
+        return {gid: results[gid] for gid in ids}
+
+    def iter_daily_forecasts(self, globalIdLocals, max_workers=DEFAULT_MAX_CONCURRENCY):
+        """
+        Como get_daily_forecasts(), mas devolve cada previsão assim que fica
+        disponível (primeiro as da cache, depois pela ordem de chegada), para que
+        quem consome possa ir escrevendo resultados sem esperar pelo lote inteiro.
+
+        Yields:
+            tuple: (globalIdLocal (str), data (dict or None), error (str or None)).
+        """
+        ids = list(dict.fromkeys(str(gid) for gid in globalIdLocals if gid))
+        if not ids:
+            return
+
+        to_fetch = []
+        for gid in ids:
+            cached = self._get_cached_forecast(gid)
+            if cached is not None:
+                yield gid, cached, None
+            else:
+                to_fetch.append(gid)
+
+        if not to_fetch:
+            logging.info(f"IPMA API: Todas as {len(ids)} previsões servidas da cache.")
+            return
+
+        workers = max(1, min(max_workers, self.transport.pool_maxsize, len(to_fetch)))
+        logging.info(f"IPMA API: A buscar {len(to_fetch)} previsões ({len(ids) - len(to_fetch)} em cache) com {workers} pedidos em simultâneo.")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ipma-forecast") as executor:
+            futures = {executor.submit(self._fetch_daily_forecast, gid): gid for gid in to_fetch}
+            for future in as_completed(futures):
+                gid = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logging.error(f"IPMA API: Falha ao obter previsão para {gid}: {e}")
+                    failed += 1
+                    yield gid, None, f"{type(e).__name__}: {e}"
+                else:
+                    yield gid, data, None
+
+        logging.info(f"IPMA API: Previsões em lote concluídas ({len(ids) - failed} com sucesso, {failed} com erro).")
+
+    def iter_forecasts_for_day(self, day=0, fields=None, metadata=None):
+        """
+        Previsão de um dia para todos os locais (`hp-daily-forecast-day{N}.json`),
+        descodificada em streaming: cada registo é devolvido assim que chega, sem
+        esperar pelo corpo inteiro nem o guardar em memória. Não usa caches.
+
+        Args:
+            day (int): Dia da previsão (0 = hoje).
+            fields (iterable, optional): Campos a manter em cada registo (ex:
+                ("globalIdLocal", "tMin", "tMax")); por omissão, todos.
+            metadata (dict, optional): Recebe os campos de topo da resposta
+                (ex: "forecastDate", "dataUpdate").
+
+        Yields:
+            dict: Um registo por local.
+
+        Raises:
+            requests.exceptions.RequestException, ValueError: Em erros de rede ou JSON inválido.
+        """
+        url = f"{self.base_url_daily_forecast}{DAILY_FORECAST_BY_DAY_FILE.format(day=day)}"
+        logging.info(f"IPMA API: A ler em streaming a previsão do dia {day} para todos os locais ({url}).")
+        with self.retry_policy.call(self.circuit_breaker.call, self._open_stream, url) as response:
+            count = 0
+            for record in iter_json_array(response.iter_content(DEFAULT_CHUNK_SIZE), "data", fields, metadata):
+                count += 1
+                yield record
+        logging.info(f"IPMA API: Previsão do dia {day} lida ({count} locais).")
+
+    def _open_stream(self, url):
+        """GET em streaming (o corpo é lido por quem chama); levanta HTTPError em respostas 4xx/5xx."""
+        response = self.transport.get(url, rate_family=self._rate_family(url), stream=True)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
+
+    def _rate_family(self, url):
+        """Família de endpoints de `url` para o limite de pedidos: previsões ou dados de referência."""
+        return FORECAST_FAMILY if url.startswith(self.base_url_daily_forecast) else REFERENCE_FAMILY
+
+    def get_weather_type_descriptions(self, wait=False):
         """
         Busca e carrega o mapeamento de códigos de tipo de tempo para descrições.
         Utiliza cache para evitar chamadas repetidas à API.
-        """
-        if self._weather_descriptions is None:
-            logging.info("IPMA API: A carregar mapeamento de tipos de tempo...")
-            try:
-                response = requests.get(self.weather_type_classes_url)
-                response.raise_for_status()
-                data = response.json()
-                self._weather_descriptions = {
-                    item['idWeatherType']: item['descWeatherTypePT']
-                    for item in data.get('data', [])
-                    if 'idWeatherType' in item and 'descWeatherTypePT' in item
-                }
-                logging.info(f"IPMA API: Carregados {len(self._weather_descriptions)} tipos de tempo.")
-            except requests.exceptions.RequestException as e:
-                logging.error(f"IPMA API Request Error while fetching weather types: {e}")
-                self._weather_descriptions = {}
-            except (ValueError, KeyError) as e:
-                logging.error(f"IPMA API Error processing weather types JSON. Error: {e}")
-                self._weather_descriptions = {}
-            except Exception as e:
-                logging.error(f"IPMA API Unexpected error while fetching weather types: {e}")
-                self._weather_descriptions = {}
 
+        Args:
+            wait (bool): Se uma carga anterior falhou e já é altura de tentar de novo,
+                espera por essa tentativa em vez de a fazer em segundo plano (ver
+                `_reload_reference_in_background`).
+        """
+        self._ensure_reference("_weather_descriptions", self.weather_type_classes_url,
+                               parse_weather_type_descriptions, "tipos de tempo", WEATHER_TYPE_FIELDS, wait)
         return self._weather_descriptions
 
-    def get_locations_map(self):
+    def get_locations_map(self, wait=False):
         """
         Busca e carrega o mapeamento de globalIdLocal para nomes de locais.
         Utiliza cache para evitar chamadas repetidas à API.
+
+        Args:
+            wait (bool): Ver `get_weather_type_descriptions`.
+        """
+        self._ensure_reference("_locations_map", self.locations_url,
+                               self._parse_locations, "locais", LOCATION_FIELDS, wait)
+        return self._locations_map
+
+    def _ensure_reference(self, attr, url, parser, label, fields, wait):
+        """
+        Carrega `self.<attr>` na primeira utilização. Depois de uma carga falhada, a nova
+        tentativa corre numa thread (salvo com `wait`): estes getters são chamados da
+        thread do Tkinter, que não pode ficar à espera das repetições de um IPMA em baixo.
+        """
+        if getattr(self, attr) is None or (wait and self._reference_retry_due(attr)):
+            self._single_flight.do(f"reference:{url}", self._load_reference, attr, url, parser, label, fields)
+        elif self._reference_retry_due(attr):
+            self._reload_reference_in_background(attr, url, parser, label, fields)
+
+    def get_geo_index(self):
+        """
+        Devolve o `GeoIndex` com as coordenadas de cada local, construído a partir
+        da mesma resposta que get_locations_map() (sem pedidos adicionais).
+        """
+        self.get_locations_map()
+        if self._geo_index is None:
+            return GeoIndex()
+        return self._geo_index
+
+    def _parse_locations(self, data):
         """
-        if self._locations_map is None:
-            logging.info("IPMA API: A carregar mapeamento de locais...")
+        Parser da resposta de locais usado pelo carregamento/revalidação: constrói
+        o índice de coordenadas e devolve o mapa {globalIdLocal: local}.
+        """
+        locations_map = parse_locations_map(data)
+        self._geo_index = GeoIndex.from_locations_payload(data)
+        return locations_map
+
+    @metrics.timed("ipma_reference_load")
+    def _load_reference(self, attr, url, parser, label, fields=None):
+        """
+        Carrega um mapeamento de referência para `self.<attr>`: primeiro da cache em
+        disco (revalidando em segundo plano se for antigo) e, se não existir, da API.
+        Com `fields`, a resposta é descodificada em streaming e só esses campos de
+        cada registo são mantidos (também na cache em disco).
+        """
+        if self._load_reference_from_disk(attr, url, parser, label, fields):
+            return
+
+        logging.info(f"IPMA API: A carregar mapeamento de {label}...")
+        try:
+            data = self._download_json(url, fields)
+            setattr(self, attr, parser(data))
+            self._reference_failed_at.pop(attr, None)
+            logging.info(f"IPMA API: Carregado mapeamento de {label} ({len(getattr(self, attr))} entradas).")
+            return
+        except requests.exceptions.RequestException as e:
+            logging.error(f"IPMA API Request Error while fetching {label}: {e}")
+        except (ValueError, KeyError) as e:
+            logging.error(f"IPMA API Error processing {label} JSON. Error: {e}")
+        except Exception as e:
+            logging.error(f"IPMA API Unexpected error while fetching {label}: {e}")
+        # Mapeamento vazio só até à próxima tentativa (ver _reference_retry_due), não para sempre
+        if not getattr(self, attr):
+            setattr(self, attr, {})
+        self._reference_failed_at[attr] = time.monotonic()
+        logging.warning(f"IPMA API: Nova tentativa de carregar {label} dentro de {self.reference_retry_interval:g}s.")
+
+    def _reference_retry_due(self, attr):
+        """Indica se a carga de `self.<attr>` falhou e já passou o intervalo para nova tentativa."""
+        failed_at = self._reference_failed_at.get(attr)
+        return failed_at is not None and time.monotonic() - failed_at >= self.reference_retry_interval
+
+    def _load_reference_from_disk(self, attr, url, parser, label, fields=None):
+        """Tenta carregar `self.<attr>` da cache em disco. Devolve True em caso de sucesso."""
+        if self.disk_cache is None:
+            return False
+
+        entry = self.disk_cache.get(url)
+        if entry is None:
+            return False
+
+        try:
+            setattr(self, attr, parser(entry.payload))
+        except (ValueError, KeyError, AttributeError) as e:
+            logging.warning(f"IPMA API: Cache em disco inválida para {label}, a ignorar: {e}")
+            return False
+
+        age = time.time() - entry.fetched_at
+        logging.info(f"IPMA API: Mapeamento de {label} carregado da cache em disco (obtido há {age:.0f}s).")
+        if age > self.reference_max_age:
+            self._revalidate_in_background(attr, url, parser, label, fields)
+        return True
+
+    def _revalidate_in_background(self, attr, url, parser, label, fields=None):
+        """Volta a pedir um mapeamento de referência numa thread, sem bloquear o chamador."""
+        with self._revalidation_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def revalidate():
             try:
-                response = requests.get(self.locations_url)
-                response.raise_for_status()
-
-                data = response.json()
-                self._locations_map = {
-                    str(item['globalIdLocal']): item['local']
-                    for item in data.get('data', [])
-                    if 'globalIdLocal' in item and 'local' in item
-                }
-                logging.info(f"IPMA API: Carregados mapeamentos para {len(self._locations_map)} locais.")
-            except requests.exceptions.RequestException as e:
-                logging.error(f"IPMA API Request Error while fetching locations: {e}")
-                self._locations_map = {}
-            except (ValueError, KeyError) as e:
-                logging.error(f"IPMA API Error processing locations JSON. Error: {e}")
-                self._locations_map = {}
+                data, modified = self._conditional_get_json(url, fields)
+                if modified:
+                    setattr(self, attr, parser(data))
+                logging.info(f"IPMA API: Mapeamento de {label} revalidado em segundo plano "
+                             f"({'atualizado' if modified else 'sem alterações'}).")
             except Exception as e:
-                logging.error(f"IPMA API Unexpected error while fetching locations: {e}")
-                self._locations_map = {}
+                logging.warning(f"IPMA API: Revalidação de {label} falhou; a manter a cópia em disco: {e}")
+            finally:
+                with self._revalidation_lock:
+                    self._revalidating.discard(url)
 
-        return self._locations_map
+        threading.Thread(target=revalidate, name=f"ipma-revalidate-{label}", daemon=True).start()
+
+    def _reload_reference_in_background(self, attr, url, parser, label, fields=None):
+        """Repete numa thread a carga falhada de um mapeamento de referência, sem bloquear o chamador."""
+        with self._revalidation_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def reload():
+            try:
+                self._single_flight.do(f"reference:{url}", self._load_reference, attr, url, parser, label, fields)
+            finally:
+                with self._revalidation_lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=reload, name=f"ipma-reload-{label}", daemon=True).start()
+
+    def _download_json(self, url, fields=None):
+        """Obtém o JSON de `url` (com revalidação condicional) e propaga as exceções."""
+        return self._conditional_get_json(url, fields)[0]
+
+    def _conditional_get_json(self, url, fields=None):
+        """
+        Obtém o JSON de `url`; chamadas simultâneas para o mesmo URL partilham um
+        único pedido e o mesmo resultado descodificado.
+
+        Returns:
+            tuple: (payload, modified) — ver `_conditional_get_json_uncoalesced`.
+        """
+        return self._single_flight.do(url, self._conditional_get_json_uncoalesced, url, fields)
+
+    def _conditional_get_json_uncoalesced(self, url, fields=None):
+        """
+        Faz o GET condicional de `url` através do disjuntor, repetindo as falhas
+        transitórias segundo a `retry_policy` (ver `models/resilience.py`).
+        """
+        def on_retry(attempt, error, delay):
+            metrics.increment("ipma_retries")
+            logging.warning(f"IPMA API: Tentativa {attempt} para {url} falhou ({error}); nova tentativa em {delay:.2f}s.")
+        try:
+            return self.retry_policy.call(self.circuit_breaker.call, self._conditional_get_json_once, url, fields,
+                                          on_retry=on_retry)
+        except Exception:
+            metrics.increment("ipma_request_failures")
+            raise
+
+    def _conditional_get_json_once(self, url, fields=None):
+        """
+        Faz um GET condicional: se já houver uma cópia de `url` com ETag/Last-Modified,
+        envia `If-None-Match`/`If-Modified-Since` e, numa resposta 304, reutiliza o
+        payload já descodificado em vez de descarregar e descodificar o JSON de novo.
+        Com `fields`, o corpo é descodificado em streaming (ver `models/json_stream.py`)
+        e cada registo de "data" fica só com esses campos.
+
+        Returns:
+            tuple: (payload, modified) em que `modified` é False quando a resposta foi 304.
+        """
+        validators = self._get_validators(url)
+        headers = {}
+        if validators is not None:
+            if validators["etag"]:
+                headers["If-None-Match"] = validators["etag"]
+            if validators["last_modified"]:
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        family = self._rate_family(url)
+        if fields is None:
+            response = self.transport.get(url, headers=headers or None, rate_family=family)
+        else:
+            response = self.transport.get(url, headers=headers or None, rate_family=family, stream=True)
+
+        try:
+            if response.status_code == 304 and validators is not None:
+                self._count_revalidation("not_modified")
+                logging.debug(f"IPMA API: {url} não foi alterado (304); a reutilizar a cópia existente.")
+                if self.disk_cache is not None:
+                    self._run_disk_operation(self.disk_cache.touch, url)
+                return validators["payload"], False
+
+            response.raise_for_status()
+            # Em streaming o corpo chega durante a descodificação, pelo que esse tempo conta aqui
+            with metrics.timer("ipma_json_decode"):
+                if fields is None:
+                    data = json_backend.loads(response.content)
+                else:
+                    data = load_json_stream(response.iter_content(DEFAULT_CHUNK_SIZE), fields=fields)
+        finally:
+            if fields is not None:
+                response.close() # Devolve a ligação ao pool mesmo que o corpo não tenha sido lido
+        self._count_revalidation("full_downloads")
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._remember_validators(url, etag, last_modified, data)
+        if self.disk_cache is not None:
+            self._run_disk_operation(self.disk_cache.set, url, data, etag=etag, last_modified=last_modified)
+        return data, True
+
+    def _get_validators(self, url):
+        """Devolve os validadores HTTP e o payload conhecidos para `url` (memória ou disco)."""
+        with self._validators_lock:
+            validators = self._validators.get(url)
+            if validators is not None:
+                self._validators.move_to_end(url)
+                return validators
+
+        if self.disk_cache is None:
+            return None
+        entry = self.disk_cache.get(url)
+        if entry is None or not (entry.etag or entry.last_modified):
+            return None
+        return self._remember_validators(url, entry.etag, entry.last_modified, entry.payload)
+
+    def _remember_validators(self, url, etag, last_modified, payload):
+        validators = {"etag": etag, "last_modified": last_modified, "payload": payload}
+        with self._validators_lock:
+            self._validators[url] = validators
+            self._validators.move_to_end(url)
+            while len(self._validators) > MAX_REMEMBERED_VALIDATORS:
+                self._validators.popitem(last=False)
+        return validators
+
+    def _count_revalidation(self, outcome):
+        with self._validators_lock:
+            self.revalidation_stats[outcome] += 1
+        metrics.increment(f"ipma_{outcome}")
+
+    def get_revalidation_stats(self):
+        """
+        Devolve quantas respostas foram 304 (cópia reutilizada) e quantas foram
+        descarregadas por completo.
+
+        Returns:
+            dict: {"not_modified": int, "full_downloads": int}.
+        """
+        with self._validators_lock:
+            return dict(self.revalidation_stats)
+
+    def get_single_flight_stats(self):
+        """
+        Devolve quantas obtenções foram executadas e quantas reutilizaram um pedido
+        idêntico já em curso.
+
+        Returns:
+            dict: {"executions": int, "shared": int}.
+        """
+        return self._single_flight.stats()
+
+    def get_resilience_stats(self):
+        """
+        Devolve o estado do disjuntor e quantas vezes foi servida uma cópia antiga.
+
+        Returns:
+            dict: {"state", "rejected", "times_opened", "stale_served"}.
+        """
+        stats = self.circuit_breaker.stats()
+        stats["stale_served"] = self.stale_served
+        return stats
+
+    def get_rate_limit_stats(self):
+        """
+        Contadores do limite de pedidos por família ("forecast", "reference"):
+        pedidos, pedidos que esperaram, fila atual/máxima e tempos de espera
+        (ver `TokenBucket.stats`). Vazio se o transporte não tiver limite.
+        """
+        limiter = getattr(self.transport, "rate_limiter", None)
+        return limiter.stats() if limiter is not None else {}
+
+    def _run_disk_operation(self, operation, *args, **kwargs):
+        """Executa uma escrita na cache em disco (falhas não são fatais)."""
+        try:
+            operation(*args, **kwargs)
+        except Exception as e:
+            logging.warning(f"IPMA API: Não foi possível escrever na cache em disco: {e}")
 
     def get_location_name(self, globalIdLocal):
         """
@@ -123,3 +675,7 @@ class IPMAApi:
             return f"ID Local: {globalIdLocal}"
 
         return locations.get(str(globalIdLocal), f"ID Local Desconhecido ({globalIdLocal})")
+
+    def close(self):
+        """Fecha as ligações mantidas pela camada de transporte."""
+        self.transport.close()
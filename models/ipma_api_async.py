@@ -0,0 +1,197 @@
+"""
+Versão assíncrona (asyncio) da `IPMAApi`.
+
+Todas as corrotinas de uma instância partilham um único pool de ligações
+(`AsyncConnectionPool`) no event loop em que correm, o que permite manter
+centenas de pedidos ao IPMA em curso sem uma thread por pedido. Os métodos
+devolvem exatamente as mesmas estruturas que a `IPMAApi` síncrona.
+
+Limitações: o `MainController` (e, por ele, as views, a exportação e o
+prefetch) chama a `IPMAApi` de forma síncrona e usa métodos que esta classe
+não tem (`iter_daily_forecasts`, `get_geo_index`, `get_locations_map(wait=...)`),
+pelo que só aceita a `IPMAApi`. Este cliente destina-se a código que já corre
+num event loop. Também não tem a cache em disco, a revalidação condicional, a
+repetição com disjuntor (`models/resilience.py`), o `RateLimiter` nem as
+métricas da versão síncrona; só partilha com ela a `ForecastCache`.
+
+Exemplo:
+    async with AsyncIPMAApi() as api:
+        locations = await api.get_locations_map()
+        forecast = await api.get_daily_forecast("1110600")
+"""
+
+import asyncio
+import logging
+import time
+
+import requests
+
+from models.async_http import AsyncConnectionPool
+from models.forecast_cache import ForecastCache
+from models.ipma_api import (
+    DAILY_FORECAST_PATH, WEATHER_TYPE_CLASSES_PATH, LOCATIONS_PATH, DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_REFERENCE_RETRY_INTERVAL, parse_weather_type_descriptions, parse_locations_map, resolve_base_url,
+)
+
+
+class AsyncIPMAApi:
+    """
+    Cliente assíncrono da API de dados abertos do IPMA.
+
+    Args:
+        pool (AsyncConnectionPool, optional): Pool de ligações a usar. Se omitido,
+            é criado um por omissão (deve ser usado sempre no mesmo event loop).
+        forecast_cache (ForecastCache, optional): Cache de previsões (TTL + LRU);
+            pode ser partilhada com uma `IPMAApi` síncrona.
+        base_url (str, optional): URL base dos endpoints, como na `IPMAApi`.
+        reference_retry_interval (float): Segundos até voltar a tentar carregar um
+            mapeamento de referência cuja carga falhou, como na `IPMAApi`.
+    """
+    def __init__(self, pool=None, forecast_cache=None, base_url=None,
+                 reference_retry_interval=DEFAULT_REFERENCE_RETRY_INTERVAL):
+        self.pool = pool if pool is not None else AsyncConnectionPool()
+        self.forecast_cache = forecast_cache if forecast_cache is not None else ForecastCache()
+        self.base_url = resolve_base_url(base_url)
+        self.base_url_daily_forecast = self.base_url + DAILY_FORECAST_PATH
+        self.weather_type_classes_url = self.base_url + WEATHER_TYPE_CLASSES_PATH
+        self.locations_url = self.base_url + LOCATIONS_PATH
+        self._weather_descriptions = None
+        self._locations_map = None
+        self.reference_retry_interval = reference_retry_interval
+        self._reference_failed_at = {} # {atributo: instante (monotonic) da última carga falhada}
+        self._reference_lock = None # Criado no event loop em uso
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_json(self, url):
+        response = await self.pool.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_daily_forecast(self, globalIdLocal):
+        """
+        Busca a previsão meteorológica diária para um dado ID de localidade.
+
+        Returns:
+            dict or None: Os dados da previsão, ou None em caso de erro.
+        """
+        if not globalIdLocal:
+            logging.error("IPMA API (async): globalIdLocal não pode ser vazio.")
+            return None
+
+        cached = self.forecast_cache.get(globalIdLocal)
+        if cached is not None:
+            return cached
+
+        try:
+            return await self._fetch_daily_forecast(globalIdLocal)
+        except requests.exceptions.RequestException as e:
+            logging.error(f"IPMA API (async) Request Error for {globalIdLocal}: {e}")
+            return None
+        except ValueError as e:
+            logging.error(f"IPMA API (async) JSON Decode Error for {globalIdLocal}: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"IPMA API (async) Unexpected error for {globalIdLocal}: {e}")
+            return None
+
+    async def _fetch_daily_forecast(self, globalIdLocal):
+        url = f"{self.base_url_daily_forecast}{globalIdLocal}.json"
+        logging.info(f"IPMA API (async): A buscar previsão para o ID {globalIdLocal} em {url}")
+        data = await self._get_json(url)
+        logging.info(f"IPMA API (async): Pedido bem-sucedido para {globalIdLocal}. Recebido {len(data.get('data', []))} dias de previsão.")
+        self.forecast_cache.set(globalIdLocal, data)
+        return data
+
+    async def get_daily_forecasts(self, globalIdLocals, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        Busca em simultâneo a previsão diária para vários IDs de localidade.
+
+        Returns:
+            dict: {globalIdLocal (str): {"data": dict or None, "error": str or None}},
+                  com o mesmo formato de `IPMAApi.get_daily_forecasts`.
+        """
+        ids = list(dict.fromkeys(str(gid) for gid in globalIdLocals if gid))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(gid):
+            cached = self.forecast_cache.get(gid)
+            if cached is not None:
+                return gid, {"data": cached, "error": None}
+            async with semaphore:
+                try:
+                    return gid, {"data": await self._fetch_daily_forecast(gid), "error": None}
+                except Exception as e:
+                    logging.error(f"IPMA API (async): Falha ao obter previsão para {gid}: {e}")
+                    return gid, {"data": None, "error": f"{type(e).__name__}: {e}"}
+
+        return dict(await asyncio.gather(*(fetch(gid) for gid in ids)))
+
+    def _lock(self):
+        if self._reference_lock is None:
+            self._reference_lock = asyncio.Lock()
+        return self._reference_lock
+
+    async def get_weather_type_descriptions(self):
+        """
+        Busca e carrega o mapeamento de códigos de tipo de tempo para descrições.
+        Chamadas simultâneas esperam pelo mesmo carregamento.
+        """
+        return await self._ensure_reference("_weather_descriptions", self.weather_type_classes_url,
+                                            parse_weather_type_descriptions, "tipos de tempo")
+
+    async def get_locations_map(self):
+        """
+        Busca e carrega o mapeamento de globalIdLocal para nomes de locais.
+        Chamadas simultâneas esperam pelo mesmo carregamento.
+        """
+        return await self._ensure_reference("_locations_map", self.locations_url, parse_locations_map, "locais")
+
+    async def _ensure_reference(self, attr, url, parser, label):
+        """
+        Carrega `self.<attr>` na primeira utilização e, depois de uma carga falhada,
+        de novo quando passar `reference_retry_interval` (ver `IPMAApi._ensure_reference`).
+        """
+        if getattr(self, attr) is None or self._reference_retry_due(attr):
+            async with self._lock():
+                if getattr(self, attr) is None or self._reference_retry_due(attr):
+                    await self._load_reference(attr, url, parser, label)
+        return getattr(self, attr)
+
+    async def _load_reference(self, attr, url, parser, label):
+        logging.info(f"IPMA API (async): A carregar mapeamento de {label}...")
+        try:
+            setattr(self, attr, parser(await self._get_json(url)))
+            self._reference_failed_at.pop(attr, None)
+            logging.info(f"IPMA API (async): Carregado mapeamento de {label} ({len(getattr(self, attr))} entradas).")
+            return
+        except requests.exceptions.RequestException as e:
+            logging.error(f"IPMA API (async) Request Error while fetching {label}: {e}")
+        except (ValueError, KeyError) as e:
+            logging.error(f"IPMA API (async) Error processing {label} JSON. Error: {e}")
+        # Mapeamento vazio só até à próxima tentativa, não para sempre
+        if not getattr(self, attr):
+            setattr(self, attr, {})
+        self._reference_failed_at[attr] = time.monotonic()
+        logging.warning(f"IPMA API (async): Nova tentativa de carregar {label} dentro de {self.reference_retry_interval:g}s.")
+
+    def _reference_retry_due(self, attr):
+        """Indica se a carga de `self.<attr>` falhou e já passou o intervalo para nova tentativa."""
+        failed_at = self._reference_failed_at.get(attr)
+        return failed_at is not None and time.monotonic() - failed_at >= self.reference_retry_interval
+
+    async def get_location_name(self, globalIdLocal):
+        """Retorna o nome do local para um dado globalIdLocal."""
+        locations = await self.get_locations_map()
+        if not locations:
+            return f"ID Local: {globalIdLocal}"
+
+        return locations.get(str(globalIdLocal), f"ID Local Desconhecido ({globalIdLocal})")
+
+    async def close(self):
+        """Fecha as ligações mantidas pelo pool."""
+        await self.pool.close()
@@ -0,0 +1,95 @@
+"""
+Camada de (de)serialização JSON com backend rápido opcional.
+
+Usa o `orjson` ou, em alternativa, o `ujson` se estiverem instalados, e o
+módulo `json` da biblioteca padrão caso contrário, sem nova dependência
+obrigatória. A variável de ambiente `GUIA_PRAIAS_JSON_BACKEND` (ex: "json")
+ou `set_backend()` forçam um backend. Todos devolvem texto UTF-8 sem escapes
+`\\uXXXX` em `dumps` e aceitam bytes ou str em `loads`; os erros de
+descodificação são sempre `ValueError`.
+
+A descodificação em streaming (`models/json_stream.py`) continua a usar o
+`json` da biblioteca padrão, o único com `raw_decode`.
+"""
+
+import importlib
+import json
+import logging
+import os
+from collections import namedtuple
+
+# Por ordem de preferência
+BACKENDS = ("orjson", "ujson", "json")
+
+JsonBackend = namedtuple("JsonBackend", ["name", "loads", "dumps"])
+
+
+def _load_backend(name):
+    """Devolve o `JsonBackend` `name`, ou None se a biblioteca não estiver instalada."""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend JSON desconhecido: {name} (use um de {', '.join(BACKENDS)})")
+    if name == "json":
+        return JsonBackend("json", json.loads, lambda obj: json.dumps(obj, ensure_ascii=False))
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+    if name == "orjson":
+        # orjson só aceita chaves str por omissão e devolve bytes
+        option = module.OPT_NON_STR_KEYS
+        return JsonBackend("orjson", module.loads, lambda obj: module.dumps(obj, option=option).decode("utf-8"))
+    return JsonBackend("ujson", module.loads, lambda obj: module.dumps(obj, ensure_ascii=False))
+
+
+def available_backends():
+    """Nomes dos backends instalados, por ordem de preferência."""
+    return [name for name in BACKENDS if _load_backend(name) is not None]
+
+
+def _select_backend(preferred=None):
+    if preferred:
+        try:
+            backend = _load_backend(preferred)
+        except ValueError as e:
+            logging.warning(f"JSON: {e}; a escolher automaticamente.")
+        else:
+            if backend is not None:
+                return backend
+            logging.warning(f"JSON: backend '{preferred}' não está instalado; a escolher automaticamente.")
+    for name in BACKENDS:
+        backend = _load_backend(name)
+        if backend is not None:
+            return backend
+
+
+_backend = _select_backend(os.environ.get("GUIA_PRAIAS_JSON_BACKEND"))
+
+
+def get_backend():
+    """Devolve o `JsonBackend` em uso."""
+    return _backend
+
+
+def set_backend(name):
+    """
+    Passa a usar o backend `name` ("orjson", "ujson" ou "json").
+
+    Raises:
+        ValueError: Se o backend for desconhecido ou não estiver instalado.
+    """
+    global _backend
+    backend = _load_backend(name)
+    if backend is None:
+        raise ValueError(f"Backend JSON '{name}' não está instalado.")
+    _backend = backend
+    return backend
+
+
+def loads(data):
+    """Descodifica JSON (bytes em UTF-8 ou str)."""
+    return _backend.loads(data)
+
+
+def dumps(obj):
+    """Serializa `obj` em texto JSON (UTF-8, sem escapes de caracteres não ASCII)."""
+    return _backend.dumps(obj)
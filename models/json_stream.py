@@ -0,0 +1,165 @@
+"""
+Descodificação incremental (streaming) de respostas JSON do IPMA.
+
+Os endpoints do IPMA devolvem um objeto com alguns campos de topo e uma lista
+`data` com um registo por local/dia. `iter_json_array` lê a resposta aos
+pedaços (ex: `response.iter_content()`), descodifica cada registo da lista com
+`json.JSONDecoder.raw_decode` assim que chega completo e devolve-o de imediato,
+opcionalmente só com os campos pedidos. Nunca é preciso ter o corpo inteiro em
+memória nem a árvore completa de objetos: só o pedaço por processar e o
+registo atual.
+"""
+
+import codecs
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Buffer de texto alimentado por pedaços (bytes em UTF-8 ou str)."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Lê o próximo pedaço não vazio. Devolve False quando a resposta terminou."""
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._utf8.decode(b"", final=True)
+            elif isinstance(chunk, bytes):
+                text = self._utf8.decode(chunk)
+            else:
+                text = chunk
+            if text:
+                # Descarta o que já foi consumido, para o buffer não crescer com a resposta
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Salta espaços e devolve o próximo carácter (sem o consumir), ou None no fim."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' e encontrado {found!r} (posição {self.pos})")
+        self.pos += 1
+
+    def value(self):
+        """Descodifica o valor JSON completo que começa na posição atual."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # Um número (ou literal) no fim do buffer pode continuar no próximo pedaço
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _project(item, fields):
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def _iter_array(reader, fields):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield _project(reader.value(), fields)
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"JSON inválido: esperado ',' ou ']' e encontrado {separator!r}")
+
+
+def iter_json_array(chunks, key="data", fields=None, metadata=None):
+    """
+    Devolve, um a um e à medida que chegam, os elementos da lista `key` do
+    objeto JSON de topo (ou da própria lista, se o topo for uma lista).
+
+    Args:
+        chunks (iterable): Pedaços da resposta, em bytes (UTF-8) ou str.
+        key (str): Chave da lista de registos no objeto de topo.
+        fields (iterable, optional): Campos a manter em cada registo (os outros
+            são descartados logo após a descodificação); por omissão, todos.
+        metadata (dict, optional): Recebe os restantes campos do objeto de topo
+            (os que vêm depois da lista só ficam disponíveis no fim).
+
+    Yields:
+        Cada elemento da lista.
+
+    Raises:
+        ValueError: Se o JSON for inválido ou estiver truncado.
+    """
+    fields = tuple(fields) if fields is not None else None
+    reader = _ChunkReader(chunks)
+    first = reader.peek()
+    if first == "[":
+        yield from _iter_array(reader, fields)
+    elif first == "{":
+        reader.pos += 1
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                name = reader.value()
+                reader.expect(":")
+                if name == key and reader.peek() == "[":
+                    yield from _iter_array(reader, fields)
+                else:
+                    value = reader.value()
+                    if metadata is not None:
+                        metadata[name] = value
+                separator = reader.peek()
+                reader.pos += 1
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise ValueError(f"JSON inválido: esperado ',' ou '}}' e encontrado {separator!r}")
+    else:
+        raise ValueError(f"JSON inválido: esperado um objeto ou uma lista e encontrado {first!r}")
+
+    if reader.peek() is not None:
+        raise ValueError("JSON inválido: dados extra após o valor de topo")
+
+
+def load_json_stream(chunks, key="data", fields=None):
+    """
+    Descodifica uma resposta inteira com `iter_json_array`, devolvendo o objeto
+    de topo com a lista `key` já filtrada por `fields`.
+    """
+    payload = {}
+    items = list(iter_json_array(chunks, key, fields, payload))
+    payload[key] = items
+    return payload
@@ -0,0 +1,175 @@
+"""
+Índice de pesquisa de locais por nome: exata, por prefixo e aproximada.
+
+Os nomes são normalizados uma única vez, quando o índice é construído (sem
+acentos, em minúsculas e com espaços/pontuação uniformizados), para que
+"lisboa", "Lisboa " ou "Évora"/"evora" encontrem o mesmo local. A pesquisa
+por prefixo usa uma lista ordenada de chaves com `bisect` (também pelo início
+de cada palavra, ex: "delg" -> "Ponta Delgada") e a aproximada um índice de
+trigramas, tolerante a erros de escrita.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from itertools import chain
+
+# Pontuação mínima (coeficiente de Dice entre trigramas) para uma correspondência aproximada
+DEFAULT_MIN_FUZZY_SCORE = 0.45
+DEFAULT_SEARCH_LIMIT = 10
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+# Qualificadores entre parênteses, ex: "Ponta Delgada (Açores)"
+_QUALIFIER = re.compile(r"\s*\([^)]*\)")
+
+
+def fold(text):
+    """
+    Normaliza `text` para comparação: remove acentos, passa a minúsculas e
+    reduz pontuação e espaços a um único espaço ("São  Jorge!" -> "sao jorge").
+    """
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", without_accents.casefold()).strip()
+
+
+def _trigrams(folded):
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LocationIndex:
+    """
+    Índice pré-calculado sobre um mapa {nome: id} de locais.
+
+    Args:
+        names_to_ids (dict): Mapeamento nome do local -> globalIdLocal.
+    """
+    def __init__(self, names_to_ids):
+        self._names = []
+        self._ids = []
+        self._keys = [] # nome normalizado, por posição
+        self._exact = {} # chave normalizada -> posição do nome
+        word_keys = []
+        self._trigram_postings = defaultdict(list) # trigrama -> posições dos nomes
+        self._trigram_counts = []
+
+        for position, (name, location_id) in enumerate(sorted(names_to_ids.items(), key=lambda item: fold(item[0]))):
+            self._names.append(name)
+            self._ids.append(location_id)
+            key = fold(name)
+            self._keys.append(key)
+            self._exact.setdefault(key, position)
+
+            # Chaves de prefixo das palavras seguintes à primeira (o nome completo já está em self._keys)
+            words = key.split(" ")
+            for start in range(1, len(words)):
+                word_keys.append((" ".join(words[start:]), position))
+
+            grams = _trigrams(key)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_postings[gram].append(position)
+
+        # Como os nomes estão ordenados pela chave normalizada, self._keys já está ordenada
+        word_keys.sort()
+        self._word_keys = [entry[0] for entry in word_keys]
+        self._word_positions = [entry[1] for entry in word_keys]
+
+    def __len__(self):
+        return len(self._names)
+
+    def lookup(self, query):
+        """
+        Devolve (nome, id) do local cujo nome corresponde a `query` ignorando
+        acentos, maiúsculas, espaços e qualificadores entre parênteses, ou None.
+        """
+        for key in (fold(query), fold(_QUALIFIER.sub("", str(query)))):
+            position = self._exact.get(key)
+            if position is not None:
+                return self._names[position], self._ids[position]
+        return None
+
+    def resolve(self, query, min_score=DEFAULT_MIN_FUZZY_SCORE):
+        """
+        Como lookup(), mas recorre à pesquisa aproximada se não houver
+        correspondência exata (ex: "Lisbao" -> "Lisboa").
+
+        Returns:
+            tuple or None: (nome, id) do melhor candidato, ou None.
+        """
+        found = self.lookup(query)
+        if found is not None:
+            return found
+        candidates = self._fuzzy_positions(_QUALIFIER.sub("", str(query)), 1, min_score)
+        if not candidates:
+            return None
+        position = candidates[0][1]
+        return self._names[position], self._ids[position]
+
+    def search(self, prefix, limit=DEFAULT_SEARCH_LIMIT):
+        """
+        Devolve até `limit` nomes que começam por `prefix` (ou em que uma das
+        palavras começa por `prefix`), com os que começam pelo nome completo primeiro.
+        """
+        key = fold(prefix)
+        if not key:
+            return self._names[:limit]
+
+        # 1) Nomes que começam pelo prefixo, já por ordem alfabética
+        start = bisect_left(self._keys, key)
+        positions = []
+        for position in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[position].startswith(key):
+                break
+            positions.append(position)
+
+        # 2) Nomes em que outra palavra começa pelo prefixo (ex: "delg" -> "Ponta Delgada")
+        if len(positions) < limit:
+            seen = set(positions)
+            word_matches = []
+            index = bisect_left(self._word_keys, key)
+            while index < len(self._word_keys) and self._word_keys[index].startswith(key):
+                position = self._word_positions[index]
+                if position not in seen:
+                    seen.add(position)
+                    word_matches.append(position)
+                    if len(positions) + len(word_matches) >= limit:
+                        break
+                index += 1
+            positions.extend(sorted(word_matches))
+        return [self._names[position] for position in positions]
+
+    def fuzzy(self, query, limit=5, min_score=DEFAULT_MIN_FUZZY_SCORE):
+        """
+        Pesquisa aproximada por trigramas (tolerante a erros de escrita).
+
+        Returns:
+            list: [(nome, pontuação)] por ordem decrescente de pontuação (0 a 1).
+        """
+        return [(self._names[position], round(score, 3))
+                for score, position in self._fuzzy_positions(query, limit, min_score)]
+
+    def _fuzzy_positions(self, query, limit, min_score):
+        """Devolve [(pontuação, posição)] dos melhores candidatos por trigramas."""
+        key = fold(query)
+        if not key:
+            return []
+        grams = _trigrams(key)
+        postings = self._trigram_postings
+        shared = Counter(chain.from_iterable(postings[gram] for gram in grams if gram in postings))
+
+        # Dice >= min_score exige pelo menos min_score * len(grams) / 2 trigramas em comum
+        min_shared = min_score * len(grams) / 2
+        n_grams, counts = len(grams), self._trigram_counts
+        scored = []
+        for position, count in shared.items():
+            if count < min_shared:
+                continue
+            score = 2 * count / (n_grams + counts[position])
+            if score >= min_score:
+                scored.append((score, position))
+        # Em caso de empate, prefere o nome de comprimento mais próximo da pesquisa
+        scored.sort(key=lambda item: (-item[0], abs(len(self._keys[item[1]]) - len(key)), item[1]))
+        return scored[:limit]
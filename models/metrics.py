@@ -0,0 +1,185 @@
+"""
+Métricas de desempenho em processo: temporizadores e contadores por etapa.
+
+Os registos ("A buscar previsão para o ID ...") não mostram onde se gasta o
+tempo. A `IPMAApi`, o `MainController` e as views registam aqui o tempo de
+rede, de descodificação do JSON, de processamento e de atualização da UI, e
+os acertos/falhas das caches. O registo global (`registry`) pode ser lido com
+`snapshot()` ou exportado em JSON (`to_json`) ou no formato de texto do
+Prometheus (`to_prometheus`).
+
+Por omissão está desligado: `timer()` devolve um objeto partilhado que não faz
+nada e `increment()`/`observe()` retornam logo após verificar `enabled`, pelo
+que o custo é uma verificação de atributo por ponto de medição. Liga-se com
+`enable()`, com a variável de ambiente `GUIA_PRAIAS_METRICS=1` ou com
+`main.py --metrics-out FICHEIRO`.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+METRICS_ENV = "GUIA_PRAIAS_METRICS"
+PROMETHEUS_PREFIX = "guia_praias_"
+
+
+class _NullTimer:
+    """Temporizador usado quando as métricas estão desligadas (não mede nada)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_start")
+
+    def __init__(self, registry, name):
+        self._registry = registry
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._registry.observe(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Contadores e temporizadores por nome, seguros entre threads.
+
+    Args:
+        enabled (bool): Se False, nenhuma medição é registada.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timers = {} # nome -> [contagem, soma, mínimo, máximo] (segundos)
+
+    def increment(self, name, amount=1):
+        """Soma `amount` ao contador `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        """Regista uma duração (segundos) no temporizador `name`."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                self._timers[name] = [1, seconds, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                if seconds < stats[2]:
+                    stats[2] = seconds
+                if seconds > stats[3]:
+                    stats[3] = seconds
+
+    def timer(self, name):
+        """Gestor de contexto que mede o bloco em `name` (`with registry.timer("x"): ...`)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """Decorador que mede cada chamada da função em `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        """Apaga todos os contadores e temporizadores."""
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def snapshot(self):
+        """
+        Cópia das métricas.
+
+        Returns:
+            dict: {"counters": {nome: valor}, "timers": {nome: {"count", "total_seconds",
+                  "avg_seconds", "min_seconds", "max_seconds"}}}.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {name: list(stats) for name, stats in self._timers.items()}
+        return {
+            "counters": dict(sorted(counters.items())),
+            "timers": {
+                name: {"count": count, "total_seconds": total, "avg_seconds": total / count,
+                       "min_seconds": minimum, "max_seconds": maximum}
+                for name, (count, total, minimum, maximum) in sorted(timers.items())
+            },
+        }
+
+    def to_json(self):
+        """As métricas de `snapshot()` em JSON."""
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """
+        As métricas no formato de texto do Prometheus: contadores como `<nome>_total`
+        e temporizadores como resumos `<nome>_seconds` (`_count`, `_sum`) mais `<nome>_seconds_max`.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot["counters"].items():
+            metric = f"{prefix}{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, stats in snapshot["timers"].items():
+            metric = f"{prefix}{name}_seconds"
+            lines += [f"# TYPE {metric} summary",
+                      f"{metric}_count {stats['count']}",
+                      f"{metric}_sum {stats['total_seconds']:.9f}",
+                      f"# TYPE {metric}_max gauge",
+                      f"{metric}_max {stats['max_seconds']:.9f}"]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def dump(self, path):
+        """Grava as métricas em `path`: JSON se terminar em ".json", texto do Prometheus caso contrário."""
+        text = self.to_json() + "\n" if path.lower().endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Registo partilhado por toda a aplicação
+registry = MetricsRegistry(enabled=os.environ.get(METRICS_ENV, "").lower() in ("1", "true", "yes"))
+
+timer = registry.timer
+timed = registry.timed
+increment = registry.increment
+observe = registry.observe
+
+
+def enable():
+    registry.enabled = True
+
+
+def disable():
+    registry.enabled = False
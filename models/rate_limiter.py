@@ -0,0 +1,138 @@
+"""
+Limite de pedidos por segundo (token bucket) para os pedidos ao IPMA.
+
+Com a busca em lote e o prefetch é fácil enviar dezenas de pedidos de uma vez
+ao `api.ipma.pt` e ser limitado (HTTP 429). `TokenBucket` deixa passar rajadas
+até `burst` pedidos e, a partir daí, exatamente `rate` pedidos por segundo.
+Cada pedido reserva o seu lugar ao chegar: quando não há fichas, o saldo fica
+negativo e o pedido espera o tempo necessário para o pagar, pelo que os
+pedidos simultâneos são servidos por ordem de chegada (FIFO) e nenhum fica
+indefinidamente à espera.
+
+`RateLimiter` agrupa um balde por família de endpoints (previsões e dados de
+referência) e é partilhado por todos os pedidos da mesma `HttpTransport`.
+"""
+
+import threading
+import time
+
+FORECAST_FAMILY = "forecast"
+REFERENCE_FAMILY = "reference"
+
+# (pedidos por segundo, rajada) por família; a rajada cobre uma busca de todos os locais
+DEFAULT_BUDGETS = {
+    FORECAST_FAMILY: (10.0, 40),
+    REFERENCE_FAMILY: (2.0, 4),
+}
+
+
+class TokenBucket:
+    """
+    Balde de fichas com reserva por ordem de chegada, seguro entre threads.
+
+    Args:
+        rate (float): Fichas (pedidos) repostas por segundo.
+        burst (int): Capacidade do balde (pedidos que podem passar de seguida).
+        clock (callable): Relógio monotónico (injetável nos testes).
+        sleep (callable): Função de espera (injetável nos testes).
+    """
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("O ritmo de um TokenBucket tem de ser positivo.")
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waiting = 0
+        self.max_waiting = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens=1):
+        """Reserva `tokens` fichas e devolve os segundos a esperar até poderem ser usadas."""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self, tokens=1):
+        """Bloqueia até haver fichas para um pedido. Devolve o tempo de espera (segundos)."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            with self._lock:
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                self._sleep(wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return wait
+
+    def pause(self, seconds):
+        """
+        Suspende o balde durante `seconds` (ex: o `Retry-After` de uma resposta 429):
+        os próximos pedidos esperam pelo menos esse tempo, pela ordem de chegada.
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def stats(self):
+        """Devolve rate, burst, acquired, delayed, waiting, max_waiting, total_wait, max_wait e avg_wait."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "total_wait": self.total_wait,
+                "max_wait": self.max_wait,
+                "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            }
+
+
+class RateLimiter:
+    """
+    Um `TokenBucket` por família de endpoints.
+
+    Args:
+        budgets (dict, optional): {família: (pedidos por segundo, rajada)}.
+            Por omissão, `DEFAULT_BUDGETS`.
+        clock, sleep: Passados a cada `TokenBucket` (injetáveis nos testes).
+    """
+    def __init__(self, budgets=None, clock=time.monotonic, sleep=time.sleep):
+        budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self.buckets = {family: TokenBucket(rate, burst, clock=clock, sleep=sleep)
+                        for family, (rate, burst) in budgets.items()}
+
+    def acquire(self, family):
+        """Espera pela vez de um pedido da `family`. Famílias sem orçamento não esperam."""
+        bucket = self.buckets.get(family)
+        return bucket.acquire() if bucket is not None else 0.0
+
+    def pause(self, family, seconds):
+        bucket = self.buckets.get(family)
+        if bucket is not None:
+            bucket.pause(seconds)
+
+    def stats(self):
+        """Devolve {família: TokenBucket.stats()}."""
+        return {family: bucket.stats() for family, bucket in self.buckets.items()}
@@ -0,0 +1,182 @@
+"""
+Repetição de pedidos falhados e disjuntor (circuit breaker) para a API do IPMA.
+
+`RetryPolicy` repete um pedido que falhou por um erro transitório (falha de
+ligação, timeout, HTTP 429 ou 5xx) com esperas exponenciais e aleatórias
+("full jitter"), para que vários clientes não repitam todos ao mesmo tempo.
+`CircuitBreaker` conta as falhas seguidas do servidor e, a partir de um
+limite, passa a recusar pedidos de imediato (`CircuitOpenError`) durante
+`reset_timeout` segundos, em vez de deixar threads bloqueadas à espera de
+timeouts; depois deixa passar um único pedido de teste e volta a fechar se
+ele tiver sucesso.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+
+# Códigos HTTP que indicam um problema transitório do servidor
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.2
+DEFAULT_MAX_DELAY = 2.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """O disjuntor está aberto: o pedido foi recusado sem chegar à rede."""
+
+
+def is_retryable(error):
+    """Indica se `error` é uma falha transitória do servidor ou da rede (vale a pena repetir)."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+
+class RetryPolicy:
+    """
+    Número de tentativas e esperas entre elas.
+
+    Args:
+        max_attempts (int): Tentativas no total (1 = sem repetição).
+        base_delay (float): Espera máxima, em segundos, antes da 2.ª tentativa.
+        max_delay (float): Limite da espera entre tentativas.
+        multiplier (float): Fator de crescimento da espera a cada tentativa.
+        jitter (bool): Se True, cada espera é aleatória entre 0 e o máximo ("full jitter").
+    """
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, multiplier=2.0, jitter=True,
+                 sleep=time.sleep, rng=None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._sleep = sleep
+        self._random = (rng or random.Random()).random
+
+    def delay(self, attempt):
+        """Espera (segundos) depois da tentativa `attempt` falhada (1 = primeira)."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return ceiling * self._random() if self.jitter else ceiling
+
+    def call(self, func, *args, retryable=is_retryable, on_retry=None, **kwargs):
+        """
+        Chama `func(*args, **kwargs)`, repetindo enquanto a exceção for `retryable`
+        e houver tentativas. A última exceção é propagada.
+        """
+        attempt = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_attempts or not retryable(e):
+                    raise
+                delay = self.delay(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, e, delay)
+                self._sleep(delay)
+                attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Disjuntor partilhado pelos pedidos a um servidor.
+
+    Args:
+        failure_threshold (int): Falhas seguidas que abrem o disjuntor.
+        reset_timeout (float): Segundos em aberto antes de deixar passar um pedido de teste.
+        clock (callable): Relógio monotónico (injetável nos testes).
+    """
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 clock=time.monotonic, name="IPMA"):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        Autoriza um pedido, ou levanta `CircuitOpenError` se o disjuntor estiver
+        aberto (ou meio aberto com o pedido de teste ainda em curso).
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Disjuntor {self.name} aberto: pedido recusado sem contactar o servidor")
+                self._state = HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Disjuntor {self.name} a testar o servidor: pedido recusado")
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logging.info(f"Disjuntor {self.name}: servidor voltou a responder; disjuntor fechado.")
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.times_opened += 1
+                    logging.warning(f"Disjuntor {self.name}: aberto após {self._failures} falhas seguidas; "
+                                    f"novos pedidos falham de imediato durante {self.reset_timeout:g}s.")
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """
+        Chama `func` através do disjuntor: falhas transitórias (`is_retryable`)
+        contam como falhas do servidor; respostas como 404 contam como sucesso.
+        """
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_retryable(e):
+                self.record_failure()
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        """Devolve {"state", "rejected", "times_opened"}."""
+        state = self.state
+        with self._lock:
+            return {"state": state, "rejected": self.rejected, "times_opened": self.times_opened}
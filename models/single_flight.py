@@ -0,0 +1,64 @@
+"""
+Coalescência de pedidos em curso ("single-flight").
+
+Quando várias threads pedem o mesmo recurso ao mesmo tempo, apenas a
+primeira executa a operação; as restantes esperam e recebem o mesmo
+resultado (ou a mesma exceção), em vez de cada uma fazer o seu pedido.
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Agrupa chamadas simultâneas com a mesma chave numa única execução."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0 # Chamadas que executaram a operação
+        self.shared = 0 # Chamadas que reutilizaram o resultado de outra em curso
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Executa `func(*args, **kwargs)` para `key`, ou espera pela execução já em
+        curso para a mesma chave e devolve o seu resultado.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Devolve {"executions": int, "shared": int}."""
+        with self._lock:
+            return {"executions": self.executions, "shared": self.shared}
@@ -4,12 +4,40 @@ de tipos de tempo e nomes de locais, carregados dinamicamente da API do IPMA.
 """
 
 # Importa as classes e funções necessárias
-from models.ipma_api import IPMAApi
 import logging
+import threading
+from array import array
 
-# Cria uma instância da API para usar nos métodos de glossary.
-# Em aplicações maiores, esta instância pode ser passada de fora (injected).
-_ipma_api_instance = IPMAApi()
+# Instância da API usada pelos métodos de glossary. Só é criada no primeiro uso
+# (ver get_ipma_api), para que importar este módulo não tenha efeitos secundários.
+# A aplicação deve fornecer a sua própria instância com set_ipma_api(),
+# para que locais e tipos de tempo não sejam carregados duas vezes.
+_ipma_api_instance = None
+_ipma_api_lock = threading.Lock()
+
+
+def set_ipma_api(ipma_api):
+    """
+    Passa a usar a instância `IPMAApi` da aplicação (injeção de dependência),
+    partilhando a sua cache, pool de ligações e pedidos em curso.
+    """
+    global _ipma_api_instance
+    _ipma_api_instance = ipma_api
+    logging.info("Glossário: a usar a instância IPMAApi partilhada pela aplicação.")
+
+
+def get_ipma_api():
+    """
+    Retorna a instância `IPMAApi` usada pelo glossário, criando uma própria
+    no primeiro uso se a aplicação não tiver chamado set_ipma_api().
+    """
+    global _ipma_api_instance
+    if _ipma_api_instance is None:
+        with _ipma_api_lock:
+            if _ipma_api_instance is None:
+                from models.ipma_api import IPMAApi
+                _ipma_api_instance = IPMAApi()
+    return _ipma_api_instance
 
 # --- Glossário de Tipos de Tempo ---
 def get_weather_description(weather_id):
@@ -29,52 +57,16 @@ def get_weather_description(weather_id):
         str: A descrição textual do estado do tempo, uma mensagem de erro se o ID for inválido,
              ou uma mensagem indicando que os dados não puderam ser obtidos.
     """
-    # 1. Obter o dicionário de descrições de tempo:
-    #    Esta linha chama o método get_weather_type_descriptions da instância IPMAApi (_ipma_api_instance).
-    #    Este método busca os dados na API do IPMA (ou retorna da cache se já os tiver buscado).
-    #    O resultado esperado é um dicionário onde as chaves são os IDs dos tipos de tempo (como inteiros)
-    #    e os valores são as descrições em texto (como strings).
-    #    Exemplo de retorno: {2: "Poucas nuvens", 10: "Chuva fraca", ...}
-    weather_descriptions = _ipma_api_instance.get_weather_type_descriptions()
-
-    try:
-        # 2. Verificar se o weather_id recebido é nulo:
-        #    Se o identificador do tempo não foi fornecido (é None), não podemos fazer a busca.
-        #    Retorna uma mensagem indicando que não há dados disponíveis.
-        if weather_id is None:
-            return "Dados de tempo não disponíveis"
-        
-        # 3. Preparar o weather_id para a pesquisa no dicionário:
-        #    A API do IPMA pode retornar IDs como inteiros ou strings.
-        #    Para garantir que a pesquisa no dicionário funciona corretamente (assumindo que as chaves são inteiros),
-        #    tentamos converter `weather_id` para um número inteiro.
-        weather_id_int = int(weather_id)
-
-        # 4. Procurar a descrição no dicionário e retornar:
-        #    Utilizamos o método .get() do dicionário 'weather_descriptions'.
-        #    Este método é crucial por duas razões:
-        #    a) Se weather_id_int EXISTIR como chave no dicionário, '.get()' retorna o valor associado (a descrição).
-        #       Ex: Se weather_id_int for 2, e weather_descriptions[2] for "Poucas nuvens", retorna "Poucas nuvens".
-        #    b) Se weather_id_int NÃO EXISTIR como chave no dicionário (o que pode acontecer se a API adicionar novos códigos
-        #       ou se houver uma inconsistência), '.get()' não causa um erro (KeyError), mas retorna o SEGUNDO argumento fornecido,
-        #       que é o nosso valor de 'fallback' ou padrão.
-        #    O valor de fallback é uma mensagem informativa: f"Código de Tempo Desconhecido ({weather_id_int})".
-        return weather_descriptions.get(weather_id_int, f"Código de Tempo Desconhecido ({weather_id_int})")
-
-    # 5. Capturar erros de conversão de tipo:
-    #    Se o `weather_id` recebido não puder ser convertido para um inteiro (por exemplo, se for uma string como "chuva"
-    #    em vez de um número), ocorrerá um erro `ValueError` ou `TypeError` durante o int(weather_id).
-    #    Este bloco 'except' captura esses erros.
-    #    Quando um erro de conversão é apanhado, retornamos uma mensagem indicando que o ID fornecido é inválido.
-    except (ValueError, TypeError):
-        return f"ID de Tempo Inválido ({weather_id})"
+    # A tradução é feita pelo WeatherGlossary (tabela indexada diretamente pelo código),
+    # construído uma vez a partir das descrições da API (ver get_glossary).
+    return get_glossary().describe_weather(weather_id)
 
 # --- Mapeamento de Locais ---
 def get_location_name(globalIdLocal):
     """
     Retorna o nome do local associado a um dado globalIdLocal, usando a API do IPMA.
     """
-    return _ipma_api_instance.get_location_name(globalIdLocal)
+    return get_ipma_api().get_location_name(globalIdLocal)
 
 # --- Glossário de Classes de Vento ---
 # A lista de classes de vento é tipicamente estática se não houver um endpoint API para ela.
@@ -96,11 +88,140 @@ def get_wind_speed_description(wind_class_id):
     """
     Retorna a descrição textual para uma dada classe de velocidade do vento.
     """
-    try:
-        if wind_class_id is None:
-            return "Informação de vento indisponível"
-        
-        wind_class_int = int(wind_class_id)
-        return WIND_SPEED_CLASSES.get(wind_class_int, f"Classe de Vento Desconhecida ({wind_class_int})")
-    except (ValueError, TypeError):
-        return f"ID de Classe de Vento Inválido ({wind_class_id})"
\ No newline at end of file
+    return _wind_table.describe(wind_class_id)
+
+
+# --- Tabelas de tradução pré-calculadas ---
+# Os códigos do IPMA são inteiros pequenos (ex: -99 a 30 nos tipos de tempo), pelo
+# que cada glossário é convertido uma vez numa lista indexada diretamente pelo código.
+# Códigos negativos ficam no fim da lista, para que `tabela[codigo]` funcione também
+# para eles (índices negativos do Python). As posições sem descrição guardam já a
+# mensagem de "código desconhecido", e None, "N/A" e MISSING_INT (valor em falta nas
+# colunas da ForecastSeries) dão a mensagem de "dados indisponíveis".
+
+# Códigos fora deste intervalo não entram na tabela (são procurados no dicionário)
+MAX_TABLE_CODE = 1024
+# Valores que indicam um campo em falta (ver models/forecast_series.py)
+MISSING_INT = -32768
+MISSING_VALUE = "N/A"
+
+
+class _CodeTable:
+    """Tradução código -> descrição para um glossário, com a tabela pré-calculada."""
+    __slots__ = ("source", "_descriptions", "_table", "_low", "_high",
+                 "_missing_text", "_invalid_format", "_unknown_format")
+
+    def __init__(self, descriptions, missing_text, invalid_format, unknown_format):
+        self.source = descriptions
+        self._descriptions = {int(code): text for code, text in descriptions.items()}
+        self._missing_text = missing_text
+        self._invalid_format = invalid_format
+        self._unknown_format = unknown_format
+
+        in_range = [code for code in self._descriptions if -MAX_TABLE_CODE <= code < MAX_TABLE_CODE]
+        self._high = max([code + 1 for code in in_range if code >= 0], default=0)
+        self._low = min([code for code in in_range if code < 0], default=0)
+        # Posições 0.._high-1 para os códigos >= 0, seguidas dos códigos _low..-1
+        codes = list(range(self._high)) + list(range(self._low, 0))
+        self._table = [self._descriptions.get(code, unknown_format.format(code)) for code in codes]
+
+    def describe(self, value):
+        """Descrição de um código (int, string numérica, None, ...)."""
+        if type(value) is int and self._low <= value < self._high:
+            return self._table[value]
+        return self._describe_slow(value)
+
+    def _describe_slow(self, value):
+        if value is None or value == MISSING_VALUE or value == MISSING_INT:
+            return self._missing_text
+        try:
+            code = int(value)
+        except (ValueError, TypeError):
+            return self._invalid_format.format(value)
+        if self._low <= code < self._high:
+            return self._table[code]
+        return self._descriptions.get(code, self._unknown_format.format(code))
+
+    def describe_many(self, values):
+        """Descrições de uma sequência de códigos, pela mesma ordem."""
+        if not isinstance(values, (list, tuple, array)):
+            values = list(values)
+        if not values:
+            return []
+        table = self._table
+        try:
+            # Caso comum (ex: uma coluna `array('h')` sem valores em falta): tudo em C
+            if self._low <= min(values) and max(values) < self._high:
+                return list(map(table.__getitem__, values))
+        except TypeError:
+            pass # Tipos mistos, floats ou None: traduz um a um
+        low, high, slow = self._low, self._high, self._describe_slow
+        return [table[value] if type(value) is int and low <= value < high else slow(value) for value in values]
+
+
+# Mensagens (em falta, inválido, desconhecido) de cada glossário
+_WEATHER_MESSAGES = ("Dados de tempo não disponíveis", "ID de Tempo Inválido ({})", "Código de Tempo Desconhecido ({})")
+_WIND_MESSAGES = ("Informação de vento indisponível", "ID de Classe de Vento Inválido ({})", "Classe de Vento Desconhecida ({})")
+
+_wind_table = _CodeTable(WIND_SPEED_CLASSES, *_WIND_MESSAGES)
+
+
+class WeatherGlossary:
+    """
+    Glossário de tipos de tempo e classes de vento com as traduções pré-calculadas.
+
+    Devolve as mesmas mensagens que get_weather_description/get_wind_speed_description
+    e aceita lotes (ex: as colunas de uma ForecastSeries) em translate_many().
+
+    Args:
+        weather_descriptions (dict): {idWeatherType: descrição}, de IPMAApi.get_weather_type_descriptions().
+        wind_speed_classes (dict): {classe: descrição}; por omissão WIND_SPEED_CLASSES.
+    """
+    def __init__(self, weather_descriptions, wind_speed_classes=None):
+        self._weather = _CodeTable(weather_descriptions, *_WEATHER_MESSAGES)
+        self._wind = _wind_table if wind_speed_classes is None else _CodeTable(wind_speed_classes, *_WIND_MESSAGES)
+
+    @property
+    def weather_source(self):
+        """O dicionário de descrições a partir do qual o glossário foi construído."""
+        return self._weather.source
+
+    def describe_weather(self, weather_id):
+        return self._weather.describe(weather_id)
+
+    def describe_wind(self, wind_class_id):
+        return self._wind.describe(wind_class_id)
+
+    def translate_many(self, weather_ids, wind_speed_classes):
+        """
+        Traduz um lote de códigos de uma vez.
+
+        Args:
+            weather_ids: Sequência de IDs de tempo (ex: `ForecastSeries.weather_ids`).
+            wind_speed_classes: Sequência de classes de vento (ex: `ForecastSeries.wind_speed_classes`).
+
+        Returns:
+            tuple: (descrições do tempo, descrições do vento), listas pela ordem recebida.
+        """
+        return self._weather.describe_many(weather_ids), self._wind.describe_many(wind_speed_classes)
+
+
+_glossary = None
+
+
+def get_glossary():
+    """
+    Devolve o WeatherGlossary construído a partir das descrições da IPMAApi,
+    reconstruindo-o só quando a API passa a ter outro dicionário (ex: após revalidação).
+    """
+    global _glossary
+    descriptions = get_ipma_api().get_weather_type_descriptions()
+    glossary = _glossary
+    if glossary is None or glossary.weather_source is not descriptions:
+        glossary = _glossary = WeatherGlossary(descriptions)
+    return glossary
+
+
+def translate_many(weather_ids, wind_speed_classes):
+    """Traduz lotes de IDs de tempo e classes de vento (ver WeatherGlossary.translate_many)."""
+    return get_glossary().translate_many(weather_ids, wind_speed_classes)
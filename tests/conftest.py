@@ -0,0 +1,77 @@
+# conftest.py
+"""
+Fixtures partilhadas pelos testes: o servidor local que imita o IPMA
+(`tools/ipma_standin.py`) e fábricas de `IPMAApi`/`MainController`
+apontadas para ele.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from controllers.main_controller import MainController
+from models.ipma_api import IPMAApi
+from static_data.weather_glossary import (get_location_name, get_weather_description, get_wind_speed_description,
+                                          set_ipma_api, translate_many)
+from tools.ipma_standin import IPMAStandInServer
+
+
+def _make_api(server, **kwargs):
+    """Cria uma IPMAApi apontada para o servidor local."""
+    return IPMAApi(base_url=server.open_data_url, **kwargs)
+
+
+def _make_controller(server, **api_kwargs):
+    """Cria um MainController (e a IPMAApi partilhada com o glossário) apontado para o servidor local."""
+    api = _make_api(server, **api_kwargs)
+    set_ipma_api(api)
+    return MainController(
+        ipma_api=api,
+        weather_desc_func=get_weather_description,
+        location_name_func=get_location_name,
+        wind_desc_func=get_wind_speed_description,
+        translate_many_func=translate_many,
+    )
+
+
+def _wait_for(condition, timeout=5.0):
+    """Espera até `condition()` ser verdadeira (ou até ao timeout)."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def standin():
+    with IPMAStandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def standin_flaky():
+    """Servidor local com falhas reprodutíveis (ver `IPMAStandInServer.fail_next`)."""
+    with IPMAStandInServer(seed=7) as server:
+        yield server
+
+
+@pytest.fixture
+def make_api():
+    """`make_api(server, **kwargs)`: IPMAApi apontada para o servidor local."""
+    return _make_api
+
+
+@pytest.fixture
+def make_controller():
+    """`make_controller(server, **api_kwargs)`: MainController apontado para o servidor local."""
+    return _make_controller
+
+
+@pytest.fixture
+def wait_for():
+    """`wait_for(condition, timeout=5.0)`: espera até `condition()` ser verdadeira."""
+    return _wait_for
@@ -0,0 +1,50 @@
+# test_beach_catalogue.py
+"""Testes do catálogo de praias e da associação das praias aos locais do IPMA."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.beach_catalogue import Beach, BeachCatalogue, DEFAULT_CATALOGUE_PATH
+from models.geo_index import GeoIndex
+
+LOCATIONS = [
+    ("1131200", "Porto", 41.1580, -8.6294),
+    ("1110600", "Lisboa", 38.7660, -9.1286),
+    ("1080500", "Faro", 37.0146, -7.9331),
+]
+
+
+def test_load_bundled_csv():
+    catalogue = BeachCatalogue.load()
+    assert len(catalogue) >= 40
+    beach = catalogue.get("6")
+    assert beach.name == "Praia de Matosinhos" and beach.municipality == "Matosinhos"
+    assert isinstance(beach.latitude, float)
+    assert DEFAULT_CATALOGUE_PATH.endswith("beaches.csv")
+
+
+def test_load_json_skips_invalid_rows(tmp_path):
+    path = tmp_path / "praias.json"
+    path.write_text(json.dumps({"data": [
+        {"id": "a", "name": "Praia A", "latitude": "38.7", "longitude": "-9.4"},
+        {"name": "Sem coordenadas"},
+        {"name": "Praia B", "latitude": 37.0, "longitude": -8.0},
+    ]}), encoding="utf-8")
+    catalogue = BeachCatalogue.load(str(path))
+    assert [beach.name for beach in catalogue] == ["Praia A", "Praia B"]
+    assert catalogue.get("3").municipality == ""
+
+
+def test_assign_forecast_locations_uses_nearest_and_max_distance():
+    catalogue = BeachCatalogue([
+        Beach("1", "Praia de Matosinhos", "Matosinhos", 41.1775, -8.6920),
+        Beach("2", "Praia de Carcavelos", "Cascais", 38.6780, -9.3357),
+        Beach("3", "Praia de Porto Pim", "Horta", 38.5230, -28.6280),
+    ])
+    assignments = catalogue.assign_forecast_locations(GeoIndex(LOCATIONS), max_distance_km=100)
+    assert assignments["1"].name == "Porto"
+    assert assignments["2"].name == "Lisboa"
+    assert assignments["3"] is None
@@ -0,0 +1,74 @@
+# test_benchmark_suite.py
+"""
+Testes da suite de benchmarks (`benchmarks/run_suite.py`): formato dos
+resultados e deteção de regressões face à baseline.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from benchmarks.run_suite import BENCHMARKS_DIR, backend_mismatch, compare, default_baseline_path, main, run_suite
+from models import json_backend
+
+CASES = {"ipma_fetch_parse", "set_location_by_name", "process_forecast_data", "glossary_translate", "end_to_end"}
+
+
+def test_suite_measures_every_stage_of_the_pipeline():
+    results = run_suite(rounds=1, scale=0.02)
+    assert set(results["results"]) == CASES
+    assert all(case["min_us"] > 0 and case["relative"] > 0 for case in results["results"].values())
+    assert results["meta"]["json_backend"]
+
+
+def test_compare_uses_the_calibrated_time():
+    baseline = {"results": {"end_to_end": {"min_us": 100.0, "relative": 1.0}, "removed": {"min_us": 1, "relative": 1}}}
+    # Mais lento em absoluto, mas numa máquina mais lenta: não é regressão
+    slower_machine = {"results": {"end_to_end": {"min_us": 180.0, "relative": 1.1}, "new": {"min_us": 1, "relative": 1}}}
+    [(name, before, after, change, regressed)] = compare(slower_machine, baseline, tolerance=0.5)
+    assert (name, before, after, regressed) == ("end_to_end", 100.0, 180.0, False)
+    assert change == pytest.approx(0.1)
+    regressed = {"results": {"end_to_end": {"min_us": 100.0, "relative": 2.0}}}
+    assert compare(regressed, baseline, tolerance=0.5)[0][4]
+
+
+def test_regression_against_the_baseline_fails_the_run(tmp_path, capsys):
+    output, baseline = tmp_path / "latest.json", tmp_path / "baseline.json"
+    args = ["--rounds", "1", "--scale", "0.02", "--only", "glossary_translate",
+            "--output", str(output), "--baseline", str(baseline)]
+    assert main(args + ["--save-baseline"]) == 0
+
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    data["results"]["glossary_translate"]["relative"] /= 10 # Baseline 10x mais rápida
+    baseline.write_text(json.dumps(data), encoding="utf-8")
+    assert main(args) == 1
+    assert "FALHOU" in capsys.readouterr().err
+
+
+def test_missing_baseline_or_other_json_backend_fails_the_run(tmp_path, capsys):
+    output, baseline = tmp_path / "latest.json", tmp_path / "baseline.json"
+    args = ["--rounds", "1", "--scale", "0.02", "--only", "glossary_translate",
+            "--output", str(output), "--baseline", str(baseline)]
+    assert main(args) == 1
+    assert "sem baseline" in capsys.readouterr().err
+
+    assert main(args + ["--save-baseline"]) == 0
+    data = json.loads(baseline.read_text(encoding="utf-8"))
+    assert backend_mismatch(data, data) is None
+    data["meta"]["json_backend"] = "outro"
+    baseline.write_text(json.dumps(data), encoding="utf-8")
+    assert main(args) == 1
+    assert "backend JSON 'outro'" in capsys.readouterr().err
+
+
+def test_each_json_backend_has_its_own_committed_baseline():
+    assert default_baseline_path("json") == os.path.join(BENCHMARKS_DIR, "baseline.json.json")
+    assert default_baseline_path() == default_baseline_path(json_backend.get_backend().name)
+    # A biblioteca padrão está sempre disponível: uma instalação sem extras tem baseline
+    for backend in ("json", "orjson"):
+        with open(default_baseline_path(backend), encoding="utf-8") as f:
+            assert json.load(f)["meta"]["json_backend"] == backend
@@ -4,6 +4,9 @@ Script dedicado para testar o fluxo completo do MainController,
 simulando a sua inicialização e a chamada para obter e processar dados
 meteorológicos de uma localização específica, usando o nome do local.
 
+Corrido diretamente usa a API real do IPMA (ou o URL em $GUIA_PRAIAS_IPMA_URL,
+ex: o servidor local de `tools/ipma_standin.py`); com o pytest corre o mesmo
+fluxo contra o servidor local, sem rede.
 """
 
 import logging
@@ -19,8 +22,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Importa as classes e funções necessárias
 from models.ipma_api import IPMAApi
-from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description
+from static_data.weather_glossary import get_weather_description, get_location_name, get_wind_speed_description, set_ipma_api
 from controllers.main_controller import MainController
+from tools.ipma_standin import IPMAStandInServer
 
 
 def setup_logging():
@@ -32,13 +36,17 @@ def setup_logging():
         )
     logging.info("Logging configurado.")
 
-def run_test_flow():
-    """Executa o fluxo de teste do MainController usando o nome do local."""
+def run_test_flow(base_url=None, target_location_name="Braga"):
+    """
+    Executa o fluxo de teste do MainController usando o nome do local.
+    Devolve os dados processados da previsão, ou None se o fluxo falhar.
+    """
     setup_logging()
     logging.info("--- Iniciando Teste de Fluxo do MainController ---")
 
     # 1. Instanciar as dependências que o Controller precisa
-    ipma_api_instance = IPMAApi()
+    ipma_api_instance = IPMAApi(base_url=base_url)
+    set_ipma_api(ipma_api_instance) # O glossário usa a mesma instância que o Controller
 
     # 2. Instanciar o Controller, passando todas as dependências necessárias
     main_controller = MainController(
@@ -72,9 +80,9 @@ def run_test_flow():
     # target_location_name = "Invalid Location Name" # Para testar um erro
 
     # Se quiser testar um nome que sabes que existe na API, usa um da LISTAGEM ACIMA!
-    
-    target_location_name = "Braga" # Usa um nome da lista que aparecerá no output ** AQUI - EXPRIMENTAR (= **
+    # target_location_name = "Braga" (por omissão) # Usa um nome da lista que aparecerá no output ** AQUI - EXPRIMENTAR (= **
 
+    output_data = None
     logging.info(f"A tentar definir a localização pelo nome: '{target_location_name}'")
 
     # Usa o novo método, anteriormente testado com IDs' mas é de extrema importancia definir a localização a partir do nome
@@ -111,6 +119,19 @@ def run_test_flow():
             print("Verifique os logs para mais detalhes sobre o erro.")
 
     logging.info("--- Teste de Fluxo do MainController Concluído ---")
+    return output_data
+
+
+def test_controller_flow_offline(capsys):
+    """O mesmo fluxo, contra o servidor local que imita o IPMA."""
+    with IPMAStandInServer() as server:
+        output_data = run_test_flow(base_url=server.open_data_url)
+        assert server.requests_by_path["/open-data/forecast/meteorology/cities/daily/1030300.json"] == 1
+
+    assert output_data is not None
+    assert output_data["location_name"] == "Braga"
+    assert output_data["weather_description"] and output_data["weather_description"] != "N/A"
+    assert "Total de locais disponíveis: 35" in capsys.readouterr().out
 
 if __name__ == "__main__":
     # Garantir que o diretório do projeto está no PYTHONPATH
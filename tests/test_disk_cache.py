@@ -0,0 +1,73 @@
+# test_disk_cache.py
+"""
+Testes da cache persistente em disco (`models/disk_cache.py`) e do arranque
+a frio da `IPMAApi` a partir dela.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.disk_cache import DiskCache
+from models.ipma_api import FORECAST_DISK_MAX_AGE, IPMAApi
+from tools.ipma_standin import IPMAStandInServer
+
+
+def test_disk_cache_round_trip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set("chave", {"data": ["Évora"]}, fetched_at=123.0, etag='"abc"')
+    entry = cache.get("chave")
+    assert (entry.payload, entry.fetched_at, entry.etag, entry.last_modified) == ({"data": ["Évora"]}, 123.0, '"abc"', None)
+    assert cache.get("outra") is None
+
+    assert cache.prune(max_age=60) == 1
+    assert cache.get("chave") is None
+    cache.close()
+
+
+def test_ipma_api_prunes_old_forecasts_at_startup(tmp_path):
+    disk_cache = DiskCache(str(tmp_path))
+    api = IPMAApi(disk_cache=disk_cache)
+    old_key = f"{api.base_url_daily_forecast}1110600.json"
+    recent_key = f"{api.base_url_daily_forecast}1131200.json"
+    disk_cache.set(old_key, {"data": []}, fetched_at=time.time() - FORECAST_DISK_MAX_AGE - 60)
+    disk_cache.set(recent_key, {"data": []})
+    disk_cache.set(api.locations_url, {"data": []}, fetched_at=time.time() - FORECAST_DISK_MAX_AGE - 60)
+
+    IPMAApi(disk_cache=disk_cache)
+    assert disk_cache.get(old_key) is None
+    assert disk_cache.get(recent_key) is not None
+    # Os dados de referência não são previsões e ficam
+    assert disk_cache.get(api.locations_url) is not None
+
+
+def test_cold_start_reads_reference_data_from_disk(tmp_path, make_api):
+    with IPMAStandInServer() as server:
+        warm = make_api(server, disk_cache=DiskCache(str(tmp_path)))
+        locations = warm.get_locations_map()
+        warm.get_weather_type_descriptions()
+        warm.get_daily_forecast("1110600")
+        assert server.requests_served == 3
+
+        # Novo processo: tudo é lido do disco, sem pedidos à rede
+        cold = make_api(server, disk_cache=DiskCache(str(tmp_path)))
+        assert cold.get_locations_map() == locations
+        assert cold.get_weather_type_descriptions()[1] == "Céu limpo"
+        assert cold.get_daily_forecast("1110600")["globalIdLocal"] == 1110600
+        assert server.requests_served == 3
+
+
+def test_stale_reference_data_is_revalidated_in_background(tmp_path, make_api, wait_for):
+    with IPMAStandInServer() as server:
+        disk_cache = DiskCache(str(tmp_path))
+        api = make_api(server, disk_cache=disk_cache)
+        disk_cache.set(api.locations_url, {"data": [{"globalIdLocal": 1, "local": "Antigo"}]},
+                       fetched_at=time.time() - 2 * api.reference_max_age)
+
+        # Responde de imediato com a cópia local...
+        assert api.get_locations_map() == {"1": "Antigo"}
+        # ...e atualiza-a quando a resposta da API chega
+        assert wait_for(lambda: api.get_locations_map().get("1110600") == "Lisboa")
+        assert wait_for(lambda: disk_cache.get(api.locations_url).fetched_at > time.time() - 60)
@@ -0,0 +1,60 @@
+# test_forecast_cache.py
+"""
+Testes da cache de previsões (`models/forecast_cache.py`) e da sua
+utilização pela `IPMAApi`.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.forecast_cache import ForecastCache
+from tools.ipma_standin import IPMAStandInServer
+
+
+class FakeClock:
+    """Relógio controlado manualmente."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ForecastCache(ttl=60, clock=clock)
+    cache.set("1110600", {"data": []})
+
+    clock.now = 59
+    assert cache.get("1110600") == {"data": []}
+    clock.now = 60
+    assert cache.get("1110600") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ForecastCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a") # "b" passa a ser a menos usada
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ipma_api_serves_repeated_forecasts_from_cache(make_api):
+    with IPMAStandInServer() as server:
+        api = make_api(server)
+        first = api.get_daily_forecast("1110600")
+        second = api.get_daily_forecast(1110600)
+        batch = api.get_daily_forecasts(["1110600", "1131200"])
+
+        assert first is second is batch["1110600"]["data"]
+        assert server.requests_served == 2 # 1110600 uma vez + 1131200
+        assert api.forecast_cache.stats()["hits"] == 2
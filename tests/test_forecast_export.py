@@ -0,0 +1,87 @@
+# test_forecast_export.py
+"""
+Testes da exportação em lote sem interface gráfica (`python main.py export`).
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from controllers.forecast_export import export_forecasts, export_beach_forecasts, EXPORT_FIELDS, BEACH_EXPORT_FIELDS
+from models.beach_catalogue import DEFAULT_CATALOGUE_PATH
+
+# Porta onde nada escuta: todos os pedidos falham de imediato
+UNREACHABLE_URL = "http://127.0.0.1:9/open-data/"
+
+
+def test_export_all_locations_as_jsonl(standin, make_controller):
+    controller = make_controller(standin)
+    out = io.StringIO()
+    stats = export_forecasts(controller, out, fmt="jsonl")
+
+    lines = out.getvalue().splitlines()
+    assert stats["locations"] == 35 and stats["failed"] == 0
+    assert stats["records"] == len(lines) == 35 * 5
+    assert stats["locations_per_second"] > 0
+    record = json.loads(lines[0])
+    assert tuple(record) == EXPORT_FIELDS
+    assert record["weather_description"] != "N/A"
+
+
+def test_export_filtered_locations_as_csv(standin, make_controller):
+    controller = make_controller(standin)
+    out = io.StringIO()
+    stats = export_forecasts(controller, out, fmt="csv", locations=["Lisboa", "1131200", "Atlântida"], max_days=2)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert stats["locations"] == 2 # "Atlântida" não existe e é ignorada
+    assert len(rows) == 4
+    assert {row["location_name"] for row in rows} == {"Lisboa", "Porto"}
+
+
+
+def test_export_beach_forecasts_as_csv(standin, make_controller):
+    from models.beach_catalogue import BeachCatalogue
+
+    controller = make_controller(standin)
+    out = io.StringIO()
+    catalogue = BeachCatalogue.load()
+    stats = export_beach_forecasts(controller, catalogue, out, fmt="csv", max_days=1)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert tuple(rows[0]) == BEACH_EXPORT_FIELDS
+    assert stats["records"] == len(rows) == len(catalogue) - stats["failed"]
+    assert stats["network_calls_saved"] > 0
+
+
+def test_export_descriptions_match_the_day_view(standin, make_controller):
+    controller = make_controller(standin)
+    assert controller.set_location_by_name("Lisboa") and controller.fetch_and_display_forecast()
+    series = controller.get_current_forecast_series()
+    weather, wind = controller.describe_series(series)
+    for index in range(len(series)):
+        day = controller.get_forecast_day(index)
+        assert (day["weather_description"], day["wind_speed_description"]) == (weather[index], wind[index])
+
+
+def test_export_with_nothing_exported_exits_non_zero(standin, tmp_path, capsys):
+    # Nenhum local reconhecido: zero locais, zero falhas, mas nada exportado
+    status = main.run_application(["export", "--no-disk-cache", "--ipma-url", standin.open_data_url,
+                                   "--locations", "Atlântida", "--output", str(tmp_path / "vazio.jsonl")])
+    assert status == 1
+    assert "Exportadas 0 linhas de 0 locais" in capsys.readouterr().err
+
+    # Servidor inacessível: os locais nem chegam a carregar
+    status = main.run_application(["export", "--no-disk-cache", "--ipma-url", UNREACHABLE_URL,
+                                   "--output", str(tmp_path / "offline.jsonl")])
+    assert status == 1
+
+    status = main.run_application(["export", "--no-disk-cache", "--ipma-url", UNREACHABLE_URL,
+                                   "--beaches", DEFAULT_CATALOGUE_PATH, "--output", str(tmp_path / "praias.csv")])
+    assert status == 1
+    assert "Exportadas 0 linhas de" in capsys.readouterr().err
@@ -0,0 +1,75 @@
+# test_forecast_series.py
+"""
+Testes da `ForecastSeries` (previsão de vários dias em colunas) e do `ForecastRecord`.
+"""
+
+import json
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from models.forecast_record import ForecastRecord, RECORD_FIELDS
+from models.forecast_series import ForecastSeries, MISSING_VALUE
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'forecast-daily-1110600.json')
+
+
+def load_fixture():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_columns_cover_every_day():
+    raw = load_fixture()
+    series = ForecastSeries.from_payload(raw, "Lisboa")
+
+    assert len(series) == len(raw["data"]) == 5
+    assert series.location_id == raw["globalIdLocal"]
+    assert series.dates == [day["forecastDate"] for day in raw["data"]]
+    assert list(series.temp_max) == [float(day["tMax"]) for day in raw["data"]]
+    assert list(series.weather_ids) == [day["idWeatherType"] for day in raw["data"]]
+    assert series.index_of(raw["data"][2]["forecastDate"]) == 2
+    assert series.index_of("1999-01-01") is None
+
+
+def test_day_view_matches_single_day_format():
+    raw = load_fixture()
+    first = raw["data"][0]
+    day = ForecastSeries.from_payload(raw, "Lisboa").day(0)
+
+    assert day["location_name"] == "Lisboa"
+    assert day["forecast_date"] == first["forecastDate"]
+    assert day["temp_min"] == float(first["tMin"])
+    assert day["weather_id"] == first["idWeatherType"]
+    assert day["wind_speed_class"] == first["classWindSpeed"]
+    assert day["wind_dir"] == first["predWindDir"]
+
+
+def test_missing_fields_become_sentinels():
+    series = ForecastSeries.from_payload({"data": [{"forecastDate": "2025-08-05", "tMin": "x"}]}, "Teste", "1")
+    assert math.isnan(series.temp_min[0])
+    day = series.day(0)
+    assert day["temp_min"] == MISSING_VALUE
+    assert day["weather_id"] is None
+    assert day["wind_speed_class"] == MISSING_VALUE
+    assert ForecastSeries.from_payload({"data": []}) is None
+
+
+def test_day_is_a_slotted_record_with_dict_access():
+    day = ForecastSeries.from_payload(load_fixture(), "Lisboa", "1110600").day(1)
+    assert isinstance(day, ForecastRecord)
+    assert not hasattr(day, "__dict__")
+    assert day.day_index == 1 and day["location_id"] == 1110600
+    assert day.get("weather_description", "N/A") is None # Ainda não traduzido
+    assert day.get("inexistente", "N/A") == "N/A"
+    day["weather_description"] = "Céu limpo"
+    assert day.to_dict()["weather_description"] == "Céu limpo"
+    assert tuple(day.to_dict()) == RECORD_FIELDS
+    with pytest.raises(KeyError):
+        day["inexistente"]
+    with pytest.raises(AttributeError):
+        day.extra = 1
@@ -0,0 +1,50 @@
+# test_geo_index.py
+"""
+Testes do `GeoIndex` (local mais próximo e locais dentro de um raio).
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.geo_index import GeoIndex, haversine_km
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'distrits-islands.json')
+
+
+def load_index():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return GeoIndex.from_locations_payload(json.load(f))
+
+
+def test_haversine_known_distance():
+    # Lisboa -> Porto: cerca de 274 km em linha reta
+    assert 270 < haversine_km(38.7223, -9.1393, 41.1579, -8.6291) < 278
+
+
+def test_nearest_and_within_on_ipma_locations():
+    index = load_index()
+    assert len(index) == 35
+    nearest = index.nearest(38.6979, -9.4215) # Praia de Cascais
+    assert [match.name for match in nearest] == ["Lisboa"]
+    assert index.nearest(38.6979, -9.4215, max_distance_km=5) == []
+    assert index.coordinates("1110600") is not None
+
+    within = index.within(38.7660, -9.1286, 60)
+    assert [match.name for match in within][:2] == ["Lisboa", "Setúbal"]
+    assert all(match.distance_km <= 60 for match in within)
+
+
+def test_grid_search_matches_brute_force():
+    rng = random.Random(3)
+    points = [(i, f"p{i}", rng.uniform(32, 42), rng.uniform(-31, -6)) for i in range(1500)]
+    index = GeoIndex(points, cell_size_deg=0.25)
+    for _ in range(200):
+        lat, lon, k = rng.uniform(30, 44), rng.uniform(-33, -4), rng.randint(1, 4)
+        expected = sorted(haversine_km(lat, lon, p[2], p[3]) for p in points)
+        assert [round(m.distance_km, 9) for m in index.nearest(lat, lon, k)] == [round(d, 9) for d in expected[:k]]
+        radius = rng.uniform(5, 120)
+        assert len(index.within(lat, lon, radius)) == sum(1 for d in expected if d <= radius)
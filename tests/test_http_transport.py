@@ -0,0 +1,50 @@
+# test_http_transport.py
+"""
+Testes da camada de transporte HTTP (`models/http_transport.py`) contra o
+servidor local que imita o IPMA (`tools/ipma_standin.py`).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import requests
+
+from models.http_transport import HttpTransport
+from models.ipma_api import IPMAApi
+from tools.ipma_standin import IPMAStandInServer
+
+
+def test_transport_reuses_connection(standin):
+    """Pedidos sucessivos pela mesma sessão devem usar uma única ligação TCP."""
+    transport = HttpTransport()
+    url = f"{standin.open_data_url}weather-type-classe.json"
+    for _ in range(10):
+        assert transport.get(url).status_code == 200
+    transport.close()
+
+    assert standin.requests_served == 10
+    assert standin.connections_opened == 1
+
+
+def test_transport_applies_read_timeout():
+    """O timeout de leitura configurado deve ser aplicado a todos os pedidos."""
+    with IPMAStandInServer(latency=0.5) as server:
+        transport = HttpTransport(read_timeout=0.1)
+        with pytest.raises(requests.exceptions.Timeout):
+            transport.get(f"{server.open_data_url}weather-type-classe.json")
+        transport.close()
+
+
+def test_ipma_api_shares_transport_between_endpoints(standin):
+    """Os três endpoints da IPMAApi devem partilhar o mesmo pool de ligações."""
+    api = IPMAApi(base_url=standin.open_data_url)
+
+    assert api.get_locations_map()["1110600"] == "Lisboa"
+    assert api.get_weather_type_descriptions()[1] == "Céu limpo"
+    assert api.get_daily_forecast("1110600")["globalIdLocal"] == 1110600
+    api.close()
+
+    assert standin.connections_opened == 1
@@ -0,0 +1,119 @@
+# test_ipma_api.py
+"""
+Testes da `IPMAApi` contra o servidor local que imita o IPMA
+(`tools/ipma_standin.py`), sem depender da rede.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from tools.ipma_standin import IPMAStandInServer
+
+
+def test_get_daily_forecasts_reports_per_id_errors(standin, make_api):
+    api = make_api(standin)
+    results = api.get_daily_forecasts(["1110600", "9999999", "1110600", "1131200"])
+
+    assert list(results) == ["1110600", "9999999", "1131200"]
+    assert results["1110600"]["error"] is None
+    assert results["1110600"]["data"]["globalIdLocal"] == 1110600
+    assert results["9999999"]["data"] is None
+    assert "404" in results["9999999"]["error"]
+    assert standin.requests_served == 3
+
+
+def test_get_daily_forecasts_runs_concurrently(make_api):
+    """Todos os locais devem demorar perto de um único pedido, não a soma de todos."""
+    latency = 0.2
+    with IPMAStandInServer(latency=latency) as server:
+        api = make_api(server)
+        ids = list(api.get_locations_map())
+
+        start = time.perf_counter()
+        results = api.get_daily_forecasts(ids)
+        elapsed = time.perf_counter() - start
+
+    assert len(results) == len(ids) == 35
+    assert all(result["error"] is None for result in results.values())
+    assert elapsed < latency * 3
+
+
+def test_stale_forecast_is_revalidated_with_conditional_request(standin, make_api):
+    api = make_api(standin)
+    first = api.get_daily_forecast("1110600")
+    api.forecast_cache.clear() # Simula a expiração da validade
+
+    second = api.get_daily_forecast("1110600")
+
+    assert second is first # Payload reutilizado, sem novo parse
+    assert standin.not_modified_served == 1
+    assert api.get_revalidation_stats() == {"not_modified": 1, "full_downloads": 1}
+
+
+def test_reference_data_revalidation_uses_stored_validators(standin, tmp_path, make_api):
+    from models.disk_cache import DiskCache
+
+    make_api(standin, disk_cache=DiskCache(str(tmp_path))).get_locations_map()
+
+    # Novo processo: os validadores vêm do disco e a revalidação é um 304
+    api = make_api(standin, disk_cache=DiskCache(str(tmp_path)))
+    data = api._download_json(api.locations_url)
+
+    assert data["data"][0]["local"] == "Aveiro"
+    assert api.get_revalidation_stats() == {"not_modified": 1, "full_downloads": 0}
+
+
+def test_concurrent_requests_for_same_url_are_coalesced(make_api):
+    import threading
+
+    with IPMAStandInServer(latency=0.2) as server:
+        api = make_api(server)
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(api.get_daily_forecast("1110600"))
+            results.append(api.get_locations_map())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert server.requests_by_path == {
+            "/open-data/forecast/meteorology/cities/daily/1110600.json": 1,
+            "/open-data/distrits-islands.json": 1,
+        }
+        assert len({id(result) for result in results}) == 2 # Um único objeto por recurso
+        assert api.get_single_flight_stats()["shared"] > 0
+
+
+def test_reference_data_is_streamed_with_only_the_needed_fields(standin, tmp_path, make_api):
+    from models.disk_cache import DiskCache
+
+    api = make_api(standin, disk_cache=DiskCache(str(tmp_path)))
+    assert api.get_locations_map()["1110600"] == "Lisboa"
+    assert api.get_geo_index().coordinates("1110600") is not None
+    assert api.get_weather_type_descriptions()[1] == "Céu limpo"
+    stored = api.disk_cache.get(api.locations_url).payload
+    assert set(stored["data"][0]) <= {"globalIdLocal", "local", "latitude", "longitude"}
+    assert stored["owner"] == "IPMA"
+
+
+def test_iter_forecasts_for_day_streams_every_location(make_api):
+    with IPMAStandInServer(bulk_scale=3) as server:
+        api = make_api(server)
+        metadata = {}
+        records = list(api.iter_forecasts_for_day(1, fields=("globalIdLocal", "tMax"), metadata=metadata))
+        assert len(records) == 35 * 3
+        assert set(records[0]) == {"globalIdLocal", "tMax"}
+        assert metadata["forecastDate"] == "2025-08-06"
+        with pytest.raises(Exception):
+            list(api.iter_forecasts_for_day(99))
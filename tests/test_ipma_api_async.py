@@ -0,0 +1,72 @@
+# test_ipma_api_async.py
+"""
+Testes da `AsyncIPMAApi` contra o servidor local que imita o IPMA,
+incluindo a equivalência dos resultados com a `IPMAApi` síncrona.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.ipma_api import IPMAApi
+from models.ipma_api_async import AsyncIPMAApi
+from tools.ipma_standin import IPMAStandInServer
+
+
+def test_async_api_returns_same_shapes_as_sync(standin):
+    sync_api = IPMAApi(base_url=standin.open_data_url)
+
+    async def run():
+        async with AsyncIPMAApi(base_url=standin.open_data_url) as api:
+            return (await api.get_locations_map(),
+                    await api.get_weather_type_descriptions(),
+                    await api.get_daily_forecast("1110600"),
+                    await api.get_daily_forecast("9999999"))
+
+    locations, weather_types, forecast, missing = asyncio.run(run())
+
+    assert locations == sync_api.get_locations_map()
+    assert weather_types == sync_api.get_weather_type_descriptions()
+    assert forecast == sync_api.get_daily_forecast("1110600")
+    assert missing is None
+
+
+def test_async_batch_shares_one_pool():
+    latency = 0.2
+    with IPMAStandInServer(latency=latency) as server:
+        async def run():
+            async with AsyncIPMAApi(base_url=server.open_data_url) as api:
+                ids = list(await api.get_locations_map())
+                start = time.perf_counter()
+                first = await api.get_daily_forecasts(ids)
+                elapsed = time.perf_counter() - start
+                second = await api.get_daily_forecasts(ids)
+                return ids, first, second, elapsed, api.pool.connections_opened
+
+        ids, first, second, elapsed, connections = asyncio.run(run())
+
+    assert len(first) == len(ids) == 35
+    assert all(result["error"] is None for result in first.values())
+    assert first == second
+    assert elapsed < latency * 3
+    # A segunda ronda reutiliza as ligações abertas na primeira
+    assert connections == server.connections_opened <= len(ids) + 1
+
+
+def test_failed_reference_load_is_retried_after_the_interval(standin):
+    async def run(retry_interval):
+        async with AsyncIPMAApi(base_url=standin.open_data_url, reference_retry_interval=retry_interval) as api:
+            standin.fail_next(1)
+            first = await api.get_locations_map()
+            served = standin.requests_served
+            second = await api.get_locations_map()
+            return first, second, standin.requests_served - served
+
+    # Dentro do intervalo: o mapa vazio é devolvido sem novo pedido
+    assert asyncio.run(run(3600)) == ({}, {}, 0)
+    # Passado o intervalo: nova tentativa, que já tem sucesso
+    first, second, requests = asyncio.run(run(0))
+    assert first == {} and len(second) == 35 and requests == 1
@@ -0,0 +1,47 @@
+# test_ipma_standin.py
+"""
+Testes do servidor local que imita o IPMA (`tools/ipma_standin.py`): gravação
+e reprodução de fixtures, tamanho das respostas e URL base da `IPMAApi`.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.ipma_api import BASE_URL_ENV, DEFAULT_BASE_URL, IPMAApi, resolve_base_url
+from tools.ipma_standin import IPMAStandInServer, record_fixtures
+
+
+def test_recorded_fixtures_are_replayed(tmp_path):
+    with IPMAStandInServer(forecast_days=3) as upstream:
+        written = record_fixtures(str(tmp_path), upstream.open_data_url, ["1131200"], delay=0)
+    assert written == ["distrits-islands.json", "weather-type-classe.json", "forecast-daily-1131200.json"]
+
+    with IPMAStandInServer(fixtures_dir=str(tmp_path)) as replay:
+        api = IPMAApi(base_url=replay.open_data_url)
+        assert api.get_locations_map()["1131200"] == "Porto"
+        porto = api.get_daily_forecast("1131200")
+        assert porto == json.loads((tmp_path / "forecast-daily-1131200.json").read_bytes())
+        assert len(porto["data"]) == 3
+        # Locais sem previsão gravada: gerada a partir da gravada (não há a de Lisboa)
+        assert api.get_daily_forecast("1110600")["globalIdLocal"] == 1110600
+
+
+def test_forecast_days_controls_the_payload_size():
+    with IPMAStandInServer(forecast_days=10) as server:
+        status, body = server.resolve("/open-data/forecast/meteorology/cities/daily/1110600.json")
+        days = json.loads(body)["data"]
+    assert status == 200 and len(days) == 10
+    assert days[5]["forecastDate"] == "2025-08-10" # Datas seguidas, sem repetir
+
+
+def test_base_url_from_argument_or_environment(monkeypatch):
+    monkeypatch.delenv(BASE_URL_ENV, raising=False)
+    assert resolve_base_url() == DEFAULT_BASE_URL
+    monkeypatch.setenv(BASE_URL_ENV, "http://127.0.0.1:8765/open-data")
+    api = IPMAApi()
+    assert api.locations_url == "http://127.0.0.1:8765/open-data/distrits-islands.json"
+    assert IPMAApi(base_url="http://localhost/x/").base_url_daily_forecast == \
+        "http://localhost/x/forecast/meteorology/cities/daily/"
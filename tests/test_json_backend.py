@@ -0,0 +1,38 @@
+# test_json_backend.py
+"""Testes da camada de (de)serialização JSON (`models/json_backend.py`)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from models import json_backend
+
+PAYLOAD = {"local": "Évora", "data": [{"tMin": "16.4", "idWeatherType": 3, "ok": True, "x": None}], "n": 1.5}
+
+
+@pytest.fixture
+def restore_backend():
+    backend = json_backend.get_backend()
+    yield
+    json_backend.set_backend(backend.name)
+
+
+@pytest.mark.parametrize("name", json_backend.available_backends())
+def test_every_installed_backend_round_trips_the_same_data(name, restore_backend):
+    json_backend.set_backend(name)
+    text = json_backend.dumps(PAYLOAD)
+    assert isinstance(text, str) and "Évora" in text
+    assert json_backend.loads(text) == PAYLOAD
+    assert json_backend.loads(text.encode("utf-8")) == PAYLOAD
+    with pytest.raises(ValueError):
+        json_backend.loads(b'{"data": [')
+
+
+def test_stdlib_is_always_available_and_unknown_backends_are_rejected(restore_backend):
+    assert json_backend.available_backends()[-1] == "json"
+    assert json_backend.get_backend().name in json_backend.available_backends()
+    with pytest.raises(ValueError):
+        json_backend.set_backend("simdjson")
@@ -0,0 +1,51 @@
+# test_json_stream.py
+"""Testes da descodificação incremental de JSON (`models/json_stream.py`)."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from models.json_stream import iter_json_array, load_json_stream
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'distrits-islands.json')
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_stream_matches_json_loads_for_any_chunk_size():
+    with open(FIXTURE, 'rb') as f:
+        body = f.read()
+    expected = json.loads(body)
+    for size in (1, 2, 7, 64, len(body)):
+        metadata = {}
+        items = list(iter_json_array(chunked(body, size), metadata=metadata))
+        assert items == expected["data"]
+        assert metadata == {key: value for key, value in expected.items() if key != "data"}
+
+
+def test_fields_projection_and_utf8_split_across_chunks():
+    body = json.dumps({"owner": "IPMA", "data": [{"local": "Évora", "id": 1, "x": [1, 2]}, {"local": "Bragança"}],
+                       "count": 12345}, ensure_ascii=False).encode("utf-8")
+    payload = load_json_stream(chunked(body, 1), fields=("local", "id"))
+    assert payload == {"owner": "IPMA", "count": 12345, "data": [{"local": "Évora", "id": 1}, {"local": "Bragança"}]}
+    assert list(iter_json_array([" [1, 2.5, ", "\"a\"] "])) == [1, 2.5, "a"]
+    assert list(iter_json_array(['{"data": []}'])) == []
+
+
+def test_records_are_yielded_before_the_body_ends():
+    def chunks():
+        yield b'{"data": [{"a": 1}, '
+        raise AssertionError("o primeiro registo deve chegar antes do resto do corpo")
+    assert next(iter_json_array(chunks())) == {"a": 1}
+
+
+@pytest.mark.parametrize("body", ['{"data": [1, 2', '{"data": [1 2]}', '{"data": []} x', 'nul', ''])
+def test_invalid_or_truncated_json_raises_value_error(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
@@ -0,0 +1,46 @@
+# test_location_index.py
+"""
+Testes do `LocationIndex` (pesquisa de locais sem acentos, por prefixo e aproximada).
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.location_index import LocationIndex, fold
+
+LOCATIONS = {
+    "Lisboa": "1110600", "Porto": "1131200", "Porto Santo": "3510500", "Portimão": "1081100",
+    "Évora": "1070500", "Bragança": "1040200", "Braga": "1030300", "Ponta Delgada": "3420300",
+    "Vila do Porto": "3470100", "Setúbal": "1151200",
+}
+
+
+def test_fold_removes_accents_case_and_punctuation():
+    assert fold("  São  Jorge! ") == "sao jorge"
+    assert fold("ÉVORA") == fold("evora")
+
+
+def test_lookup_ignores_accents_case_spaces_and_qualifiers():
+    index = LocationIndex(LOCATIONS)
+    assert index.lookup("lisboa ") == ("Lisboa", "1110600")
+    assert index.lookup("EVORA") == ("Évora", "1070500")
+    assert index.lookup("Ponta Delgada (Açores)") == ("Ponta Delgada", "3420300")
+    assert index.lookup("Lisbao") is None
+
+
+def test_resolve_tolerates_typos():
+    index = LocationIndex(LOCATIONS)
+    assert index.resolve("Lisbao") == ("Lisboa", "1110600")
+    assert index.resolve("Bragansa") == ("Bragança", "1040200")
+    assert index.resolve("Xpto") is None
+
+
+def test_search_by_prefix_and_word_prefix():
+    index = LocationIndex(LOCATIONS)
+    assert index.search("port") == ["Portimão", "Porto", "Porto Santo", "Vila do Porto"]
+    assert index.search("delg") == ["Ponta Delgada"]
+    assert index.search("set") == ["Setúbal"]
+    assert index.search("port", limit=2) == ["Portimão", "Porto"]
+    assert len(index.search("")) == len(LOCATIONS)
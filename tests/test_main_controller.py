@@ -0,0 +1,158 @@
+# test_main_controller.py
+"""
+Testes do `MainController` contra o servidor local que imita o IPMA,
+sem depender da rede nem de uma janela Tkinter.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.ipma_standin import IPMAStandInServer
+
+
+def test_construction_does_not_wait_for_locations(make_controller):
+    with IPMAStandInServer(latency=0.5) as server:
+        start = time.perf_counter()
+        controller = make_controller(server)
+        controller.start_loading_locations()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.25
+        assert not controller.are_locations_loaded()
+
+        loaded = []
+        controller.start_loading_locations(on_loaded=loaded.append)
+        assert controller.wait_for_locations(timeout=5)
+        assert len(controller.get_available_location_names()) == 35
+        assert len(loaded) == 1 and "Lisboa" in loaded[0]
+
+
+def test_set_location_by_name_waits_for_background_load(standin, make_controller):
+    controller = make_controller(standin)
+    assert controller.set_location_by_name("Lisboa")
+    assert controller.current_location_id == "1110600"
+    assert standin.requests_by_path["/open-data/distrits-islands.json"] == 1
+
+
+def test_set_location_by_name_does_not_wait_long_for_a_slow_first_load(make_controller):
+    with IPMAStandInServer(latency=1.5) as server:
+        controller = make_controller(server)
+        start = time.perf_counter()
+        assert not controller.set_location_by_name("Lisboa", timeout=0.2)
+        assert time.perf_counter() - start < 0.5
+        assert controller.current_location_id is None
+        assert controller.set_location_by_name("Lisboa", timeout=None)
+        assert controller.current_location_id == "1110600"
+
+
+def test_fetch_forecast_async_delivers_on_worker_thread(standin, make_controller):
+    controller = make_controller(standin)
+    assert controller.set_location_by_name("Lisboa")
+
+    results = []
+    done = threading.Event()
+    def on_done(success, data, request_id):
+        results.append((success, data, request_id, threading.current_thread() is threading.main_thread()))
+        done.set()
+
+    request_id = controller.fetch_forecast_async(on_done)
+    assert done.wait(5)
+    success, data, delivered_id, on_main_thread = results[0]
+    assert success and delivered_id == request_id and not on_main_thread
+    assert data["location_name"] == "Lisboa"
+    assert controller.get_current_weather_data() == data
+    controller.shutdown()
+
+
+def test_changing_location_drops_stale_forecast(make_controller):
+    with IPMAStandInServer(latency=0.2) as server:
+        controller = make_controller(server)
+        assert controller.set_location_by_name("Lisboa")
+
+        results = []
+        done = threading.Event()
+        def on_done(success, data, request_id):
+            results.append((data["location_name"], request_id))
+            done.set()
+
+        controller.fetch_forecast_async(on_done)
+        assert controller.set_location_by_name("Porto") # Cancela o pedido de Lisboa
+        porto_request = controller.fetch_forecast_async(on_done)
+
+        assert done.wait(5)
+        time.sleep(0.3) # Dá tempo ao pedido de Lisboa para terminar (e ser descartado)
+        assert results == [("Porto", porto_request)]
+        assert controller.get_current_weather_data()["location_name"] == "Porto"
+        controller.shutdown()
+
+
+def test_unknown_location_name_drops_stale_forecast(make_controller):
+    with IPMAStandInServer(latency=0.2) as server:
+        controller = make_controller(server)
+        assert controller.set_location_by_name("Lisboa")
+
+        results = []
+        controller.fetch_forecast_async(lambda success, data, request_id: results.append(request_id))
+        assert not controller.set_location_by_name("Atlântida") # Também cancela o pedido de Lisboa
+
+        time.sleep(0.5) # Dá tempo ao pedido de Lisboa para terminar (e ser descartado)
+        assert results == []
+        assert controller.current_location_id is None
+        controller.shutdown()
+
+
+def test_forecast_keeps_every_day(standin, make_controller):
+    controller = make_controller(standin)
+    assert controller.set_location_by_name("Lisboa")
+    assert controller.fetch_and_display_forecast()
+
+    first = controller.get_current_weather_data()
+    series = controller.get_current_forecast_series()
+    assert len(series) == 5
+    assert first["forecast_date"] == series.dates[0]
+    assert first["weather_description"] != "N/A"
+
+    last = controller.get_forecast_day(4)
+    assert last["forecast_date"] == series.dates[4]
+    assert last["forecast_series"] is series
+    assert controller.get_forecast_day(5) is None
+
+
+def test_set_location_by_name_is_accent_case_and_typo_tolerant(standin, make_controller):
+    controller = make_controller(standin)
+    assert controller.set_location_by_name("evora")
+    assert controller.current_location_name == "Évora"
+    assert controller.set_location_by_name("Ponta Delgada (Açores)")
+    assert controller.current_location_name == "Ponta Delgada"
+    assert controller.set_location_by_name("Lisbao")
+    assert controller.current_location_id == "1110600"
+    assert controller.search_location_names("vila")[:2] == ["Vila do Corvo", "Vila do Porto"]
+
+
+def test_find_nearest_location_uses_ipma_coordinates(standin, make_controller):
+    controller = make_controller(standin)
+    nearest = controller.find_nearest_location(41.1496, -8.6765, k=2) # Praia de Matosinhos
+    assert nearest[0].name == "Porto"
+    assert len(nearest) == 2 and nearest[0].distance_km < nearest[1].distance_km
+    assert {match.name for match in controller.find_locations_within(37.0176, -7.9304, 30)} >= {"Faro", "Loulé"}
+    assert standin.requests_by_path["/open-data/distrits-islands.json"] == 1
+
+
+def test_beach_forecasts_fetch_each_location_once(standin, make_controller):
+    from models.beach_catalogue import BeachCatalogue
+
+    controller = make_controller(standin)
+    catalogue = BeachCatalogue.load()
+    results, stats = controller.get_beach_forecasts(catalogue, max_workers=8)
+
+    forecast_paths = [path for path in standin.requests_by_path if "/forecast/" in path]
+    assert stats["beaches"] == len(catalogue) == len(results)
+    assert stats["distinct_locations"] == len(forecast_paths) < len(catalogue)
+    assert stats["network_calls_saved"] == len(catalogue) - stats["unassigned"] - len(forecast_paths)
+    assert all(count == 1 for path, count in standin.requests_by_path.items() if "/forecast/" in path)
+    matosinhos = next(result for result in results if result["beach"].name == "Praia de Matosinhos")
+    assert matosinhos["location_name"] == "Porto" and len(matosinhos["forecast_series"]) > 0
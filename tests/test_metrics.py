@@ -0,0 +1,120 @@
+# test_metrics.py
+"""
+Testes das métricas de desempenho (`models/metrics.py`) e da instrumentação
+da `IPMAApi` e do `MainController` contra o servidor local.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+import main
+from models import metrics
+from models.http_transport import HttpTransport
+from models.metrics import MetricsRegistry, _NULL_TIMER
+from models.rate_limiter import FORECAST_FAMILY, RateLimiter
+
+
+@pytest.fixture
+def global_metrics():
+    """Liga o registo global durante o teste e repõe-no desligado no fim."""
+    metrics.registry.reset()
+    metrics.enable()
+    yield metrics.registry
+    metrics.disable()
+    metrics.registry.reset()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry()
+    assert registry.timer("x") is _NULL_TIMER
+
+    @registry.timed("decorated")
+    def work(value):
+        return value * 2
+
+    with registry.timer("x"):
+        registry.increment("hits")
+    registry.observe("y", 0.5)
+    assert work(21) == 42
+    assert registry.snapshot() == {"counters": {}, "timers": {}}
+    assert registry.to_prometheus() == ""
+
+
+def test_enabled_registry_exports_counters_and_timers(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    registry.increment("cache_hits")
+    registry.increment("cache_hits", 2)
+    registry.observe("network", 0.25)
+    registry.observe("network", 0.75)
+    with registry.timer("decode"):
+        pass
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"cache_hits": 3}
+    network = snapshot["timers"]["network"]
+    assert (network["count"], network["total_seconds"], network["avg_seconds"]) == (2, 1.0, 0.5)
+    assert (network["min_seconds"], network["max_seconds"]) == (0.25, 0.75)
+    assert snapshot["timers"]["decode"]["count"] == 1
+
+    text = registry.to_prometheus()
+    assert "# TYPE guia_praias_cache_hits_total counter\nguia_praias_cache_hits_total 3\n" in text
+    assert "guia_praias_network_seconds_count 2\n" in text
+    assert "guia_praias_network_seconds_sum 1.000000000\n" in text
+    assert "guia_praias_network_seconds_max 0.750000000\n" in text
+
+    registry.dump(str(tmp_path / "metrics.json"))
+    registry.dump(str(tmp_path / "metrics.prom"))
+    with open(tmp_path / "metrics.json", encoding="utf-8") as f:
+        assert json.load(f)["counters"] == {"cache_hits": 3}
+    assert (tmp_path / "metrics.prom").read_text(encoding="utf-8") == text
+
+
+def test_controller_records_every_stage(standin, global_metrics, make_controller):
+    controller = make_controller(standin)
+    try:
+        controller.wait_for_locations()
+        assert controller.set_location_by_name("Lisboa")
+        assert controller.fetch_and_display_forecast()
+        assert controller.fetch_and_display_forecast() # Segunda vez: servida da cache
+    finally:
+        controller.shutdown()
+
+    snapshot = global_metrics.snapshot()
+    for name in ("ipma_network", "ipma_json_decode", "ipma_get_daily_forecast", "ipma_reference_load",
+                 "forecast_request", "forecast_processing", "fetch_and_display_forecast"):
+        assert snapshot["timers"][name]["count"] >= 1, name
+    assert snapshot["timers"]["fetch_and_display_forecast"]["count"] == 2
+    assert snapshot["counters"]["forecast_cache_misses"] == 1
+    assert snapshot["counters"]["forecast_cache_hits"] == 1
+
+
+def test_rate_limit_wait_is_not_counted_as_network_time(standin, global_metrics):
+    # Um pedido a cada 0,25 s: o segundo espera pela sua vez antes de sair
+    transport = HttpTransport(rate_limiter=RateLimiter({FORECAST_FAMILY: (4.0, 1)}))
+    url = f"{standin.open_data_url}forecast/meteorology/cities/daily/1110600.json"
+    for _ in range(2):
+        assert transport.get(url, rate_family=FORECAST_FAMILY).status_code == 200
+    transport.close()
+
+    timers = global_metrics.snapshot()["timers"]
+    assert timers["ipma_rate_limit_wait"]["count"] == 2
+    assert timers["ipma_rate_limit_wait"]["total_seconds"] > 0.2
+    assert timers["ipma_network"]["count"] == 2
+    assert timers["ipma_network"]["max_seconds"] < 0.2
+
+
+def test_metrics_out_writes_the_file_on_exit(standin, tmp_path, global_metrics):
+    metrics.disable()
+    output = tmp_path / "metrics.prom"
+    status = main.run_application(["export", "--no-disk-cache", "--ipma-url", standin.open_data_url,
+                                   "--locations", "Porto", "--output", str(tmp_path / "porto.jsonl"),
+                                   "--metrics-out", str(output)])
+    assert status == 0
+    text = output.read_text(encoding="utf-8")
+    assert "guia_praias_ipma_network_seconds_count" in text
+    assert "guia_praias_forecast_cache_misses_total 1\n" in text
@@ -0,0 +1,93 @@
+# test_prefetch_scheduler.py
+"""
+Testes do `PrefetchScheduler` (atualização das previsões em segundo plano)
+contra o servidor local que imita o IPMA.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from controllers.prefetch_scheduler import PrefetchScheduler, next_update_time
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def forecast_requests(server):
+    return sum(count for path, count in server.requests_by_path.items() if "/forecast/" in path)
+
+
+def test_refresh_is_aligned_with_ipma_publications():
+    assert next_update_time(utc(2026, 7, 1, 10, 0)) == utc(2026, 7, 1, 12, 30)
+    assert next_update_time(utc(2026, 7, 1, 12, 30)) == utc(2026, 7, 2, 0, 30)
+
+    scheduler = PrefetchScheduler(controller=None, interval=600)
+    assert scheduler.next_run_at(utc(2026, 7, 1, 10, 0)) == utc(2026, 7, 1, 10, 10)
+    assert scheduler.next_run_at(utc(2026, 7, 1, 12, 25)) == utc(2026, 7, 1, 12, 30)
+
+
+def test_cycle_warms_the_cache_within_the_rate_budget(standin, make_controller):
+    controller = make_controller(standin)
+    scheduler = PrefetchScheduler(controller, locations=["Lisboa", "Porto", "Faro"], requests_per_second=20)
+
+    stats = scheduler.run_cycle()
+    assert stats["refreshed"] == 3 and stats["failed"] == 0
+    assert stats["seconds"] >= 2 / 20 # Dois intervalos entre três pedidos
+
+    # A pesquisa do utilizador é servida da cache, sem pedido à rede
+    served = forecast_requests(standin)
+    assert controller.set_location_by_name("Porto")
+    assert controller.fetch_and_display_forecast()
+    assert forecast_requests(standin) == served
+
+
+def test_top_n_follows_the_most_requested_locations(standin, make_controller):
+    controller = make_controller(standin)
+    for name in ("Porto", "Porto", "Lisboa", "Faro"):
+        controller.set_location_by_name(name)
+        controller.fetch_and_display_forecast()
+
+    scheduler = PrefetchScheduler(controller, top_n=1)
+    porto, faro = controller.locations_map_name_to_id["Porto"], controller.locations_map_name_to_id["Faro"]
+    assert scheduler.targets() == [faro, porto] # O local atual e o mais pedido
+    assert len(PrefetchScheduler(controller).targets()) == 35
+
+
+def test_top_n_without_requests_falls_back_to_every_location(standin, capsys, make_controller):
+    import main
+
+    controller = make_controller(standin)
+    controller.wait_for_locations()
+    assert len(PrefetchScheduler(controller, top_n=3).targets()) == 35
+
+    # O processo sem interface não tem pedidos nem local atual
+    status = main.run_application(["--prefetch-top", "3", "prefetch", "--once", "--no-disk-cache",
+                                   "--rate", "1000", "--ipma-url", standin.open_data_url])
+    assert status == 0
+    assert "Atualizadas 35 de 35 previsões" in capsys.readouterr().err
+
+    # Sem locais (servidor inacessível) nada é atualizado: o ciclo único falha
+    status = main.run_application(["prefetch", "--once", "--no-disk-cache",
+                                   "--ipma-url", "http://127.0.0.1:9/open-data/"])
+    assert status == 1
+    assert "Atualizadas 0 de 0 previsões" in capsys.readouterr().err
+
+
+def test_start_and_stop(standin, make_controller):
+    controller = make_controller(standin)
+    scheduler = PrefetchScheduler(controller, locations=["Lisboa"], interval=3600)
+    scheduler.start()
+    deadline = time.monotonic() + 5
+    while scheduler.get_stats()["cycles"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert scheduler.get_stats()["refreshed"] == 1
+
+    started = time.monotonic()
+    scheduler.stop() # Interrompe a espera de uma hora
+    assert time.monotonic() - started < 1
+    assert not scheduler.is_running()
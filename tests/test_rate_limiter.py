@@ -0,0 +1,79 @@
+# test_rate_limiter.py
+"""
+Testes do limite de pedidos por segundo (`models/rate_limiter.py`) e da sua
+utilização pela `HttpTransport`/`IPMAApi` contra o servidor local.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from models.http_transport import HttpTransport
+from models.rate_limiter import FORECAST_FAMILY, REFERENCE_FAMILY, RateLimiter, TokenBucket
+from models.resilience import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bucket_allows_a_burst_then_queues_callers_in_arrival_order():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+
+    waits = [bucket.reserve() for _ in range(6)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == pytest.approx([0.1, 0.2, 0.3]) # Cada pedido espera pelo anterior
+
+    clock.now = 1.0 # Saldo pago e balde de novo cheio
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    stats = bucket.stats()
+    assert stats["acquired"] == 9 and stats["delayed"] == 3
+    assert stats["max_wait"] == pytest.approx(0.3)
+
+
+def test_pause_delays_the_next_callers():
+    clock = FakeClock()
+    limiter = RateLimiter({FORECAST_FAMILY: (5, 5)}, clock=clock, sleep=clock.sleep)
+    limiter.pause(FORECAST_FAMILY, 2.0)
+    assert limiter.acquire(FORECAST_FAMILY) == pytest.approx(2.2)
+    assert limiter.acquire(REFERENCE_FAMILY) == 0 # Família sem orçamento
+    assert clock.now == pytest.approx(2.2)
+
+
+def test_sustained_throughput_matches_the_forecast_budget(standin, make_api):
+    rate = 40
+    api = make_api(standin, transport=HttpTransport(rate_limiter=RateLimiter({FORECAST_FAMILY: (rate, 1)})))
+    ids = list(api.get_locations_map())[:21]
+
+    start = time.perf_counter()
+    results = api.get_daily_forecasts(ids, max_workers=10)
+    elapsed = time.perf_counter() - start
+
+    assert all(result["error"] is None for result in results.values())
+    assert elapsed >= (len(ids) - 1) / rate
+    stats = api.get_rate_limit_stats()[FORECAST_FAMILY]
+    assert stats["acquired"] == 21 and stats["delayed"] >= 19 and stats["waiting"] == 0
+    assert stats["max_waiting"] > 1 # Vários pedidos em fila ao mesmo tempo
+    assert REFERENCE_FAMILY not in api.get_rate_limit_stats() # Os locais não foram limitados
+
+
+def test_429_suspends_the_family_for_retry_after(standin, make_api):
+    api = make_api(standin, retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001))
+    standin.fail_next(1, status=429)
+
+    start = time.perf_counter()
+    assert api.get_daily_forecast("1110600") is not None
+    assert time.perf_counter() - start >= 0.9 # Retry-After: 1
+    assert api.get_rate_limit_stats()[FORECAST_FAMILY]["delayed"] == 1
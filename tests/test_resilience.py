@@ -0,0 +1,135 @@
+# test_resilience.py
+"""
+Testes da repetição de pedidos e do disjuntor (`models/resilience.py`) e do
+comportamento da `IPMAApi` com um servidor local instável.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import requests
+
+from models.forecast_cache import ForecastCache
+from models.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, CLOSED, OPEN, HALF_OPEN
+from tools.ipma_standin import IPMAStandInServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def http_error(status):
+    response = requests.models.Response()
+    response.status_code = status
+    return requests.exceptions.HTTPError(f"{status} Error", response=response)
+
+
+def fast_retries(max_attempts=3):
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0.001, max_delay=0.005)
+
+
+def test_retry_policy_backs_off_with_jitter_and_only_retries_transient_errors():
+    sleeps = []
+    policy = RetryPolicy(max_attempts=4, base_delay=0.1, max_delay=0.3, sleep=sleeps.append, rng=random.Random(1))
+    errors = [requests.exceptions.ConnectionError("reset"), http_error(503), http_error(429)]
+
+    def flaky():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    assert policy.call(flaky) == "ok"
+    assert len(sleeps) == 3
+    assert all(0 <= delay <= ceiling for delay, ceiling in zip(sleeps, (0.1, 0.2, 0.3)))
+
+    calls = []
+    def not_found():
+        calls.append(1)
+        raise http_error(404)
+    with pytest.raises(requests.exceptions.HTTPError):
+        policy.call(not_found)
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_opens_fails_fast_and_closes_after_a_successful_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    def down():
+        raise requests.exceptions.ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(down)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "não chega a ser chamado")
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    breaker.before_call() # Pedido de teste em curso: os outros são recusados
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.stats()["times_opened"] == 1
+
+
+def test_transient_failures_are_retried(standin_flaky, make_api):
+    api = make_api(standin_flaky, retry_policy=fast_retries())
+    standin_flaky.fail_next(2)
+    assert api.get_daily_forecast("1110600")["globalIdLocal"] == 1110600
+    assert standin_flaky.requests_served == 3
+
+
+def test_open_breaker_serves_stale_forecast_without_touching_the_network(standin_flaky, make_api):
+    api = make_api(standin_flaky, forecast_cache=ForecastCache(max_entries=0), retry_policy=fast_retries(2),
+                   circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    fresh = api.get_daily_forecast("1110600")
+
+    standin_flaky.failure_rate = 1.0
+    assert api.get_daily_forecast("1110600") == fresh # 2 tentativas falhadas: disjuntor aberto, cópia antiga
+    served = standin_flaky.requests_served
+    assert api.get_daily_forecast("1110600") == fresh
+    assert standin_flaky.requests_served == served # Falhou de imediato, sem pedido
+    assert api.get_daily_forecast("1131200") is None # Sem cópia antiga
+    stats = api.get_resilience_stats()
+    assert stats["state"] == OPEN and stats["stale_served"] == 2 and stats["rejected"] >= 2
+
+
+def test_failed_reference_load_is_retried_instead_of_cached_empty(standin_flaky, make_controller, wait_for):
+    controller = make_controller(standin_flaky, retry_policy=fast_retries(1), reference_retry_interval=0)
+    standin_flaky.fail_next(1)
+    assert controller.wait_for_locations(timeout=5)
+    assert not controller.locations_map_id_to_name
+    # A carga inicial falhou; a nova tentativa (em segundo plano) já não
+    controller.wait_for_locations()
+    assert wait_for(lambda: controller.are_locations_loaded() and controller.locations_map_id_to_name)
+    assert controller.set_location_by_name("Porto")
+    assert controller.current_location_id == "1131200"
+    assert standin_flaky.failures_served == 1
+
+
+def test_reference_retry_does_not_block_the_caller(make_controller, wait_for):
+    # Cada pedido demora 0,2 s e falha: uma tentativa síncrona levaria mais de 0,5 s
+    with IPMAStandInServer(latency=0.2, failure_rate=1.0) as server:
+        controller = make_controller(server, retry_policy=fast_retries(3), reference_retry_interval=0,
+                                     circuit_breaker=CircuitBreaker(failure_threshold=100))
+        assert controller.wait_for_locations(timeout=5)
+        assert controller.ipma_api.get_weather_type_descriptions() == {} # Primeira carga (falhada)
+
+        for _ in range(3):
+            started = time.perf_counter()
+            assert not controller.set_location_by_name("Porto")
+            controller.ipma_api.get_locations_map()
+            controller.ipma_api.get_weather_type_descriptions()
+            assert time.perf_counter() - started < 0.05
+        assert wait_for(lambda: server.failures_served > 3) # As novas tentativas correm em segundo plano
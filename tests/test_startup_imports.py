@@ -0,0 +1,36 @@
+# test_startup_imports.py
+"""
+Garante que o arranque só importa o necessário: `main` sem tkinter/Pillow/requests
+e o glossário sem criar uma `IPMAApi` como efeito secundário.
+"""
+
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def imported_modules(code):
+    """Corre `code` num interpretador novo e devolve os nomes dos módulos carregados."""
+    result = subprocess.run([sys.executable, "-c", code + "; import sys; print(' '.join(sys.modules))"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_main_module_imports_no_gui_or_http_stack():
+    modules = imported_modules("import main")
+    assert not {"tkinter", "PIL", "requests", "views.main_window", "views.minimal_window"} & modules
+
+
+def test_glossary_creates_api_on_first_use():
+    code = ("import static_data.weather_glossary as g; "
+            "assert g._ipma_api_instance is None; "
+            "assert g.get_ipma_api() is g.get_ipma_api()")
+    modules = imported_modules(code)
+    assert "models.ipma_api" in modules # Só depois de get_ipma_api()
+
+
+def test_glossary_import_is_lightweight():
+    modules = imported_modules("import static_data.weather_glossary")
+    assert "requests" not in modules
@@ -0,0 +1,71 @@
+# test_views.py
+"""
+Testes das janelas Tkinter (`views/`) contra o servidor local que imita o IPMA.
+Precisam de um display (ex: `xvfb-run python -m pytest`); sem ele são ignorados.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+from models.resilience import CircuitBreaker, RetryPolicy
+from views import minimal_window
+from views.minimal_window import MinimalWindow
+
+
+@pytest.fixture
+def tk_root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Tkinter sem display: {e}")
+    root.withdraw()
+    yield root
+    try:
+        root.destroy()
+    except tk.TclError:
+        pass # A janela já foi fechada pelo teste
+
+
+def pump_until(root, condition, timeout=5.0):
+    """Corre o ciclo de eventos do Tkinter até `condition()` ser verdadeira (ou até ao timeout)."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        root.update()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_combobox_recovers_after_a_failed_locations_load(standin_flaky, make_controller, tk_root, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(minimal_window.messagebox, "showwarning", lambda *args: warnings.append(args))
+    monkeypatch.setattr(minimal_window, "LOCATIONS_RETRY_INTERVAL_MS", 50)
+    controller = make_controller(standin_flaky, retry_policy=RetryPolicy(max_attempts=1, base_delay=0.001),
+                                 reference_retry_interval=0, circuit_breaker=CircuitBreaker(failure_threshold=1000))
+    standin_flaky.fail_next(1000) # O IPMA está em baixo enquanto a janela abre
+
+    window = MinimalWindow(tk_root, controller)
+    combo = window.combo_location
+    assert pump_until(tk_root, lambda: warnings) # A primeira carga falhou
+    assert str(combo['state']) == 'disabled' and combo.get() == "Nenhum local disponível"
+
+    # O IPMA volta: a nova tentativa (agendada com after()) preenche e ativa o Combobox
+    standin_flaky.fail_next(0)
+    assert pump_until(tk_root, lambda: str(combo['state']) == 'normal')
+    assert len(window.location_names) == 35 and "Porto" in combo['values']
+    assert len(warnings) == 1 # O aviso aparece uma única vez
+    controller.shutdown()
+
+
+def test_closing_the_window_stops_the_dispatcher(standin, make_controller, tk_root):
+    controller = make_controller(standin)
+    window = MinimalWindow(tk_root, controller)
+    window._on_close()
+    assert window.dispatcher._stopped
+    controller.shutdown()
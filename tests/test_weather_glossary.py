@@ -0,0 +1,50 @@
+# test_weather_glossary.py
+"""Testes do `WeatherGlossary` (tabelas de tradução pré-calculadas)."""
+
+import json
+import os
+import sys
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.forecast_series import MISSING_INT
+from models.ipma_api import parse_weather_type_descriptions
+from static_data.weather_glossary import WeatherGlossary, get_wind_speed_description
+
+FIXTURE = os.path.join(os.path.dirname(__file__), '..', 'tools', 'fixtures', 'weather-type-classe.json')
+
+
+def make_glossary():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return WeatherGlossary(parse_weather_type_descriptions(json.load(f)))
+
+
+def test_single_lookups_keep_the_glossary_messages():
+    glossary = make_glossary()
+    assert glossary.describe_weather(1) == "Céu limpo"
+    assert glossary.describe_weather("1") == "Céu limpo"
+    assert glossary.describe_weather(-99) == "---"
+    assert glossary.describe_weather(31) == "Código de Tempo Desconhecido (31)"
+    assert glossary.describe_weather(-5) == "Código de Tempo Desconhecido (-5)"
+    assert glossary.describe_weather(5000) == "Código de Tempo Desconhecido (5000)"
+    assert glossary.describe_weather("chuva") == "ID de Tempo Inválido (chuva)"
+    assert glossary.describe_weather(None) == "Dados de tempo não disponíveis"
+    assert glossary.describe_wind(2) == get_wind_speed_description(2) == "Vento moderado"
+    assert glossary.describe_wind("N/A") == "Informação de vento indisponível"
+
+
+def test_translate_many_matches_single_lookups():
+    glossary = make_glossary()
+    weather_ids = [1, -99, 31, "2", None, 2.0, "x", MISSING_INT]
+    wind_classes = [0, 4, 7, "1", None, "N/A", MISSING_INT, 3]
+    weather, wind = glossary.translate_many(weather_ids, wind_classes)
+    assert weather == [glossary.describe_weather(code) for code in weather_ids]
+    assert wind == [glossary.describe_wind(code) for code in wind_classes]
+    assert weather[-1] == "Dados de tempo não disponíveis"
+
+    # Colunas de uma ForecastSeries (caminho rápido, sem valores em falta)
+    weather, wind = glossary.translate_many(array('h', [1, 2, -99]), array('h', [1, 2, 3]))
+    assert weather == ["Céu limpo", "Céu pouco nublado", "---"]
+    assert wind == ["Vento fraco", "Vento moderado", "Vento forte"]
+    assert glossary.translate_many([], iter([])) == ([], [])
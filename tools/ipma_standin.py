@@ -0,0 +1,406 @@
+"""
+Servidor HTTP local que imita os endpoints de dados abertos do IPMA.
+
+Serve os ficheiros de `tools/fixtures/` nos mesmos caminhos que a API real
+(`/open-data/...`), com latência configurável, para que benchmarks e testes
+possam correr sem rede. Suporta HTTP/1.1 com keep-alive e conta as ligações
+TCP abertas, o que permite verificar a reutilização de ligações do cliente.
+
+As previsões de locais sem ficheiro próprio (`forecast-daily-<id>.json`) são
+geradas a partir da de Lisboa. O modo de gravação (`--record`) guarda
+respostas reais do IPMA num diretório de fixtures, para depois as servir.
+
+Uso:
+    python tools/ipma_standin.py --port 8765 --latency 0.05
+    python tools/ipma_standin.py --record tools/fixtures --locations 1110600,1131200
+    GUIA_PRAIAS_IPMA_URL=http://127.0.0.1:8765/open-data/ python main.py
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Origem das respostas gravadas com record_fixtures()
+DEFAULT_UPSTREAM_URL = "https://api.ipma.pt/open-data/"
+TEMPLATE_LOCATION_ID = "1110600"
+
+LOCATIONS_PATH = "/open-data/distrits-islands.json"
+WEATHER_TYPES_PATH = "/open-data/weather-type-classe.json"
+DAILY_FORECAST_PREFIX = "/open-data/forecast/meteorology/cities/daily/"
+
+_DAILY_FORECAST_RE = re.compile(r"^" + re.escape(DAILY_FORECAST_PREFIX) + r"(\d+)\.json$")
+_FORECAST_BY_DAY_RE = re.compile(r"^" + re.escape(DAILY_FORECAST_PREFIX) + r"hp-daily-forecast-day(\d+)\.json$")
+_FORECAST_FIXTURE_RE = re.compile(r"^forecast-daily-(\d+)\.json$")
+
+
+def load_fixture(filename, fixtures_dir=FIXTURES_DIR):
+    """Carrega um ficheiro JSON de fixtures."""
+    with open(os.path.join(fixtures_dir, filename), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_fixtures(output_dir, upstream=DEFAULT_UPSTREAM_URL, location_ids=None, session=None, delay=0.2):
+    """
+    Grava respostas reais (ou de outro servidor compatível) como fixtures:
+    locais, tipos de tempo e a previsão diária de cada local pedido.
+
+    Args:
+        output_dir (str): Diretório de destino (criado se não existir).
+        upstream (str): URL base dos dados abertos.
+        location_ids (iterable, optional): IDs dos locais cujas previsões são gravadas.
+            Por omissão, todos os locais da resposta de `distrits-islands.json`.
+        session (requests.Session, optional): Sessão HTTP a usar.
+        delay (float): Pausa entre pedidos de previsão, para não sobrecarregar o servidor.
+
+    Returns:
+        list: Nomes dos ficheiros gravados.
+    """
+    import requests # Só o modo de gravação precisa de um cliente HTTP
+
+    upstream = upstream if upstream.endswith("/") else upstream + "/"
+    session = session or requests.Session()
+    os.makedirs(output_dir, exist_ok=True)
+
+    def save(path, filename):
+        response = session.get(upstream + path, timeout=(3.05, 30))
+        response.raise_for_status()
+        json.loads(response.content) # Não grava respostas que não sejam JSON válido
+        with open(os.path.join(output_dir, filename), "wb") as f:
+            f.write(response.content)
+        logging.info(f"IPMA Stand-in: gravado {filename} ({len(response.content)} bytes).")
+        return response
+
+    written = []
+    for path in (LOCATIONS_PATH, WEATHER_TYPES_PATH):
+        filename = path.rsplit("/", 1)[1]
+        response = save(path[len("/open-data/"):], filename)
+        written.append(filename)
+        if path == LOCATIONS_PATH and location_ids is None:
+            location_ids = [str(item["globalIdLocal"]) for item in json.loads(response.content)["data"]]
+
+    forecast_dir = DAILY_FORECAST_PREFIX[len("/open-data/"):]
+    for position, location_id in enumerate(location_ids):
+        if position and delay:
+            time.sleep(delay)
+        filename = f"forecast-daily-{location_id}.json"
+        save(f"{forecast_dir}{location_id}.json", filename)
+        written.append(filename)
+    return written
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Mantém as ligações abertas entre pedidos (keep-alive)
+    disable_nagle_algorithm = True # Evita o atraso de ~40ms (Nagle + delayed ACK) em ligações reutilizadas
+
+    def setup(self):
+        super().setup()
+        self.server.standin._register_connection()
+
+    def do_GET(self):
+        standin = self.server.standin
+        standin._register_request(self.path)
+
+        if standin.latency > 0:
+            time.sleep(standin.latency)
+
+        failure_status = standin._pick_failure()
+        if failure_status is not None:
+            body = standin._encode({"error": "Simulated failure", "status": failure_status})
+            self.send_response(failure_status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if failure_status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        status, body = standin.resolve(self.path)
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+
+        if status == 200 and standin.conditional and self._is_not_modified(etag, standin.last_modified):
+            standin._register_not_modified()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", standin.last_modified)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200 and standin.conditional:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", standin.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _is_not_modified(self, etag, last_modified):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        return self.headers.get("If-Modified-Since") == last_modified
+
+    def log_message(self, format, *args):
+        # Silencia o log por pedido do http.server
+        pass
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128 # Aceita rajadas de ligações simultâneas (pedidos em lote)
+
+    def handle_error(self, request, client_address):
+        # Clientes que desistem a meio (ex: timeouts nos testes) não são erros do servidor
+        pass
+
+
+class IPMAStandInServer:
+    """
+    Servidor local que imita a API do IPMA a partir de fixtures.
+
+    Args:
+        host (str): Endereço de escuta.
+        port (int): Porta (0 escolhe uma porta livre).
+        latency (float): Atraso artificial, em segundos, aplicado a cada pedido.
+        fixtures_dir (str): Diretório com os ficheiros JSON servidos.
+        conditional (bool): Envia ETag/Last-Modified e responde 304 a pedidos condicionais.
+        bulk_scale (int): Número de cópias dos locais na previsão de um dia para todos os
+            locais (`hp-daily-forecast-dayN.json`), para simular respostas grandes.
+        forecast_days (int, optional): Número de dias das previsões geradas (os dias do
+            modelo repetem-se com datas seguidas), para variar o tamanho das respostas.
+        failure_rate (float): Fração (0 a 1) de pedidos que falham com `failure_status`,
+            para simular um servidor instável (ver também fail_next()).
+        failure_status (int): Código HTTP das falhas simuladas.
+        seed (int, optional): Semente das falhas aleatórias (resultados reprodutíveis).
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, fixtures_dir=FIXTURES_DIR, conditional=True,
+                 bulk_scale=1, failure_rate=0.0, failure_status=503, seed=None, forecast_days=None):
+        self.latency = latency
+        self.bulk_scale = bulk_scale
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.failures_served = 0
+        self._fail_remaining = 0
+        self._fail_next_status = failure_status
+        self._random = random.Random(seed)
+        self.fixtures_dir = fixtures_dir
+        self.conditional = conditional
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.connections_opened = 0
+        self.requests_served = 0
+        self.not_modified_served = 0
+        self.requests_by_path = {}
+        self._lock = threading.Lock()
+
+        self._locations = load_fixture("distrits-islands.json", fixtures_dir)
+        self._weather_types = load_fixture("weather-type-classe.json", fixtures_dir)
+        # Previsões gravadas (forecast-daily-<id>.json), servidas tal como estão
+        self._recorded_forecasts = {}
+        for filename in sorted(os.listdir(fixtures_dir)):
+            match = _FORECAST_FIXTURE_RE.match(filename)
+            if match:
+                with open(os.path.join(fixtures_dir, filename), "rb") as f:
+                    self._recorded_forecasts[match.group(1)] = f.read()
+        template_id = TEMPLATE_LOCATION_ID if TEMPLATE_LOCATION_ID in self._recorded_forecasts \
+            else next(iter(self._recorded_forecasts))
+        self._forecast_template = json.loads(self._recorded_forecasts[template_id])
+        if forecast_days is not None:
+            self._forecast_template["data"] = self._extend_days(self._forecast_template["data"], forecast_days)
+            self._recorded_forecasts.clear() # Todas as previsões passam a ter `forecast_days` dias
+        self._coordinates = {
+            str(item["globalIdLocal"]): (item["latitude"], item["longitude"])
+            for item in self._locations["data"]
+        }
+        self._static_bodies = {
+            LOCATIONS_PATH: self._encode(self._locations),
+            WEATHER_TYPES_PATH: self._encode(self._weather_types),
+        }
+        self._by_day_bodies = {} # dia -> corpo da previsão para todos os locais (gerado no 1.º pedido)
+
+        self._httpd = _StandInHTTPServer((host, port), _StandInHandler)
+        self._httpd.standin = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """URL base do servidor (ex: "http://127.0.0.1:8765")."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def open_data_url(self):
+        """URL equivalente a "https://api.ipma.pt/open-data/"."""
+        return f"{self.base_url}/open-data/"
+
+    @staticmethod
+    def _encode(payload):
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def _register_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def _register_request(self, path):
+        with self._lock:
+            self.requests_served += 1
+            self.requests_by_path[path] = self.requests_by_path.get(path, 0) + 1
+
+    def fail_next(self, count, status=None):
+        """Faz falhar os próximos `count` pedidos (com `status`, ou `failure_status`)."""
+        with self._lock:
+            self._fail_remaining = count
+            self._fail_next_status = status or self.failure_status
+
+    def _pick_failure(self):
+        """Devolve o código HTTP de uma falha simulada para o pedido atual, ou None."""
+        with self._lock:
+            if self._fail_remaining > 0:
+                self._fail_remaining -= 1
+                status = self._fail_next_status
+            elif self.failure_rate > 0 and self._random.random() < self.failure_rate:
+                status = self.failure_status
+            else:
+                return None
+            self.failures_served += 1
+            return status
+
+    def _register_not_modified(self):
+        with self._lock:
+            self.not_modified_served += 1
+
+    def resolve(self, path):
+        """Devolve (status, corpo) para um caminho pedido."""
+        body = self._static_bodies.get(path)
+        if body is not None:
+            return 200, body
+
+        match = _DAILY_FORECAST_RE.match(path)
+        if match and match.group(1) in self._recorded_forecasts:
+            return 200, self._recorded_forecasts[match.group(1)]
+        if match and match.group(1) in self._coordinates:
+            return 200, self._encode(self._build_forecast(match.group(1)))
+
+        match = _FORECAST_BY_DAY_RE.match(path)
+        if match and int(match.group(1)) < len(self._forecast_template["data"]):
+            day = int(match.group(1))
+            with self._lock:
+                body = self._by_day_bodies.get(day)
+                if body is None:
+                    body = self._by_day_bodies[day] = self._encode(self._build_forecast_by_day(day))
+            return 200, body
+
+        return 404, self._encode({"error": "Not Found", "path": path})
+
+    @staticmethod
+    def _extend_days(days, count):
+        """Repete os dias do modelo até `count` dias, com datas seguidas a partir do primeiro."""
+        first = date.fromisoformat(days[0]["forecastDate"])
+        extended = []
+        for index in range(count):
+            day = dict(days[index % len(days)])
+            day["forecastDate"] = (first + timedelta(days=index)).isoformat()
+            extended.append(day)
+        return extended
+
+    def _build_forecast(self, global_id):
+        """Gera a previsão de um local a partir do modelo, ajustando ID e coordenadas."""
+        latitude, longitude = self._coordinates[global_id]
+        forecast = copy.deepcopy(self._forecast_template)
+        forecast["globalIdLocal"] = int(global_id)
+        for day in forecast["data"]:
+            day["latitude"] = latitude
+            day["longitude"] = longitude
+        return forecast
+
+    def _build_forecast_by_day(self, day):
+        """Gera a previsão do dia `day` para todos os locais (repetidos `bulk_scale` vezes)."""
+        template = self._forecast_template["data"][day]
+        records = []
+        for copy_index in range(self.bulk_scale):
+            for global_id, (latitude, longitude) in self._coordinates.items():
+                record = {key: value for key, value in template.items() if key != "forecastDate"}
+                record.update(globalIdLocal=int(global_id) + copy_index * 10000000,
+                              latitude=latitude, longitude=longitude)
+                records.append(record)
+        return {"owner": "IPMA", "country": "PT", "forecastDate": template["forecastDate"],
+                "data": records, "dataUpdate": self._forecast_template.get("dataUpdate")}
+
+    def start(self):
+        """Arranca o servidor numa thread em segundo plano."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="ipma-standin", daemon=True)
+        self._thread.start()
+        logging.info(f"IPMA Stand-in: a servir em {self.base_url} (latência={self.latency}s)")
+        return self
+
+    def stop(self):
+        """Pára o servidor e fecha o socket de escuta."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API de dados abertos do IPMA.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Atraso por pedido, em segundos.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Fração de pedidos que falham (ex: 0.2), para simular um servidor instável.")
+    parser.add_argument("--failure-status", type=int, default=503, help="Código HTTP das falhas simuladas.")
+    parser.add_argument("--seed", type=int, default=None, help="Semente das falhas aleatórias.")
+    parser.add_argument("--fixtures-dir", default=FIXTURES_DIR, help="Diretório das respostas servidas.")
+    parser.add_argument("--forecast-days", type=int, default=None,
+                        help="Número de dias de cada previsão gerada (respostas maiores ou menores).")
+    parser.add_argument("--bulk-scale", type=int, default=1,
+                        help="Cópias dos locais na previsão de um dia para todos os locais.")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="Em vez de servir, grava respostas reais do IPMA em DIR e termina.")
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM_URL, help="URL base a gravar com --record.")
+    parser.add_argument("--locations", default=None,
+                        help="Com --record, IDs das previsões a gravar, separados por vírgulas (padrão: todos).")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.record:
+        location_ids = [gid.strip() for gid in args.locations.split(",") if gid.strip()] if args.locations else None
+        written = record_fixtures(args.record, args.upstream, location_ids)
+        logging.info(f"IPMA Stand-in: {len(written)} ficheiros gravados em {args.record}.")
+        return
+
+    server = IPMAStandInServer(host=args.host, port=args.port, latency=args.latency,
+                               fixtures_dir=args.fixtures_dir, bulk_scale=args.bulk_scale,
+                               failure_rate=args.failure_rate, failure_status=args.failure_status,
+                               seed=args.seed, forecast_days=args.forecast_days)
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font
 import logging
+import time
 import os
 
+from models import metrics
+from models.location_index import fold
+from views.tk_dispatcher import TkDispatcher
+
 # Importar Pillow se disponível, para suportar mais formatos de imagem
 try:
     from PIL import Image, ImageTk
@@ -20,6 +25,13 @@ HEADER_COLOR = '#2c3e50'
 WHITE_COLOR = '#ffffff'
 HOVER_BG_COLOR = '#eaf2f8' # Um azul claro para campos em foco
 
+# Intervalo (ms) entre verificações do carregamento de locais em segundo plano
+LOCATIONS_POLL_INTERVAL_MS = 50
+# Intervalo (ms) entre novas tentativas de carregar os locais depois de uma carga falhada
+LOCATIONS_RETRY_INTERVAL_MS = 5000
+# Teclas que não alteram o texto do Combobox (não refiltram a lista)
+NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "KP_Enter", "Escape", "Tab", "Home", "End"}
+
 # --- Classe da Janela Principal ---
 class MainWindow(ttk.Frame):
     def __init__(self, master, controller, project_root_dir, *args, **kwargs):
@@ -58,8 +70,13 @@ class MainWindow(ttk.Frame):
         # --- Criar Widgets da UI ---
         self._create_widgets()
 
-        # --- Carregar localizações iniciais para o Combobox ---
-        self._load_locations_into_combobox()
+        # --- Entrega de resultados das threads de trabalho à thread do Tkinter ---
+        self.dispatcher = TkDispatcher(self)
+        self._pending_forecast_request = None
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # --- Carregar localizações iniciais para o Combobox (em segundo plano) ---
+        self._start_loading_locations()
 
     def _configure_styles(self):
         """Configura os estilos personalizados para widgets ttk."""
@@ -246,6 +263,9 @@ class MainWindow(ttk.Frame):
         self.combo_location = ttk.Combobox(self.content_frame, state="readonly", textvariable=self.selected_location_name, style='TCombobox')
         self.combo_location.grid(row=0, column=1, sticky="ew", padx=10, pady=10)
         self.combo_location.bind("<<ComboboxSelected>>", self._on_location_selected)
+        self.combo_location.bind("<KeyRelease>", self._on_location_typed) # Filtra a lista enquanto se escreve
+        self.combo_location.bind("<Return>", self._on_location_selected) # Aceita o nome escrito
+        self.combo_location.bind("<FocusIn>", self._clear_location_placeholder)
         
         # --- Botão de Busca ---
         search_button = ttk.Button(self.content_frame, text="Previsão Completa", command=self._search_button_command, style='Search.TButton')
@@ -291,24 +311,52 @@ class MainWindow(ttk.Frame):
             self.result_labels[key] = value_label
             row_num += 1
 
+    def _start_loading_locations(self):
+        """
+        Pede ao controller que carregue os locais em segundo plano, para que a janela
+        apareça de imediato, e aguarda o resultado através de `after()`.
+        """
+        self.combo_location['values'] = []
+        self.combo_location.set("A carregar locais...")
+        self.combo_location['state'] = 'disabled'
+        self._locations_failed = False
+        self.controller.start_loading_locations()
+        self._poll_locations_loaded()
+
+    def _retry_loading_locations(self):
+        """Pede ao controller uma nova tentativa de carregar os locais e volta a aguardar o resultado."""
+        self.controller.retry_loading_locations()
+        self._poll_locations_loaded()
+
+    def _poll_locations_loaded(self):
+        """Verifica (na thread do Tkinter) se os locais já chegaram; se não, volta a agendar-se."""
+        if self.controller.are_locations_loaded():
+            self._load_locations_into_combobox()
+        else:
+            self.after(LOCATIONS_POLL_INTERVAL_MS, self._poll_locations_loaded)
+
     def _load_locations_into_combobox(self):
         """Carrega a lista de locais da API e popula o Combobox."""
         logging.info("A carregar locais para o Combobox...")
         try:
             # Chama o MainController para obter os nomes dos locais disponíveis
             self.location_names = self.controller.get_available_location_names()
-            self.location_names.sort() # Ordena alfabeticamente para melhor usabilidade
+            self.location_names.sort(key=fold) # Ordena alfabeticamente (ignorando acentos) para melhor usabilidade
 
             if not self.location_names:
-                messagebox.showwarning("Erro de Carregamento", "Não foi possível carregar a lista de locais. Verifique sua conexão com a internet ou a API do IPMA.")
+                if not self._locations_failed: # Avisa uma vez, não a cada nova tentativa
+                    messagebox.showwarning("Erro de Carregamento", "Não foi possível carregar a lista de locais. Verifique sua conexão com a internet ou a API do IPMA.")
+                    self._locations_failed = True
                 logging.warning("Lista de locais vazia ou não carregada.")
                 self.combo_location['values'] = ["Nenhum local disponível"]
                 self.combo_location.set("Nenhum local disponível")
-                self.combo_location['state'] = 'disabled' # Desativar o combobox
+                self.combo_location['state'] = 'disabled' # Desativar o combobox até uma nova tentativa ter sucesso
+                self.after(LOCATIONS_RETRY_INTERVAL_MS, self._retry_loading_locations)
             else:
+                self._locations_failed = False
                 self.combo_location['values'] = self.location_names
                 self.combo_location.set("Selecione um local...") # Texto inicial do combobox
-                self.combo_location['state'] = 'readonly' # Permitir seleção, mas não edição
+                self.combo_location['state'] = 'normal' # Permite escrever para filtrar (ver _on_location_typed)
                 logging.info(f"Carregados {len(self.location_names)} locais no Combobox.")
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar locais: {e}")
@@ -317,12 +365,29 @@ class MainWindow(ttk.Frame):
             self.combo_location.set("Erro ao carregar")
             self.combo_location['state'] = 'disabled' # Desativar o combobox
 
+    def _clear_location_placeholder(self, event):
+        """Limpa o texto "Selecione um local..." quando o utilizador vai escrever no Combobox."""
+        if self.selected_location_name.get() == "Selecione um local...":
+            self.combo_location.set("")
+
+    def _on_location_typed(self, event):
+        """Filtra a lista do Combobox (prefixo, sem acentos, ou aproximada) à medida que o utilizador escreve."""
+        if event.keysym in NAVIGATION_KEYS or not self.location_names:
+            return
+        text = self.selected_location_name.get()
+        self.combo_location['values'] = self.controller.search_location_names(text) if text.strip() else self.location_names
+
     def _on_location_selected(self, event):
         """Evento acionado quando uma localização é selecionada no Combobox."""
         selected_name = self.selected_location_name.get()
         logging.info(f"Localização selecionada: {selected_name}")
         # O controller precisa ser notificado da mudança para definir a localização atual
+        previous_location_id = self.controller.current_location_id
         success = self.controller.set_location_by_name(selected_name)
+        if self._pending_forecast_request is not None and self.controller.current_location_id != previous_location_id:
+            # O controller cancelou a previsão em curso para o local anterior; o seu resultado nunca chegará
+            self._pending_forecast_request = None
+            self._clear_results_display()
         if not success:
             messagebox.showwarning("Erro de Seleção", f"Não foi possível definir '{selected_name}' como localização atual.")
             logging.error(f"Falha ao definir localização por nome: {selected_name}")
@@ -335,20 +400,32 @@ class MainWindow(ttk.Frame):
             logging.warning("Tentativa de buscar previsão sem localização selecionada.")
             return
 
-        # Busca e processa os dados da previsão
-        success = self.controller.fetch_and_display_forecast()
+        # Busca a previsão numa thread de trabalho; o resultado chega por _on_forecast_ready
+        self.current_location_display.config(text=f"A obter a previsão para: {self.controller.current_location_name}...")
+        self._search_started_at = time.perf_counter()
+        self._pending_forecast_request = self.controller.fetch_forecast_async(
+            self.dispatcher.wrap(self._on_forecast_ready))
+
+    def _on_forecast_ready(self, success, forecast_data, request_id):
+        """Mostra a previsão pedida em _search_button_command (corre na thread do Tkinter)."""
+        if request_id != self._pending_forecast_request:
+            logging.info("Resultado de um pedido de previsão antigo ignorado.")
+            return
+        self._pending_forecast_request = None
 
         if success:
-            forecast_data = self.controller.get_current_weather_data()
             if forecast_data:
-                # Atualiza o título da seção de previsão
-                self.current_location_display.config(text=f"Previsão para: {forecast_data.get('location_name', 'N/A')}")
-                # Atualiza os Labels com os dados da previsão
-                self._update_results_display(forecast_data)
+                with metrics.timer("ui_update"):
+                    # Atualiza o título da seção de previsão
+                    self.current_location_display.config(text=f"Previsão para: {forecast_data.get('location_name', 'N/A')}")
+                    # Atualiza os Labels com os dados da previsão
+                    self._update_results_display(forecast_data)
+                # Tempo desde o clique em "Procurar" até a previsão estar nos widgets
+                metrics.observe("ui_click_to_display", time.perf_counter() - self._search_started_at)
                 logging.info("Previsão exibida com sucesso.")
             else:
                 messagebox.showerror("Erro de Dados", "Dados de previsão não foram processados corretamente.")
-                logging.error("Dados de previsão ausentes após fetch_and_display_forecast.")
+                logging.error("Dados de previsão ausentes após fetch_forecast_async.")
                 self._clear_results_display() # Limpa os resultados em caso de erro
         else:
             messagebox.showerror("Erro de Previsão", f"Não foi possível obter a previsão para {self.controller.current_location_name}.")
@@ -371,3 +448,8 @@ class MainWindow(ttk.Frame):
         for key in self.result_labels:
             self.result_labels[key].config(text="-")
 
+    def _on_close(self):
+        """Fecha a janela: pára o dispatcher antes de destruir os widgets."""
+        self.dispatcher.stop()
+        self.master.destroy()
+
@@ -2,6 +2,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font
 import logging
+import time
+
+from models import metrics
+from models.location_index import fold
+from views.tk_dispatcher import TkDispatcher
 
 # --- Definições de Cores (simplificadas) ---
 
@@ -11,6 +16,14 @@ PALETTE_TEXT_DARK = '#212121'
 PALETTE_BACKGROUND = '#F5F5F5'
 PALETTE_SURFACE = '#FFFFFF'
 PALETTE_BORDER = '#BDBDBD'
+PALETTE_ERROR = '#DB4437'
+
+# Intervalo (ms) entre verificações do carregamento de locais em segundo plano
+LOCATIONS_POLL_INTERVAL_MS = 50
+# Intervalo (ms) entre novas tentativas de carregar os locais depois de uma carga falhada
+LOCATIONS_RETRY_INTERVAL_MS = 5000
+# Teclas que não alteram o texto do Combobox (não refiltram a lista)
+NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "KP_Enter", "Escape", "Tab", "Home", "End"}
 
 # --- Classe da Janela Minimalista ---
 class MinimalWindow(ttk.Frame):
@@ -48,7 +61,11 @@ class MinimalWindow(ttk.Frame):
 
         # --- Chamar métodos para construir a UI ---
         self._create_widgets()
-        self._load_locations_into_combobox() # Carrega os locais no combobox
+        # Entrega de resultados das threads de trabalho à thread do Tkinter
+        self.dispatcher = TkDispatcher(self)
+        self._pending_forecast_request = None
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._start_loading_locations() # Carrega os locais no combobox (em segundo plano)
 
     def _configure_styles(self):
         """Configura estilos ttk básicos para este exemplo."""
@@ -109,6 +126,9 @@ class MinimalWindow(ttk.Frame):
         self.combo_location = ttk.Combobox(input_frame, state="readonly", textvariable=self.selected_location_name)
         self.combo_location.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
         self.combo_location.bind("<<ComboboxSelected>>", self._on_location_selected) # Vincula o evento de seleção
+        self.combo_location.bind("<KeyRelease>", self._on_location_typed) # Filtra a lista enquanto se escreve
+        self.combo_location.bind("<Return>", self._on_location_selected) # Aceita o nome escrito
+        self.combo_location.bind("<FocusIn>", self._clear_location_placeholder)
 
         # --- Botão de Busca ---
         search_button = ttk.Button(self, text="Buscar Previsão", command=self._search_button_command)
@@ -126,24 +146,52 @@ class MinimalWindow(ttk.Frame):
         # Configurar as linhas para expandir adequadamente
         self.grid_rowconfigure(3, weight=1) # Faz a área de resultados expandir mais
 
+    def _start_loading_locations(self):
+        """
+        Pede ao controller que carregue os locais em segundo plano, para que a janela
+        apareça de imediato, e aguarda o resultado através de `after()`.
+        """
+        self.combo_location['values'] = []
+        self.combo_location.set("A carregar locais...")
+        self.combo_location['state'] = 'disabled'
+        self._locations_failed = False
+        self.controller.start_loading_locations()
+        self._poll_locations_loaded()
+
+    def _retry_loading_locations(self):
+        """Pede ao controller uma nova tentativa de carregar os locais e volta a aguardar o resultado."""
+        self.controller.retry_loading_locations()
+        self._poll_locations_loaded()
+
+    def _poll_locations_loaded(self):
+        """Verifica (na thread do Tkinter) se os locais já chegaram; se não, volta a agendar-se."""
+        if self.controller.are_locations_loaded():
+            self._load_locations_into_combobox()
+        else:
+            self.after(LOCATIONS_POLL_INTERVAL_MS, self._poll_locations_loaded)
+
     def _load_locations_into_combobox(self):
         """Carrega a lista de locais do MainController e popula o Combobox."""
         logging.info("A carregar locais para o Combobox...")
         try:
             # Chama o MainController para obter os nomes dos locais disponíveis
             self.location_names = self.controller.get_available_location_names()
-            self.location_names.sort() # Ordena alfabeticamente
+            self.location_names.sort(key=fold) # Ordena alfabeticamente (ignorando acentos)
             
             if not self.location_names:
-                messagebox.showwarning("Erro de Carregamento", "Não foi possível carregar a lista de locais. Verifique sua conexão com a internet ou a API do IPMA.")
+                if not self._locations_failed: # Avisa uma vez, não a cada nova tentativa
+                    messagebox.showwarning("Erro de Carregamento", "Não foi possível carregar a lista de locais. Verifique sua conexão com a internet ou a API do IPMA.")
+                    self._locations_failed = True
                 logging.warning("Lista de locais vazia ou não carregada.")
                 self.combo_location['values'] = ["Nenhum local disponível"]
                 self.combo_location.set("Nenhum local disponível")
-                self.combo_location['state'] = 'disabled' # Desativa o combobox
+                self.combo_location['state'] = 'disabled' # Desativa o combobox até uma nova tentativa ter sucesso
+                self.after(LOCATIONS_RETRY_INTERVAL_MS, self._retry_loading_locations)
             else:
+                self._locations_failed = False
                 self.combo_location['values'] = self.location_names
                 self.combo_location.set("Selecione um local...") # Texto inicial
-                self.combo_location['state'] = 'readonly' # Permite seleção, não edição
+                self.combo_location['state'] = 'normal' # Permite escrever para filtrar (ver _on_location_typed)
                 logging.info(f"Carregados {len(self.location_names)} locais no Combobox.")
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar locais: {e}")
@@ -152,18 +200,35 @@ class MinimalWindow(ttk.Frame):
             self.combo_location.set("Erro ao carregar")
             self.combo_location['state'] = 'disabled'
 
+    def _clear_location_placeholder(self, event):
+        """Limpa o texto "Selecione um local..." quando o utilizador vai escrever no Combobox."""
+        if self.selected_location_name.get() == "Selecione um local...":
+            self.combo_location.set("")
+
+    def _on_location_typed(self, event):
+        """Filtra a lista do Combobox (prefixo, sem acentos, ou aproximada) à medida que o utilizador escreve."""
+        if event.keysym in NAVIGATION_KEYS or not self.location_names:
+            return
+        text = self.selected_location_name.get()
+        self.combo_location['values'] = self.controller.search_location_names(text) if text.strip() else self.location_names
+
     def _on_location_selected(self, event):
         """Evento acionado quando uma localização é selecionada no Combobox."""
         selected_name = self.selected_location_name.get()
         logging.info(f"Localização selecionada: {selected_name}")
         # Notifica o Controller da mudança de localização
+        previous_location_id = self.controller.current_location_id
         success = self.controller.set_location_by_name(selected_name)
+        if self.controller.current_location_id != previous_location_id:
+            # O controller cancelou a previsão em curso para o local anterior; o seu resultado nunca chegará
+            self._pending_forecast_request = None
+            self._clear_results_display()
         if not success:
             messagebox.showwarning("Erro de Seleção", f"Não foi possível definir '{selected_name}' como localização atual.")
-            self.results_label.config(text=f"Erro ao selecionar: {selected_name}") # Atualiza o label de resultados
+            self.results_label.config(text=f"Erro ao selecionar: {selected_name}", foreground=PALETTE_ERROR) # Atualiza o label de resultados
             logging.error(f"Falha ao definir localização por nome: {selected_name}")
         else:
-            self.results_label.config(text=f"Local '{selected_name}' selecionado. Clique em 'Buscar Previsão'.") # Feedback visual
+            self.results_label.config(text=f"Local '{selected_name}' selecionado. Clique em 'Buscar Previsão'.", foreground=PALETTE_TEXT_DARK) # Feedback visual
 
     def _search_button_command(self):
         """Comando acionado ao clicar no botão 'Buscar Previsão'."""
@@ -176,10 +241,18 @@ class MinimalWindow(ttk.Frame):
 
         # Tenta buscar e processar os dados da previsão
         self.results_label.config(text=f"Buscando previsão para {self.controller.current_location_name}...")
-        success = self.controller.fetch_and_display_forecast()
+        self._search_started_at = time.perf_counter()
+        self._pending_forecast_request = self.controller.fetch_forecast_async(
+            self.dispatcher.wrap(self._on_forecast_ready))
+
+    def _on_forecast_ready(self, success, forecast_data, request_id):
+        """Mostra a previsão pedida em _search_button_command (corre na thread do Tkinter)."""
+        if request_id != self._pending_forecast_request:
+            logging.info("Resultado de um pedido de previsão antigo ignorado.")
+            return
+        self._pending_forecast_request = None
 
         if success:
-            forecast_data = self.controller.get_current_weather_data()
             if forecast_data:
                 # Exibe os dados processados no Label de resultados
                 display_text = (
@@ -190,16 +263,28 @@ class MinimalWindow(ttk.Frame):
                     f"Condição: {forecast_data.get('weather_description', 'N/A')}\n"
                     f"Vento: {forecast_data.get('wind_speed_description', 'N/A')} ({forecast_data.get('wind_dir', 'N/A')})"
                 )
-                self.results_label.config(text=display_text, foreground=PALETTE_TEXT_DARK)
+                with metrics.timer("ui_update"):
+                    self.results_label.config(text=display_text, foreground=PALETTE_TEXT_DARK)
+                # Tempo desde o clique em "Buscar Previsão" até a previsão estar no Label
+                metrics.observe("ui_click_to_display", time.perf_counter() - self._search_started_at)
                 logging.info("Previsão exibida com sucesso.")
             else:
                 self.results_label.config(text="Erro: Dados de previsão não processados corretamente.", foreground=PALETTE_ERROR)
                 messagebox.showerror("Erro de Dados", "Dados de previsão não foram processados corretamente.")
-                logging.error("Dados de previsão ausentes após fetch_and_display_forecast.")
+                logging.error("Dados de previsão ausentes após fetch_forecast_async.")
         else:
             self.results_label.config(text=f"Falha ao obter previsão para {self.controller.current_location_name}.", foreground=PALETTE_ERROR)
             messagebox.showerror("Erro de Previsão", f"Não foi possível obter a previsão para {self.controller.current_location_name}.")
             logging.error(f"Falha ao obter/exibir previsão para {self.controller.current_location_name}.")
 
-# Não precisamos de _update_results_display e _clear_results_display separadamente
-# neste exemplo minimalista, pois estamos a atualizar e limpar o mesmo Label.
\ No newline at end of file
+    def _clear_results_display(self):
+        """Limpa o Label de resultados (texto e cor de erro) ao mudar de local."""
+        self.results_label.config(text="Selecione um local e clique em 'Buscar Previsão'.", foreground=PALETTE_TEXT_DARK)
+
+    def _on_close(self):
+        """Fecha a janela: pára o dispatcher antes de destruir os widgets."""
+        self.dispatcher.stop()
+        self.master.destroy()
+
+# Não precisamos de _update_results_display separadamente neste exemplo
+# minimalista, pois estamos a atualizar o mesmo Label.
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Entrega de resultados de threads de trabalho à thread do Tkinter.
+
+O Tkinter não é seguro entre threads: os widgets só podem ser tocados pela
+thread que corre o `mainloop()`. As threads de trabalho colocam chamadas numa
+fila e o dispatcher esvazia-a periodicamente através de `after()`.
+"""
+
+import logging
+import queue
+
+# Intervalo (ms) entre esvaziamentos da fila
+DEFAULT_DISPATCH_INTERVAL_MS = 20
+
+
+class TkDispatcher:
+    """
+    Executa na thread do Tkinter as chamadas publicadas por outras threads.
+
+    Args:
+        widget: Widget Tkinter cujo `after()` é usado para esvaziar a fila.
+        interval_ms (int): Intervalo entre esvaziamentos da fila.
+    """
+    def __init__(self, widget, interval_ms=DEFAULT_DISPATCH_INTERVAL_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+        self._stopped = False
+        self._schedule()
+
+    def post(self, func, *args):
+        """Agenda `func(*args)` para correr na thread do Tkinter (pode ser chamado de qualquer thread)."""
+        self._queue.put((func, args))
+
+    def wrap(self, func):
+        """Devolve uma função que, chamada em qualquer thread, agenda `func` na thread do Tkinter."""
+        def posted(*args):
+            self.post(func, *args)
+        return posted
+
+    def _schedule(self):
+        if not self._stopped:
+            self._after_id = self.widget.after(self.interval_ms, self._drain)
+
+    def _drain(self):
+        """Executa todas as chamadas pendentes e volta a agendar-se."""
+        while True:
+            try:
+                func, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error(f"Erro numa chamada entregue à UI: {e}")
+        self._schedule()
+
+    def stop(self):
+        """Deixa de esvaziar a fila (ex: ao fechar a janela)."""
+        self._stopped = True
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None